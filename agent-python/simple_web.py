@@ -8,7 +8,7 @@ import sys
 import os
 import json
 from pathlib import Path
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, Response, request, jsonify, render_template_string, stream_with_context
 import threading
 import time
 
@@ -19,9 +19,12 @@ sys.path.insert(0, str(src_path))
 
 try:
     from src.graph_arc.graph import workflow
-    from src.data.soil_plugins import get_soil_data_from_csv, fetch_soil_data_by_location
+    from src.config.settings import SOIL_BULK_MAX_LOCATIONS
+    from src.data.soil_plugins import get_soil_data_from_csv, get_soil_data_bulk, fetch_soil_data_by_location
     from src.data.weather_plugins import fetch_weather_data
     from src.utils.loggers import get_logger
+    from src.services.warmup import startup_warmup
+    from src.graph_arc.core_nodes.query_understanding_node import intent_models
 except ImportError as e:
     print(f"❌ Import Error: {e}")
     print("Make sure you're running from the agent-python directory and all dependencies are installed.")
@@ -474,7 +477,8 @@ def handle_query():
         return jsonify({
             'success': True,
             'response': response,
-            'query': enhanced_query
+            'query': enhanced_query,
+            'intent_model_version': result.get('intent_model_version')
         })
         
     except Exception as e:
@@ -515,6 +519,41 @@ def handle_soil_analysis():
             'error': str(e)
         }), 500
 
+# NDJSON lines written per chunk of a bulk soil response
+SOIL_BULK_CHUNK_LINES = 200
+
+@app.route('/api/soil/bulk', methods=['POST'])
+def handle_bulk_soil_analysis():
+    """Soil analysis for many locations, streamed as NDJSON (one line per distinct location)"""
+    data = request.get_json(silent=True) or {}
+    locations = data.get('locations')
+    query = data.get('query') or "web soil analysis"
+    
+    if not isinstance(locations, list) or not locations or not all(isinstance(location, str) for location in locations):
+        return jsonify({
+            'success': False,
+            'error': 'locations must be a non-empty list of location names'
+        }), 400
+    if len(locations) > SOIL_BULK_MAX_LOCATIONS:
+        return jsonify({
+            'success': False,
+            'error': f'At most {SOIL_BULK_MAX_LOCATIONS} locations per request'
+        }), 413
+    
+    logger.info(f"Processing bulk soil analysis for {len(locations)} locations")
+    
+    def generate():
+        lines = []
+        for location, soil_data in get_soil_data_bulk(locations, query):
+            lines.append(json.dumps({'location': location, 'soil_data': soil_data}) + "\n")
+            if len(lines) >= SOIL_BULK_CHUNK_LINES:
+                yield "".join(lines)
+                lines = []
+        if lines:
+            yield "".join(lines)
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/api/weather', methods=['POST'])
 def handle_weather():
     """Handle weather requests"""
@@ -559,9 +598,16 @@ def health_check():
             'Crop recommendations',
             'Market intelligence',
             'Government schemes'
-        ]
+        ],
+        'intent_model': intent_models.status()
     })
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: 200 only once startup warmup has completed; failed steps are retried in the background"""
+    report = startup_warmup.poll()
+    return jsonify(report), (200 if report['ready'] else 503)
+
 def run_server(host='127.0.0.1', port=5000, debug=False):
     """Run the Flask server"""
     print(f"""
@@ -576,6 +622,10 @@ def run_server(host='127.0.0.1', port=5000, debug=False):
 ╚══════════════════════════════════════════════════════════════════════════════╝
     """)
     
+    # Load the model, graph, soil table and HTTP session before serving
+    warmup_report = startup_warmup.run()
+    print(f"🔥 Warmup {warmup_report['status']} in {warmup_report['warmup_seconds']}s")
+    
     logger.info(f"Starting FarmMate AI web server on {host}:{port}")
     
     try:
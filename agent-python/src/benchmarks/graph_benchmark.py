@@ -0,0 +1,126 @@
+"""
+Agent Fan-out Benchmark
+Compares the native parallel agent branches against the single-node
+conditional_router for 1-, 3- and 5-intent queries.
+
+Usage:
+    python -m src.benchmarks.graph_benchmark --iterations 20 --simulated-latency 0.2
+"""
+import argparse
+import json
+import statistics
+import sys
+import os
+import time
+from typing import Dict, List
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.graph_arc.graph import build_agent_stage
+from src.graph_arc.router import AGENT_REGISTRY
+from src.utils.loggers import get_logger
+
+# Intent mixes for the 1-, 3- and 5-intent scenarios
+INTENT_SCENARIOS = {
+    1: ["weather"],
+    3: ["weather", "soil", "market"],
+    5: ["weather", "soil", "market", "crop_health", "government_schemes"],
+}
+
+BASE_STATE = {
+    "user_id": "benchmark_user",
+    "raw_query": "Weather, soil, wheat price, pest and scheme advice",
+    "location": "Pune",
+    "language": "en",
+    "device_type": "web",
+    "entities": {"crop": "Wheat", "commodity": "Wheat"},
+    "confidence_score": 1.0,
+}
+
+
+def with_simulated_latency(registry: Dict, latency: float) -> Dict:
+    """Wrap every agent with a fixed sleep to emulate network-bound calls."""
+    def delayed(agent_fn):
+        def agent(state):
+            time.sleep(latency)
+            return agent_fn(state)
+        return agent
+    
+    return {intent: (key, delayed(fn)) for intent, (key, fn) in registry.items()}
+
+
+def run_scenario(workflow, intents: List[str], iterations: int) -> Dict:
+    """Invoke the agent stage repeatedly and return latency statistics."""
+    timings = []
+    for _ in range(iterations):
+        state = dict(BASE_STATE, intents=intents)
+        start_time = time.perf_counter()
+        workflow.invoke(state)
+        timings.append(time.perf_counter() - start_time)
+    
+    timings.sort()
+    return {
+        "mean": statistics.mean(timings),
+        "p50": statistics.median(timings),
+        "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "min": timings[0],
+        "max": timings[-1],
+    }
+
+
+def run_benchmark(iterations: int = 10, simulated_latency: float = 0.0) -> Dict:
+    """Benchmark both strategies for every intent scenario."""
+    logger = get_logger("graph_benchmark")
+    registry = with_simulated_latency(AGENT_REGISTRY, simulated_latency) if simulated_latency else AGENT_REGISTRY
+    
+    workflows = {
+        "single_node_router": build_agent_stage(parallel_agents=False, registry=registry),
+        "parallel_branches": build_agent_stage(parallel_agents=True, registry=registry),
+    }
+    
+    report = {"iterations": iterations, "simulated_latency": simulated_latency, "scenarios": {}}
+    for intent_count, intents in INTENT_SCENARIOS.items():
+        scenario = {}
+        for name, workflow in workflows.items():
+            # Warm up once so imports and CSV/model loading are not measured
+            workflow.invoke(dict(BASE_STATE, intents=intents))
+            scenario[name] = run_scenario(workflow, intents, iterations)
+            logger.info(f"[GraphBenchmark] {intent_count}-intent {name}: p50 {scenario[name]['p50'] * 1000:.1f}ms")
+        report["scenarios"][f"{intent_count}_intents"] = scenario
+    
+    return report
+
+
+def print_report(report: Dict):
+    """Print a readable comparison table."""
+    print("=" * 72)
+    print(f"{'scenario':<12}{'strategy':<22}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>8}")
+    print("-" * 72)
+    for scenario_name, scenario in report["scenarios"].items():
+        for strategy, stats in scenario.items():
+            print(
+                f"{scenario_name:<12}{strategy:<22}"
+                f"{stats['mean'] * 1000:>10.1f}{stats['p50'] * 1000:>10.1f}"
+                f"{stats['p95'] * 1000:>10.1f}{stats['max'] * 1000:>8.1f}"
+            )
+    print("=" * 72)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agent fan-out strategies")
+    parser.add_argument("--iterations", type=int, default=10, help="Invocations per scenario (default: 10)")
+    parser.add_argument("--simulated-latency", type=float, default=0.0,
+                        help="Seconds of artificial latency added to every agent (default: 0)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    
+    report = run_benchmark(args.iterations, args.simulated_latency)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Intent Classifier Benchmark
+Replays a labelled query corpus through get_intents and reports throughput
+(queries/sec), p50/p99 latency, cold-start load time, peak RSS and
+per-intent precision/recall as JSON.
+
+With --formats, every model format runs in its own process (so cold start
+and RSS are measured from scratch); the first format is the baseline and
+the run fails when a later one is less accurate than it.
+
+Usage:
+    python -m src.benchmarks.intent_benchmark --repeat 20 --json
+    python -m src.benchmarks.intent_benchmark --formats pickle compact --output intent_report.json
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Add project root to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "intent_corpus.json")
+
+LabelledQuery = Tuple[str, List[str]]
+
+
+def load_corpus(path: str = CORPUS_PATH) -> List[LabelledQuery]:
+    """Read [{"query": ..., "intents": [...]}, ...] into (query, intents) pairs."""
+    with open(path, encoding="utf-8") as f:
+        return [(item["query"], list(item["intents"])) for item in json.load(f)]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def latency_stats(timings: Sequence[float]) -> Dict:
+    """Queries/sec and latency percentiles (ms) of per-query timings."""
+    timings = np.asarray(timings)
+    total = float(timings.sum())
+    return {
+        "queries": int(len(timings)),
+        "qps": round(len(timings) / total, 1) if total else None,
+        "mean_ms": round(float(timings.mean()) * 1000, 4),
+        "p50_ms": round(float(np.percentile(timings, 50)) * 1000, 4),
+        "p99_ms": round(float(np.percentile(timings, 99)) * 1000, 4),
+        "max_ms": round(float(timings.max()) * 1000, 4),
+    }
+
+
+def accuracy_report(gold: Sequence[Sequence[str]], predicted: Sequence[Sequence[str]], classes: Sequence[str]) -> Dict:
+    """Per-intent precision/recall/F1 plus micro averages, macro F1 and exact-match rate."""
+    def ratio(numerator, denominator):
+        return round(numerator / denominator, 4) if denominator else 0.0
+
+    per_intent = {}
+    totals = {"tp": 0, "fp": 0, "fn": 0}
+    for intent in classes:
+        tp = sum(1 for g, p in zip(gold, predicted) if intent in g and intent in p)
+        fp = sum(1 for g, p in zip(gold, predicted) if intent not in g and intent in p)
+        fn = sum(1 for g, p in zip(gold, predicted) if intent in g and intent not in p)
+        precision, recall = ratio(tp, tp + fp), ratio(tp, tp + fn)
+        per_intent[intent] = {
+            "precision": precision,
+            "recall": recall,
+            "f1": ratio(2 * precision * recall, precision + recall),
+            "support": tp + fn,
+            "predicted": tp + fp,
+        }
+        totals["tp"] += tp
+        totals["fp"] += fp
+        totals["fn"] += fn
+
+    micro_precision = ratio(totals["tp"], totals["tp"] + totals["fp"])
+    micro_recall = ratio(totals["tp"], totals["tp"] + totals["fn"])
+    return {
+        "per_intent": per_intent,
+        "micro_precision": micro_precision,
+        "micro_recall": micro_recall,
+        "micro_f1": ratio(2 * micro_precision * micro_recall, micro_precision + micro_recall),
+        "macro_f1": round(float(np.mean([stats["f1"] for stats in per_intent.values()])), 4) if per_intent else 0.0,
+        "exact_match": ratio(sum(1 for g, p in zip(gold, predicted) if set(g) == set(p)), len(gold)),
+    }
+
+
+def run_benchmark(corpus: Optional[List[LabelledQuery]] = None, repeat: int = 10, threshold: float = 0.2) -> Dict:
+    """
+    Benchmark the classifier in this process: import and model load time,
+    first-query latency, per-query and batch throughput, peak RSS and
+    accuracy against the corpus labels.
+    """
+    corpus = load_corpus() if corpus is None else corpus
+    queries = [query for query, _ in corpus]
+
+    start_time = time.perf_counter()
+    from src.graph_arc.core_nodes import query_understanding_node as classifier
+    from src.data.gazetteer import get_gazetteer
+    import_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    if not classifier.reload_intent_model():
+        raise RuntimeError("Intent model could not be loaded")
+    load_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    get_gazetteer()
+    gazetteer_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    classifier.get_intents(queries[0], threshold=threshold)
+    first_query_seconds = time.perf_counter() - start_time
+
+    predicted = []
+    timings = []
+    for iteration in range(max(1, repeat)):
+        for query in queries:
+            query_start = time.perf_counter()
+            intents, _ = classifier.get_intents(query, threshold=threshold)
+            timings.append(time.perf_counter() - query_start)
+            if iteration == 0:
+                predicted.append(sorted(intents))
+
+    batch_timings = []
+    for _ in range(max(1, repeat)):
+        batch_start = time.perf_counter()
+        classifier.get_intents_batch(queries, threshold=threshold)
+        batch_timings.append(time.perf_counter() - batch_start)
+
+    return {
+        "model_format": classifier.intent_models.active.model_format,
+        "model_version": classifier.intent_models.active_version,
+        "threshold": threshold,
+        "repeat": repeat,
+        "corpus_size": len(corpus),
+        "cold_start": {
+            "import_seconds": round(import_seconds, 4),
+            "model_load_seconds": round(load_seconds, 4),
+            "gazetteer_seconds": round(gazetteer_seconds, 4),
+            "first_query_seconds": round(first_query_seconds, 4),
+        },
+        "latency": latency_stats(timings),
+        "batch_qps": round(len(queries) * len(batch_timings) / sum(batch_timings), 1),
+        "peak_rss_mb": peak_rss_mb(),
+        "accuracy": accuracy_report([intents for _, intents in corpus], predicted, classifier._intent_classes()),
+        "predictions": [{"query": query, "intents": intents} for query, intents in zip(queries, predicted)],
+    }
+
+
+def run_in_subprocess(model_format: str, corpus_path: str = CORPUS_PATH, repeat: int = 10, threshold: float = 0.2) -> Dict:
+    """Run the benchmark in a fresh interpreter with INTENT_MODEL_FORMAT set."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, "report.json")
+        env = dict(os.environ, INTENT_MODEL_FORMAT=model_format)
+        subprocess.run(
+            [sys.executable, "-m", "src.benchmarks.intent_benchmark",
+             "--corpus", corpus_path, "--repeat", str(repeat), "--threshold", str(threshold), "--output", output],
+            cwd=PROJECT_ROOT, env=env, check=True, stdout=subprocess.DEVNULL,
+        )
+        with open(output, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def compare_reports(baseline: Dict, candidate: Dict, tolerance: float = 0.0) -> Dict:
+    """
+    Accuracy regression check: the candidate's micro F1, exact-match rate and
+    every intent's precision and recall must be within `tolerance` of the
+    baseline. Also lists the queries whose predictions changed.
+    """
+    regressions = []
+    base, cand = baseline["accuracy"], candidate["accuracy"]
+    for metric in ("micro_f1", "exact_match"):
+        if cand[metric] < base[metric] - tolerance:
+            regressions.append(f"{metric}: {base[metric]} -> {cand[metric]}")
+    for intent, stats in base["per_intent"].items():
+        cand_stats = cand["per_intent"].get(intent, {"precision": 0.0, "recall": 0.0})
+        for metric in ("precision", "recall"):
+            if cand_stats[metric] < stats[metric] - tolerance:
+                regressions.append(f"{intent} {metric}: {stats[metric]} -> {cand_stats[metric]}")
+
+    changed = [
+        {"query": base_item["query"], "baseline": base_item["intents"], "candidate": cand_item["intents"]}
+        for base_item, cand_item in zip(baseline["predictions"], candidate["predictions"])
+        if base_item["intents"] != cand_item["intents"]
+    ]
+    base_qps, cand_qps = baseline["latency"]["qps"], candidate["latency"]["qps"]
+    return {
+        "passed": not regressions,
+        "regressions": regressions,
+        "changed_predictions": changed,
+        "speedup": round(cand_qps / base_qps, 2) if base_qps and cand_qps else None,
+    }
+
+
+def print_report(report: Dict):
+    """Print a readable summary of one benchmark run."""
+    latency, cold_start, accuracy = report["latency"], report["cold_start"], report["accuracy"]
+    print("=" * 64)
+    print(f"Model format: {report['model_format']}  corpus: {report['corpus_size']} queries x {report['repeat']}")
+    print(f"Cold start: load {cold_start['model_load_seconds'] * 1000:.1f}ms, "
+          f"gazetteer {cold_start['gazetteer_seconds'] * 1000:.1f}ms, "
+          f"first query {cold_start['first_query_seconds'] * 1000:.1f}ms")
+    print(f"Throughput: {latency['qps']} q/s (batch {report['batch_qps']} q/s), "
+          f"p50 {latency['p50_ms']:.3f}ms, p99 {latency['p99_ms']:.3f}ms")
+    print(f"Peak RSS: {report['peak_rss_mb']} MiB")
+    print("-" * 64)
+    print(f"{'intent':<22}{'precision':>10}{'recall':>10}{'f1':>10}{'support':>10}")
+    for intent, stats in accuracy["per_intent"].items():
+        print(f"{intent:<22}{stats['precision']:>10.3f}{stats['recall']:>10.3f}{stats['f1']:>10.3f}{stats['support']:>10}")
+    print(f"{'micro':<22}{accuracy['micro_precision']:>10.3f}{accuracy['micro_recall']:>10.3f}{accuracy['micro_f1']:>10.3f}")
+    print(f"Exact match: {accuracy['exact_match']:.3f}")
+    print("=" * 64)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark intent classifier speed and accuracy")
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="Labelled query corpus (JSON)")
+    parser.add_argument("--repeat", type=int, default=10, help="Passes over the corpus (default: 10)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Intent probability threshold (default: 0.2)")
+    parser.add_argument("--formats", nargs="+", choices=["auto", "compact", "hashed", "pickle"],
+                        help="Run each model format in its own process; the first is the accuracy baseline")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="Allowed drop in any accuracy metric versus the baseline (default: 0)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    passed = True
+    if args.formats:
+        runs = {fmt: run_in_subprocess(fmt, args.corpus, args.repeat, args.threshold) for fmt in args.formats}
+        baseline = args.formats[0]
+        comparison = {
+            fmt: compare_reports(runs[baseline], runs[fmt], args.tolerance)
+            for fmt in args.formats[1:]
+        }
+        passed = all(result["passed"] for result in comparison.values())
+        report = {"baseline": baseline, "runs": runs, "comparison": comparison, "passed": passed}
+    else:
+        report = run_benchmark(load_corpus(args.corpus), args.repeat, args.threshold)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    elif args.formats:
+        for fmt, run in report["runs"].items():
+            print_report(run)
+        for fmt, result in report["comparison"].items():
+            status = "PASS" if result["passed"] else "FAIL"
+            print(f"{fmt} vs {report['baseline']}: {status}, speedup x{result['speedup']}, "
+                  f"{len(result['changed_predictions'])} changed predictions")
+            for regression in result["regressions"]:
+                print(f"  regression: {regression}")
+    else:
+        print_report(report)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
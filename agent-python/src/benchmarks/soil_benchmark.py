@@ -0,0 +1,198 @@
+"""
+Soil Analysis Benchmark
+Measures the startup cost of indexing soil.csv and precomputing every
+district's analysis, and compares per-query latency of computing the
+analysis on the fly against fetching the precomputed record.
+
+It also measures the cold start of a fresh worker (import, load and first
+query) and its peak RSS, loading from the columnar soil build and from
+soil.csv, and reports whether pandas was imported.
+
+Usage:
+    python -m src.benchmarks.soil_benchmark --queries 2000 --budget 0.5
+    python -m src.benchmarks.soil_benchmark --cold-start
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+# Add project root to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
+
+
+# Default startup budget (seconds) for parsing, indexing and precomputing soil.csv
+DEFAULT_BUDGET_SECONDS = 0.5
+
+
+def cold_start(dataset_dir: Optional[str] = None) -> Dict:
+    """Import, load and first-query time plus peak RSS of this (fresh) process."""
+    start_time = time.perf_counter()
+    from src.data import soil_repository
+    from src.data.soil_plugins import get_soil_analysis_table, get_soil_data_from_csv
+    imported = time.perf_counter()
+    if dataset_dir is not None:
+        soil_repository.SOIL_DATASET_DIR = dataset_dir
+    get_soil_analysis_table()
+    loaded = time.perf_counter()
+    get_soil_data_from_csv("Satara", "soil report")
+    done = time.perf_counter()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "import_seconds": imported - start_time,
+        "load_seconds": loaded - imported,
+        "first_query_seconds": done - loaded,
+        "total_seconds": done - start_time,
+        # Linux reports KiB, macOS bytes
+        "peak_rss_mb": round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1),
+        "pandas_imported": "pandas" in sys.modules,
+    }
+
+
+def cold_start_in_subprocess(dataset_dir: Optional[str] = None) -> Dict:
+    """cold_start() in a fresh interpreter; a missing dataset_dir forces the soil.csv fallback."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, "cold_start.json")
+        code = (
+            "import json\n"
+            "from src.benchmarks.soil_benchmark import cold_start\n"
+            f"json.dump(cold_start({dataset_dir!r}), open({output!r}, 'w'))\n"
+        )
+        subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(output, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def run_cold_start(repeat: int = 3) -> Dict:
+    """Best-of-`repeat` cold start loading from the columnar build and from soil.csv."""
+    with tempfile.TemporaryDirectory() as missing_dir:
+        sources = {"columnar": None, "csv": os.path.join(missing_dir, "none")}
+        return {
+            source: min((cold_start_in_subprocess(dataset_dir) for _ in range(repeat)),
+                        key=lambda report: report["total_seconds"])
+            for source, dataset_dir in sources.items()
+        }
+
+
+def time_call(fn: Callable, repeats: int = 5) -> float:
+    """Best wall time of several calls (seconds)."""
+    timings = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
+
+
+def latency_stats(timings: List[float]) -> Dict[str, float]:
+    timings = sorted(timings)
+    return {
+        "mean_us": statistics.mean(timings) * 1e6,
+        "p50_us": statistics.median(timings) * 1e6,
+        "p95_us": timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1e6,
+    }
+
+
+def run_benchmark(queries: int = 2000) -> Dict:
+    """Startup cost of the table plus on-the-fly vs precomputed per-query latency."""
+    # Imported here, not at module level, so cold_start() sees a fresh process
+    from src.data.soil_plugins import (
+        SoilAnalysisTable, analyze_district_nutrients, get_soil_analysis_table, with_location,
+    )
+    from src.data.soil_repository import load_soil_repository
+    
+    table = get_soil_analysis_table()
+    repository = table.repository
+    records = repository.records
+    
+    report = {
+        "districts": len(records),
+        "analyses": len(table),
+        "startup_seconds": {
+            "load_repository": time_call(load_soil_repository),
+            "precompute": time_call(lambda: SoilAnalysisTable(repository)),
+        },
+        "per_query": {},
+    }
+    report["startup_seconds"]["total"] = sum(report["startup_seconds"].values())
+    
+    # The per-district log lines would dominate both timings
+    logging.disable(logging.INFO)
+    try:
+        strategies = {
+            "on_the_fly": lambda record, focus: analyze_district_nutrients(record, record.district, "", focus),
+            "precomputed": lambda record, focus: with_location(table.get(record, focus), record.district),
+        }
+        for name, analyze in strategies.items():
+            timings = []
+            for i in range(queries):
+                record = records[i % len(records)]
+                start_time = time.perf_counter()
+                analyze(record, i % 2 == 1)
+                timings.append(time.perf_counter() - start_time)
+            report["per_query"][name] = latency_stats(timings)
+    finally:
+        logging.disable(logging.NOTSET)
+    
+    report["speedup"] = report["per_query"]["on_the_fly"]["mean_us"] / report["per_query"]["precomputed"]["mean_us"]
+    return report
+
+
+def print_report(report: Dict):
+    """Print a readable summary."""
+    startup = report["startup_seconds"]
+    print("=" * 60)
+    print(f"districts: {report['districts']}  precomputed analyses: {report['analyses']}")
+    print(f"load soil.csv: {startup['load_repository'] * 1000:.1f}ms  "
+          f"precompute: {startup['precompute'] * 1000:.1f}ms  total: {startup['total'] * 1000:.1f}ms")
+    print("-" * 60)
+    print(f"{'strategy':<16}{'mean us':>12}{'p50 us':>12}{'p95 us':>12}")
+    for name, stats in report["per_query"].items():
+        print(f"{name:<16}{stats['mean_us']:>12.1f}{stats['p50_us']:>12.1f}{stats['p95_us']:>12.1f}")
+    print(f"speedup: {report['speedup']:.1f}x")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark precomputed soil analysis")
+    parser.add_argument("--queries", type=int, default=2000, help="Queries per strategy (default: 2000)")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS,
+                        help=f"Fail if startup exceeds this many seconds (default: {DEFAULT_BUDGET_SECONDS})")
+    parser.add_argument("--cold-start", action="store_true",
+                        help="Measure fresh-worker cold start and peak RSS instead")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    
+    if args.cold_start:
+        report = run_cold_start()
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            for source, stats in report.items():
+                print(f"{source:<10} import {stats['import_seconds'] * 1000:.0f}ms  load {stats['load_seconds'] * 1000:.0f}ms  "
+                      f"total {stats['total_seconds'] * 1000:.0f}ms  peak RSS {stats['peak_rss_mb']}MB  "
+                      f"pandas imported: {stats['pandas_imported']}")
+        return
+    
+    report = run_benchmark(args.queries)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    
+    if report["startup_seconds"]["total"] > args.budget:
+        print(f"Startup {report['startup_seconds']['total']:.3f}s exceeds budget {args.budget}s", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,13 @@ class Configuration(BaseModel):
         },
     )
 
+    stream_decision_tokens: bool = Field(
+        default=False,
+        metadata={
+            "description": "Stream the decision-support answer token by token (final_advice first) to the custom stream."
+        },
+    )
+
 
     @classmethod
     def from_runnable_config(
@@ -41,6 +41,56 @@ NODE_ENV = os.getenv("NODE_ENV", "development")
 PORT = int(os.getenv("PORT", 8000))
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
+# Workflow concurrency settings
+# Agent thread pool size; 0 sizes it for WORKFLOW_MAX_CONCURRENCY runs of every agent at once
+ROUTER_MAX_WORKERS = int(os.getenv("ROUTER_MAX_WORKERS", 0))
+WORKFLOW_MAX_CONCURRENCY = int(os.getenv("WORKFLOW_MAX_CONCURRENCY", 4))
+WORKFLOW_MAX_QUEUE = int(os.getenv("WORKFLOW_MAX_QUEUE", 16))
+WORKFLOW_QUEUE_TIMEOUT = float(os.getenv("WORKFLOW_QUEUE_TIMEOUT", 10))
+
+# End-to-end deadline budgets (seconds) per device type
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", 30))
+DEVICE_DEADLINE_SECONDS = {
+    "web": float(os.getenv("DEADLINE_WEB_SECONDS", REQUEST_DEADLINE_SECONDS)),
+    "mobile": float(os.getenv("DEADLINE_MOBILE_SECONDS", 20)),
+    "sms": float(os.getenv("DEADLINE_SMS_SECONDS", 8)),
+    "ivr": float(os.getenv("DEADLINE_IVR_SECONDS", 6)),
+}
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", 10))
+
+# Full-response cache: TTL (seconds) per intent, the shortest TTL of a query's intents applies
+RESPONSE_CACHE_TTL_SECONDS = {
+    "weather": float(os.getenv("CACHE_TTL_WEATHER_SECONDS", 600)),
+    "market": float(os.getenv("CACHE_TTL_MARKET_SECONDS", 900)),
+    "crop_health": float(os.getenv("CACHE_TTL_CROP_HEALTH_SECONDS", 3600)),
+    "soil": float(os.getenv("CACHE_TTL_SOIL_SECONDS", 86400)),
+    "government_schemes": float(os.getenv("CACHE_TTL_SCHEMES_SECONDS", 86400)),
+}
+RESPONSE_CACHE_DEFAULT_TTL_SECONDS = float(os.getenv("CACHE_TTL_DEFAULT_SECONDS", 1800))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 2048))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Upper bound on queries accepted by the batch intent classification endpoint
+INTENT_BATCH_MAX_QUERIES = int(os.getenv("INTENT_BATCH_MAX_QUERIES", 10000))
+
+# Upper bound on locations accepted by the bulk soil analysis endpoint
+SOIL_BULK_MAX_LOCATIONS = int(os.getenv("SOIL_BULK_MAX_LOCATIONS", 50000))
+
+# Intent model format to load: "auto" (compact, then hashed, then pickles), "compact", "hashed" or "pickle"
+INTENT_MODEL_FORMAT = os.getenv("INTENT_MODEL_FORMAT", "auto").lower()
+
+# Memoized (intents, confidence, entities) per normalized query; model files are re-checked at this interval
+QUERY_ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_ANALYSIS_CACHE_MAX_ENTRIES", 4096))
+QUERY_ANALYSIS_CACHE_CHECK_SECONDS = float(os.getenv("QUERY_ANALYSIS_CACHE_CHECK_SECONDS", 5))
+
+# Location used when neither the query, the client nor the user's history names one
+DEFAULT_LOCATION = os.getenv("DEFAULT_LOCATION", "Satara")
+USER_LOCATION_CACHE_MAX_ENTRIES = int(os.getenv("USER_LOCATION_CACHE_MAX_ENTRIES", 10000))
+
+# Failed startup warmup steps are retried from the readiness probe, backing off exponentially up to the max
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", 5))
+WARMUP_RETRY_MAX_SECONDS = float(os.getenv("WARMUP_RETRY_MAX_SECONDS", 300))
+
 # Detect production environment
 IS_PRODUCTION = NODE_ENV == "production" or os.getenv("RENDER") == "true"
 
@@ -59,6 +109,26 @@ def get_config():
         "NODE_ENV": NODE_ENV,
         "PORT": PORT,
         "LOG_LEVEL": LOG_LEVEL,
+        "ROUTER_MAX_WORKERS": ROUTER_MAX_WORKERS,
+        "WORKFLOW_MAX_CONCURRENCY": WORKFLOW_MAX_CONCURRENCY,
+        "WORKFLOW_MAX_QUEUE": WORKFLOW_MAX_QUEUE,
+        "WORKFLOW_QUEUE_TIMEOUT": WORKFLOW_QUEUE_TIMEOUT,
+        "REQUEST_DEADLINE_SECONDS": REQUEST_DEADLINE_SECONDS,
+        "DEVICE_DEADLINE_SECONDS": DEVICE_DEADLINE_SECONDS,
+        "HTTP_TIMEOUT_SECONDS": HTTP_TIMEOUT_SECONDS,
+        "RESPONSE_CACHE_TTL_SECONDS": RESPONSE_CACHE_TTL_SECONDS,
+        "RESPONSE_CACHE_DEFAULT_TTL_SECONDS": RESPONSE_CACHE_DEFAULT_TTL_SECONDS,
+        "RESPONSE_CACHE_MAX_ENTRIES": RESPONSE_CACHE_MAX_ENTRIES,
+        "RESPONSE_CACHE_MAX_BYTES": RESPONSE_CACHE_MAX_BYTES,
+        "INTENT_BATCH_MAX_QUERIES": INTENT_BATCH_MAX_QUERIES,
+        "SOIL_BULK_MAX_LOCATIONS": SOIL_BULK_MAX_LOCATIONS,
+        "INTENT_MODEL_FORMAT": INTENT_MODEL_FORMAT,
+        "QUERY_ANALYSIS_CACHE_MAX_ENTRIES": QUERY_ANALYSIS_CACHE_MAX_ENTRIES,
+        "QUERY_ANALYSIS_CACHE_CHECK_SECONDS": QUERY_ANALYSIS_CACHE_CHECK_SECONDS,
+        "DEFAULT_LOCATION": DEFAULT_LOCATION,
+        "USER_LOCATION_CACHE_MAX_ENTRIES": USER_LOCATION_CACHE_MAX_ENTRIES,
+        "WARMUP_RETRY_SECONDS": WARMUP_RETRY_SECONDS,
+        "WARMUP_RETRY_MAX_SECONDS": WARMUP_RETRY_MAX_SECONDS,
         "IS_PRODUCTION": IS_PRODUCTION,
         "PROJECT_ROOT": str(project_root),
     }
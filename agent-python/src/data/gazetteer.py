@@ -0,0 +1,372 @@
+"""
+Agricultural Gazetteer
+Description: Single-pass, word-boundary-aware matching of commodities, mandis,
+districts, states, cities, fertilizers, pests and intent keywords in user
+queries, backed by one Aho-Corasick automaton built once per process.
+"""
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.utils.aho_corasick import AhoCorasick
+from src.utils.loggers import get_logger
+from src.utils.query_keys import normalize_query
+
+# Match categories
+COMMODITY = "commodity"
+MANDI = "mandi"
+DISTRICT = "district"
+STATE = "state"
+CITY = "city"
+FERTILIZER = "fertilizer"
+PEST = "pest"
+KEYWORD = "keyword"
+
+# Canonical values of KEYWORD matches
+FERTILIZER_KEYWORD = "fertilizer"
+NUTRIENT_KEYWORD = "nutrient"
+PRICE_KEYWORD = "price"
+IRRIGATION_KEYWORD = "irrigation"
+
+# Agmarknet commodity name -> aliases (English and common Hindi transliterations)
+COMMODITIES: Dict[str, List[str]] = {
+    "Rice": ["rice", "chawal", "basmati"],
+    "Paddy(Dhan)(Common)": ["paddy"],
+    "Wheat": ["wheat", "gehu", "gehun", "gehoon"],
+    "Maize": ["maize", "corn", "makka", "makki"],
+    "Bajra(Pearl Millet/Cumbu)": ["bajra", "pearl millet"],
+    "Jowar(Sorghum)": ["jowar", "sorghum"],
+    "Ragi (Finger Millet)": ["ragi", "finger millet", "nachni"],
+    "Barley (Jau)": ["barley", "jau"],
+    "Bengal Gram(Gram)(Whole)": ["chana", "chickpea", "chickpeas", "bengal gram"],
+    "Arhar (Tur/Red Gram)(Whole)": ["arhar", "tur", "toor", "red gram", "pigeon pea"],
+    "Green Gram (Moong)(Whole)": ["moong", "green gram", "mung"],
+    "Black Gram (Urd Beans)(Whole)": ["urad", "urd", "black gram"],
+    "Lentil (Masur)(Whole)": ["lentil", "lentils", "masoor", "masur"],
+    "Soyabean": ["soybean", "soyabean", "soya bean", "soya"],
+    "Groundnut": ["groundnut", "peanut", "moongfali", "mungfali"],
+    "Mustard": ["mustard", "sarson", "rapeseed"],
+    "Sunflower": ["sunflower"],
+    "Sesamum(Sesame,Gingelly,Til)": ["sesame", "til", "gingelly"],
+    "Castor Seed": ["castor"],
+    "Linseed": ["linseed", "alsi", "flaxseed"],
+    "Cotton": ["cotton", "kapas"],
+    "Jute": ["jute"],
+    "Sugarcane": ["sugarcane", "ganna"],
+    "Onion": ["onion", "onions", "pyaz", "pyaaz", "kanda"],
+    "Potato": ["potato", "potatoes", "aloo", "alu"],
+    "Tomato": ["tomato", "tomatoes", "tamatar"],
+    "Brinjal": ["brinjal", "baingan", "eggplant"],
+    "Cabbage": ["cabbage", "patta gobhi"],
+    "Cauliflower": ["cauliflower", "phool gobhi", "gobhi"],
+    "Bhindi(Ladies Finger)": ["bhindi", "okra", "ladies finger", "lady finger"],
+    "Green Chilli": ["green chilli", "green chili", "chilli", "chili", "mirchi"],
+    "Dry Chillies": ["dry chilli", "dry chillies", "red chilli"],
+    "Garlic": ["garlic", "lahsun", "lehsun"],
+    "Ginger(Green)": ["ginger", "adrak"],
+    "Turmeric": ["turmeric", "haldi"],
+    "Coriander(Leaves)": ["coriander", "dhaniya"],
+    "Cummin Seed(Jeera)": ["cumin", "jeera"],
+    "Methi(Leaves)": ["methi", "fenugreek"],
+    "Carrot": ["carrot", "gajar"],
+    "Radish": ["radish", "mooli"],
+    "Cucumbar(Kheera)": ["cucumber", "kheera"],
+    "Bottle gourd": ["bottle gourd", "lauki"],
+    "Bitter gourd": ["bitter gourd", "karela"],
+    "Pumpkin": ["pumpkin", "kaddu"],
+    "Peas Wet": ["peas", "green peas", "matar"],
+    "Beans": ["beans", "french beans"],
+    "Cluster beans": ["cluster beans", "guar"],
+    "Capsicum": ["capsicum", "shimla mirch"],
+    "Spinach": ["spinach", "palak"],
+    "Sweet Potato": ["sweet potato", "shakarkandi"],
+    "Tapioca": ["tapioca", "cassava"],
+    "Banana": ["banana", "bananas", "kela"],
+    "Mango": ["mango", "mangoes"],
+    "Apple": ["apple", "apples", "seb"],
+    "Grapes": ["grapes", "grape", "angoor"],
+    "Pomegranate": ["pomegranate", "anar"],
+    "Orange": ["orange", "oranges", "santra"],
+    "Mousambi(Sweet Lime)": ["mousambi", "sweet lime"],
+    "Papaya": ["papaya", "papita"],
+    "Guava": ["guava", "amrood"],
+    "Pineapple": ["pineapple"],
+    "Water Melon": ["watermelon", "water melon", "tarbooj"],
+    "Lemon": ["lemon", "nimbu"],
+    "Litchi": ["litchi", "lychee"],
+    "Coconut": ["coconut", "nariyal"],
+    "Arecanut(Betelnut/Supari)": ["arecanut", "areca nut", "supari"],
+    "Cashewnuts": ["cashew", "cashewnut", "kaju"],
+    "Black pepper": ["black pepper", "pepper"],
+    "Cardamoms": ["cardamom", "elaichi"],
+    "Coffee": ["coffee"],
+    "Tea": ["tea"],
+    "Rubber": ["rubber"],
+    "Tobacco": ["tobacco"],
+}
+
+# Major mandis (APMC markets); several share their name with a district
+MANDIS: List[str] = [
+    "Lasalgaon", "Pimpalgaon", "Azadpur", "Okhla", "Ghazipur", "Vashi", "Gultekdi",
+    "Koyambedu", "Bowenpally", "Gaddiannaram", "Malakpet", "Yeshwanthpur", "Kalamna",
+    "Unjha", "Gondal", "Rajkot", "Khanna", "Indore", "Kota", "Neemuch", "Mandsaur",
+    "Jalgaon", "Nashik", "Solapur", "Hubli", "Guntur", "Kurnool", "Agra",
+]
+
+# State / union territory -> aliases
+STATES: Dict[str, List[str]] = {
+    "Andhra Pradesh": ["andhra pradesh", "andhra"],
+    "Arunachal Pradesh": ["arunachal pradesh", "arunachal"],
+    "Assam": ["assam"],
+    "Bihar": ["bihar"],
+    "Chhattisgarh": ["chhattisgarh", "chattisgarh"],
+    "Goa": ["goa"],
+    "Gujarat": ["gujarat"],
+    "Haryana": ["haryana"],
+    "Himachal Pradesh": ["himachal pradesh", "himachal"],
+    "Jharkhand": ["jharkhand"],
+    "Karnataka": ["karnataka"],
+    "Kerala": ["kerala"],
+    "Madhya Pradesh": ["madhya pradesh"],
+    "Maharashtra": ["maharashtra"],
+    "Manipur": ["manipur"],
+    "Meghalaya": ["meghalaya"],
+    "Mizoram": ["mizoram"],
+    "Nagaland": ["nagaland"],
+    "Odisha": ["odisha", "orissa"],
+    "Punjab": ["punjab"],
+    "Rajasthan": ["rajasthan"],
+    "Sikkim": ["sikkim"],
+    "Tamil Nadu": ["tamil nadu", "tamilnadu"],
+    "Telangana": ["telangana"],
+    "Tripura": ["tripura"],
+    "Uttar Pradesh": ["uttar pradesh"],
+    "Uttarakhand": ["uttarakhand", "uttaranchal"],
+    "West Bengal": ["west bengal"],
+    "Delhi": ["delhi", "new delhi", "ncr"],
+    "Jammu and Kashmir": ["jammu and kashmir", "jammu kashmir"],
+    "Ladakh": ["ladakh"],
+    "Puducherry": ["puducherry", "pondicherry"],
+}
+
+# City / district -> state, used to place a location and pick state schemes
+CITY_STATES: Dict[str, str] = {
+    "mumbai": "Maharashtra", "pune": "Maharashtra", "nashik": "Maharashtra", "satara": "Maharashtra",
+    "delhi": "Delhi", "new delhi": "Delhi", "ncr": "Delhi",
+    "bangalore": "Karnataka", "bengaluru": "Karnataka", "mysore": "Karnataka", "hubli": "Karnataka",
+    "chennai": "Tamil Nadu", "coimbatore": "Tamil Nadu", "madurai": "Tamil Nadu",
+    "hyderabad": "Telangana", "warangal": "Telangana", "nizamabad": "Telangana",
+    "kolkata": "West Bengal", "howrah": "West Bengal", "durgapur": "West Bengal",
+    "jaipur": "Rajasthan", "jodhpur": "Rajasthan", "udaipur": "Rajasthan",
+    "chandigarh": "Punjab", "ludhiana": "Punjab", "amritsar": "Punjab",
+    "gurgaon": "Haryana", "gurugram": "Haryana", "faridabad": "Haryana", "panipat": "Haryana",
+    "lucknow": "Uttar Pradesh", "kanpur": "Uttar Pradesh", "agra": "Uttar Pradesh",
+    "bhopal": "Madhya Pradesh", "indore": "Madhya Pradesh", "gwalior": "Madhya Pradesh",
+    "ahmedabad": "Gujarat", "surat": "Gujarat", "vadodara": "Gujarat",
+    "patna": "Bihar", "gaya": "Bihar", "muzaffarpur": "Bihar",
+}
+
+# Fertilizer product -> aliases
+FERTILIZERS: Dict[str, List[str]] = {
+    "Urea": ["urea"],
+    "DAP": ["dap", "diammonium phosphate", "di ammonium phosphate"],
+    "MOP": ["mop", "muriate of potash", "potash"],
+    "SSP": ["ssp", "single super phosphate", "super phosphate"],
+    "NPK": ["npk", "complex fertilizer"],
+    "Ammonium Sulphate": ["ammonium sulphate", "ammonium sulfate"],
+    "Zinc Sulphate": ["zinc sulphate", "zinc sulfate"],
+    "Gypsum": ["gypsum"],
+    "Vermicompost": ["vermicompost"],
+    "Compost": ["compost"],
+    "FYM": ["fym", "farmyard manure", "farm yard manure", "gobar khad"],
+    "Neem Cake": ["neem cake"],
+    "Biofertilizer": ["biofertilizer", "bio fertilizer", "biofertiliser"],
+}
+
+# Pest or disease -> aliases
+PESTS: Dict[str, List[str]] = {
+    "Aphid": ["aphid", "aphids"],
+    "Whitefly": ["whitefly", "whiteflies", "white fly"],
+    "Pink Bollworm": ["pink bollworm"],
+    "Bollworm": ["bollworm", "bollworms"],
+    "Fall Armyworm": ["fall armyworm"],
+    "Armyworm": ["armyworm", "armyworms"],
+    "Stem Borer": ["stem borer"],
+    "Fruit Borer": ["fruit borer", "fruit and shoot borer"],
+    "Pod Borer": ["pod borer"],
+    "Locust": ["locust", "locusts", "tiddi"],
+    "Thrips": ["thrips"],
+    "Jassid": ["jassid", "jassids"],
+    "Mealybug": ["mealybug", "mealybugs"],
+    "Termite": ["termite", "termites", "deemak", "dimak"],
+    "Leaf Miner": ["leaf miner"],
+    "Brown Plant Hopper": ["brown plant hopper", "plant hopper", "bph"],
+    "Mite": ["mite", "mites", "red spider mite"],
+    "Nematode": ["nematode", "nematodes"],
+    "White Grub": ["white grub"],
+    "Blast": ["blast"],
+    "Blight": ["blight", "late blight", "early blight"],
+    "Rust": ["rust", "yellow rust"],
+    "Powdery Mildew": ["powdery mildew"],
+    "Downy Mildew": ["downy mildew"],
+    "Wilt": ["wilt"],
+    "Leaf Curl": ["leaf curl"],
+    "Root Rot": ["root rot"],
+    "Leaf Spot": ["leaf spot"],
+}
+
+# Intent keywords used by the rule-based intent boosts and entity flags
+KEYWORDS: Dict[str, List[str]] = {
+    # Matched as whole words, so inflected and compound forms are listed explicitly
+    FERTILIZER_KEYWORD: [
+        "fertilizer", "fertilizers", "fertiliser", "fertilisers", "fertilize", "fertilise",
+        "fertilizes", "fertilises", "fertilizing", "fertilising", "fertilized", "fertilised",
+        "fertilization", "fertilisation", "manure", "manures", "manuring", "urea",
+        "phosphate", "phosphates", "superphosphate", "superphosphates",
+    ],
+    NUTRIENT_KEYWORD: [
+        "nutrient", "nutrients", "micronutrient", "micronutrients", "macronutrient", "macronutrients",
+    ],
+    PRICE_KEYWORD: [
+        "price", "prices", "priced", "rate", "rates", "cost", "costs", "costly", "market", "markets",
+        "marketing", "sell", "sells", "selling", "buying", "bhav", "bhaav", "daam",
+    ],
+    IRRIGATION_KEYWORD: [
+        "irrigate", "irrigates", "irrigated", "irrigating", "irrigation", "sinchai",
+    ],
+}
+
+# District names that are also everyday words in English or Hinglish queries
+AMBIGUOUS_DISTRICTS = {
+    "mandi", "mon", "una", "gaya", "dang", "mau", "anand", "sagar", "korea", "mahe", "dhar", "pali", "erode",
+}
+# An ambiguous district name is only matched followed by one of these ("Erode district")
+DISTRICT_QUALIFIERS = ("district", "jila", "jilla", "zila", "zilla")
+
+
+class GazetteerMatch(NamedTuple):
+    category: str
+    value: str
+    surface: str
+    start: int
+    end: int
+
+
+def _district_aliases(district: str) -> List[str]:
+    """
+    Searchable forms of a soil.csv district name ("Kaimur (Bhabua)" -> kaimur,
+    bhabua); ambiguous names only with a qualifier ("erode district").
+    """
+    name = district.strip()
+    aliases = [name]
+    if "(" in name:
+        outer, _, inner = name.partition("(")
+        aliases = [outer, inner.rstrip(")")]
+    if name.lower().startswith("the "):
+        aliases.append(name[4:])
+    searchable: List[str] = []
+    for alias in aliases:
+        if normalize_query(alias) in AMBIGUOUS_DISTRICTS:
+            searchable += [f"{alias} {qualifier}" for qualifier in DISTRICT_QUALIFIERS]
+        else:
+            searchable.append(alias)
+    return searchable
+
+
+def state_of(place: Optional[str]) -> Optional[str]:
+    """State of a city/district in CITY_STATES, or a state's own canonical name."""
+    name = normalize_query(place)
+    if not name:
+        return None
+    if name in CITY_STATES:
+        return CITY_STATES[name]
+    for state, aliases in STATES.items():
+        if name in aliases:
+            return state
+    return None
+
+
+def load_district_names() -> List[str]:
+    """District names from soil.csv, in file order."""
+    from src.data.soil_repository import get_soil_repository
+
+    return [record.district for record in get_soil_repository().records]
+
+
+class Gazetteer:
+    """
+    Compiled (alias -> (category, canonical value)) automaton. Aliases and
+    queries are normalized with normalize_query, so case, punctuation and
+    repeated whitespace do not affect matching.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, str]]):
+        values: Dict[str, List[Tuple[str, str]]] = {}
+        for alias, category, canonical in entries:
+            pattern = normalize_query(alias)
+            if pattern and (category, canonical) not in values.setdefault(pattern, []):
+                values[pattern].append((category, canonical))
+        self.automaton = AhoCorasick(values.items())
+
+    def __len__(self) -> int:
+        return len(self.automaton)
+
+    def match(self, text: Optional[str]) -> List[GazetteerMatch]:
+        """All leftmost-longest whole-word matches, in query order."""
+        return [
+            GazetteerMatch(category, canonical, match.pattern, match.start, match.end)
+            for match in self.automaton.find_all(normalize_query(text))
+            for category, canonical in match.value
+        ]
+
+
+def _entries(districts: Iterable[str]) -> Iterable[Tuple[str, str, str]]:
+    for canonical, aliases in COMMODITIES.items():
+        for alias in aliases:
+            yield alias, COMMODITY, canonical
+    for mandi in MANDIS:
+        yield mandi, MANDI, mandi
+    for district in districts:
+        for alias in _district_aliases(district):
+            yield alias, DISTRICT, district
+    for state, aliases in STATES.items():
+        for alias in aliases:
+            yield alias, STATE, state
+    for city in CITY_STATES:
+        if city not in AMBIGUOUS_DISTRICTS and city not in STATES["Delhi"]:
+            yield city, CITY, city.title()
+    for canonical, aliases in FERTILIZERS.items():
+        for alias in aliases:
+            yield alias, FERTILIZER, canonical
+    for canonical, aliases in PESTS.items():
+        for alias in aliases:
+            yield alias, PEST, canonical
+    for canonical, aliases in KEYWORDS.items():
+        for alias in aliases:
+            yield alias, KEYWORD, canonical
+
+
+def build_gazetteer(districts: Optional[Iterable[str]] = None) -> Gazetteer:
+    """Compile the gazetteer (districts default to those in soil.csv)."""
+    logger = get_logger("gazetteer")
+    if districts is None:
+        try:
+            districts = load_district_names()
+        except Exception as e:
+            logger.error(f"[Gazetteer] Could not load districts from soil.csv: {e}")
+            districts = []
+    gazetteer = Gazetteer(_entries(districts))
+    logger.info(f"[Gazetteer] Compiled {len(gazetteer)} patterns")
+    return gazetteer
+
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_lock = threading.Lock()
+
+def get_gazetteer() -> Gazetteer:
+    """Return the process-wide gazetteer, compiling it on first use."""
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = build_gazetteer()
+    return _gazetteer
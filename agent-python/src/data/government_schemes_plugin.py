@@ -7,6 +7,7 @@ import requests
 from typing import Dict, List, Optional
 from src.utils.loggers import get_logger
 from src.config.settings import GEMINI_API_KEY
+from src.data.gazetteer import CITY, DISTRICT, STATE, get_gazetteer, state_of
 
 # Central Government Scheme APIs
 CENTRAL_SCHEME_APIS = {
@@ -405,27 +406,15 @@ def extract_state_from_location(location) -> str:
     else:
         location_str = str(location)
     
-    location_lower = location_str.lower()
-    
-    # Major Indian states mapping
-    state_mapping = {
-        "mumbai": "Maharashtra", "pune": "Maharashtra", "nashik": "Maharashtra",
-        "delhi": "Delhi", "new delhi": "Delhi", "ncr": "Delhi",
-        "bangalore": "Karnataka", "mysore": "Karnataka", "hubli": "Karnataka",
-        "chennai": "Tamil Nadu", "coimbatore": "Tamil Nadu", "madurai": "Tamil Nadu",
-        "hyderabad": "Telangana", "warangal": "Telangana", "nizamabad": "Telangana",
-        "kolkata": "West Bengal", "howrah": "West Bengal", "durgapur": "West Bengal",
-        "jaipur": "Rajasthan", "jodhpur": "Rajasthan", "udaipur": "Rajasthan",
-        "chandigarh": "Punjab", "ludhiana": "Punjab", "amritsar": "Punjab",
-        "gurgaon": "Haryana", "faridabad": "Haryana", "panipat": "Haryana",
-        "lucknow": "Uttar Pradesh", "kanpur": "Uttar Pradesh", "agra": "Uttar Pradesh",
-        "bhopal": "Madhya Pradesh", "indore": "Madhya Pradesh", "gwalior": "Madhya Pradesh",
-        "ahmedabad": "Gujarat", "surat": "Gujarat", "vadodara": "Gujarat",
-        "patna": "Bihar", "gaya": "Bihar", "muzaffarpur": "Bihar"
-    }
-    
-    for city, state in state_mapping.items():
-        if city in location_lower:
+    # Exact city/district/state name first, then any place named in the string
+    state = state_of(location_str)
+    if state:
+        return state
+    for match in get_gazetteer().match(location_str):
+        if match.category == STATE:
+            return match.value
+        state = state_of(match.value) if match.category in (CITY, DISTRICT) else None
+        if state:
             return state
     
     return "Unknown"
@@ -1,7 +1,8 @@
-
 import os
-import requests
 from dotenv import load_dotenv
+from src.utils.http_client import get_async_client, get_sync_session
+from src.config.settings import HTTP_TIMEOUT_SECONDS
+from src.utils.instrumentation import measure_call
 
 # Always load .env from repo root
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'env', '.env'))
@@ -10,11 +11,12 @@ API_KEY = os.getenv("AGMARKNET_API_KEY")
 class AgmarknetAPIClient:
     BASE_URL = "https://api.data.gov.in/resource/9ef84268-d588-465a-a308-a864a43d0070"
 
-    def __init__(self):
+    def __init__(self, timeout: float = HTTP_TIMEOUT_SECONDS):
         if not API_KEY:
             raise ValueError("API key not found. Set AGMARKNET_API_KEY in your .env file.")
+        self.timeout = timeout
 
-    def __call__(
+    def _build_params(
         self,
         state: str = None,
         district: str = None,
@@ -25,11 +27,8 @@ class AgmarknetAPIClient:
         limit: int = 10,
         offset: int = 0,
         format: str = "json"
-    ) -> list[dict]:
-        """
-        Fetch data from Agmarknet API with optional filters.
-        Returns a list of records (dictionaries).
-        """
+    ) -> dict:
+        """Build the Agmarknet query parameters with optional filters."""
         params = {
             "api-key": API_KEY,
             "format": format,
@@ -48,12 +47,38 @@ class AgmarknetAPIClient:
             params["filters[variety]"] = variety
         if grade:
             params["filters[grade]"] = grade
+        return params
+
+    def __call__(self, **filters) -> list[dict]:
+        """
+        Fetch data from Agmarknet API with optional filters.
+        Returns a list of records (dictionaries).
+        """
+        params = self._build_params(**filters)
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=20)
+            with measure_call("agmarknet") as call:
+                response = get_sync_session().get(self.BASE_URL, params=params, timeout=self.timeout)
+                call.add_bytes(sent=len(response.request.url), received=len(response.content))
             response.raise_for_status()
             return response.json().get("records", [])
         except Exception as e:
             print(f"[AgmarknetAPIClient] Error: {e}")
             return []
 
+    async def acall(self, **filters) -> list[dict]:
+        """
+        Async variant of __call__ using the shared httpx client.
+        Returns a list of records (dictionaries).
+        """
+        params = self._build_params(**filters)
+
+        try:
+            with measure_call("agmarknet") as call:
+                response = await get_async_client().get(self.BASE_URL, params=params, timeout=self.timeout)
+                call.add_bytes(sent=len(str(response.request.url)), received=len(response.content))
+            response.raise_for_status()
+            return response.json().get("records", [])
+        except Exception as e:
+            print(f"[AgmarknetAPIClient] Error: {e}")
+            return []
@@ -4,17 +4,74 @@ Description: Provides soil analysis using Indian district-wise soil nutrient dat
 Fast, reliable, data-driven soil recommendations
 """
 import os
-import pandas as pd
-from typing import Dict, Optional, List
+import threading
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional, List, Mapping, Tuple, Union
+from src.data.soil_repository import (
+    NUTRIENT_COLUMNS, SOIL_CSV_PATH, SoilRecord, SoilRepository, get_soil_repository, name_variations,
+)
+from src.data.soil_scoring import (
+    CLASS_THRESHOLDS, HEALTH_BANDS, MAX_LIMITING_FACTORS, SUFFICIENCY_THRESHOLDS, SoilScores, score_matrix, score_records,
+)
 from src.utils.loggers import get_logger
+from src.utils.instrumentation import measure_lookup
+from src.utils.query_keys import normalize_query
 
-def get_soil_data_from_csv(location: str, query: str = "") -> Dict:
+if TYPE_CHECKING:
+    # pandas is only needed by the DataFrame helpers, so it is imported lazily
+    import pandas as pd
+
+# Parsed soil table, reloaded only when soil.csv changes on disk
+_soil_table = None
+_soil_table_mtime = None
+_soil_table_lock = threading.Lock()
+
+def load_soil_table() -> "pd.DataFrame":
+    """Return the parsed soil.csv, reading it again only after it changes"""
+    import pandas as pd
+    
+    global _soil_table, _soil_table_mtime
+    mtime = os.path.getmtime(SOIL_CSV_PATH)
+    if _soil_table is not None and _soil_table_mtime == mtime:
+        return _soil_table
+    with _soil_table_lock:
+        if _soil_table is None or _soil_table_mtime != mtime:
+            _soil_table = pd.read_csv(SOIL_CSV_PATH)
+            _soil_table_mtime = mtime
+    return _soil_table
+
+# Report labels and deficiency fertilizers, in soil.csv nutrient order
+NUTRIENT_LABELS = {
+    'zinc': 'Zinc (Zn)',
+    'iron': 'Iron (Fe)',
+    'copper': 'Copper (Cu)',
+    'manganese': 'Manganese (Mn)',
+    'boron': 'Boron (B)',
+    'sulfur': 'Sulfur (S)',
+}
+DEFICIENCY_FERTILIZERS = {
+    'zinc': "Apply Zinc Sulfate (25 kg/ha)",
+    'iron': "Apply Iron Sulfate or FeSO4 (20 kg/ha)",
+    'copper': "Apply Copper Sulfate (10 kg/ha)",
+    'manganese': "Apply Manganese Sulfate (15 kg/ha)",
+    'boron': "Apply Borax (10 kg/ha)",
+    'sulfur': "Apply Gypsum or Sulfur fertilizer (200 kg/ha)",
+}
+
+def mentions_irrigation(query: str) -> bool:
+    """Whether the query asks about irrigation (used when no QueryAnalysis is available)"""
+    return "irrigat" in (query or "").lower()
+
+def get_soil_data_from_csv(location: str, query: str = "", analysis=None) -> Dict:
     """
     Analyze soil based on CSV data for Indian districts
     
     Args:
         location (str): Location name (district, state)
         query (str): User's specific question about soil/crops
+        analysis (QueryAnalysis, optional): Pre-computed analysis of the query;
+            its keyword flags are used instead of re-scanning the query text
         
     Returns:
         Dict: Comprehensive soil analysis with nutrient data
@@ -23,21 +80,23 @@ def get_soil_data_from_csv(location: str, query: str = "") -> Dict:
     logger.info(f"[SoilCSV] Starting CSV-based soil analysis for location: {location}")
     logger.info(f"[SoilCSV] User query: {query}")
     
+    irrigation_focus = analysis.mentions_irrigation if analysis is not None else mentions_irrigation(query)
+    
     try:
-        # Load soil CSV data
-        csv_path = os.path.join(os.path.dirname(__file__), 'soil.csv')
-        soil_df = pd.read_csv(csv_path)
-        logger.info(f"[SoilCSV] Loaded soil data with {len(soil_df)} districts")
-        
-        # Find matching district
-        district_data = find_district_in_csv(soil_df, location)
+        # Indexed soil.csv with every district's analysis precomputed
+        with measure_lookup("soil_analysis_table") as lookup:
+            analysis_table = get_soil_analysis_table()
+            
+            # Find matching district
+            district_data = analysis_table.repository.find(location)
+            lookup.cache_result(district_data is not None)
         
         if district_data is not None:
             logger.info(f"[SoilCSV] Found exact match for {location}")
-            soil_analysis = analyze_district_nutrients(district_data, location, query)
+            soil_analysis = with_location(analysis_table.get(district_data, irrigation_focus), location)
         else:
             logger.info(f"[SoilCSV] No exact match found, using regional analysis")
-            soil_analysis = get_regional_soil_analysis(location, query)
+            soil_analysis = get_regional_soil_analysis(location, query, irrigation_focus)
         
         logger.info(f"[SoilCSV] Soil analysis completed for {location}")
         return soil_analysis
@@ -47,160 +106,208 @@ def get_soil_data_from_csv(location: str, query: str = "") -> Dict:
         logger.info("[SoilCSV] Falling back to basic knowledge")
         return get_fallback_soil_knowledge(location, query)
 
-def find_district_in_csv(soil_df: pd.DataFrame, location: str) -> Optional[pd.Series]:
-    """Find district data in CSV by location name"""
-    
-    location_clean = location.strip().lower()
-    
-    # Direct district name search
-    for idx, row in soil_df.iterrows():
-        district_name = str(row['District ']).strip().lower()
-        
-        # Exact match
-        if district_name == location_clean:
-            return row
-        
-        # Partial match (location contains district name or vice versa)
-        if district_name in location_clean or location_clean in district_name:
-            return row
+def get_soil_data_bulk(locations: Iterable[str], query: str = "", analysis=None) -> Iterator[Tuple[str, Dict]]:
+    """
+    Soil analysis for many locations, yielded as (location, analysis) pairs
     
-    # Try common name variations
-    location_variations = get_location_variations(location_clean)
+    Locations that normalize to the same name ("Pune", " pune ") are analysed
+    once, under their first spelling, and yielded in first-seen order. All of
+    them are resolved against the soil index up front; each result is the
+    same as get_soil_data_from_csv would return for that location and query.
+    """
+    logger = get_logger("soil_plugins")
+    irrigation_focus = analysis.mentions_irrigation if analysis is not None else mentions_irrigation(query)
     
-    for variation in location_variations:
-        for idx, row in soil_df.iterrows():
-            district_name = str(row['District ']).strip().lower()
-            if district_name == variation or variation in district_name:
-                return row
+    unique_locations: Dict[str, str] = {}
+    for location in locations:
+        key = normalize_query(location)
+        if key and key not in unique_locations:
+            unique_locations[key] = location.strip()
+    logger.info(f"[SoilCSV] Bulk soil analysis for {len(unique_locations)} unique locations")
     
-    return None
+    try:
+        analysis_table = get_soil_analysis_table()
+        resolved = analysis_table.repository.find_many(unique_locations)
+    except Exception as e:
+        logger.error(f"[SoilCSV] Error loading soil index for bulk analysis: {e}")
+        analysis_table, resolved = None, {}
+    
+    for key, location in unique_locations.items():
+        try:
+            if analysis_table is None:
+                soil_analysis = get_fallback_soil_knowledge(location, query)
+            elif resolved.get(key) is not None:
+                soil_analysis = with_location(analysis_table.get(resolved[key], irrigation_focus), location)
+            else:
+                soil_analysis = with_location(district_analysis(regional_soil_record(location), irrigation_focus), location)
+        except Exception as e:
+            logger.error(f"[SoilCSV] Error in bulk soil analysis for {location}: {e}")
+            soil_analysis = get_fallback_soil_knowledge(location, query)
+        yield location, soil_analysis
+
+def find_district_in_csv(soil_df: "pd.DataFrame", location: str) -> Optional["pd.Series"]:
+    """Find district data in a soil table by location name (see SoilRepository.find)"""
+    record = SoilRepository.from_frame(soil_df).find(location)
+    return soil_df.iloc[record.row] if record is not None else None
 
 def get_location_variations(location: str) -> List[str]:
     """Generate common variations of location names"""
-    
-    variations = [location]
-    
-    # Common spelling variations
-    replacements = {
-        'bangalore': ['bengaluru', 'bangalore urban'],
-        'bengaluru': ['bangalore', 'bangalore urban'],
-        'mumbai': ['bombay'],
-        'delhi': ['new delhi'],
-        'pune': ['poona'],
-        'kolkata': ['calcutta'],
-        'chennai': ['madras'],
-        'hyderabad': ['secunderabad'],
-        'gurgaon': ['gurugram'],
-        'noida': ['gautam buddha nagar'],
-        'faridabad': ['faridabad'],
-        'ghaziabad': ['ghaziabad']
-    }
-    
-    for original, alts in replacements.items():
-        if original in location:
-            for alt in alts:
-                variations.append(location.replace(original, alt))
-        
-        for alt in alts:
-            if alt in location:
-                variations.append(location.replace(alt, original))
-    
-    return list(set(variations))
+    return name_variations(location)
+
+def _as_soil_record(district_data: Union[SoilRecord, "pd.Series"]) -> SoilRecord:
+    """Accept a soil.csv row (Series) where a SoilRecord is expected"""
+    if isinstance(district_data, SoilRecord):
+        return district_data
+    nutrients = {}
+    for nutrient, column in NUTRIENT_COLUMNS.items():
+        value = district_data[column]
+        # Missing values (None, or NaN: the only value unequal to itself) count as 0
+        nutrients[nutrient] = float(value) if value is not None and value == value else 0
+    return SoilRecord(-1, district_data['District '], nutrients)
 
-def analyze_district_nutrients(district_data: pd.Series, location: str, query: str) -> Dict:
+def analyze_district_nutrients(district_data: Union[SoilRecord, "pd.Series"], location: str, query: str, irrigation_focus: Optional[bool] = None) -> Dict:
     """Analyze soil nutrients for a specific district"""
     
     logger = get_logger("soil_plugins")
+    if irrigation_focus is None:
+        irrigation_focus = mentions_irrigation(query)
     
     try:
-        district_name = district_data['District ']
-        
-        # Extract nutrient percentages
-        nutrients = {
-            'zinc': float(district_data['Zn %']) if pd.notna(district_data['Zn %']) else 0,
-            'iron': float(district_data['Fe%']) if pd.notna(district_data['Fe%']) else 0,
-            'copper': float(district_data['Cu %']) if pd.notna(district_data['Cu %']) else 0,
-            'manganese': float(district_data['Mn %']) if pd.notna(district_data['Mn %']) else 0,
-            'boron': float(district_data['B %']) if pd.notna(district_data['B %']) else 0,
-            'sulfur': float(district_data['S %']) if pd.notna(district_data['S %']) else 0
-        }
+        record = _as_soil_record(district_data)
+        soil_analysis = with_location(district_analysis(record, irrigation_focus), location)
         
-        # Classify nutrient levels
-        nutrient_status = classify_nutrients(nutrients)
+        logger.info(f"[SoilCSV] Generated nutrient analysis for {record.district}")
+        return soil_analysis
         
-        # Determine soil health and fertility
-        soil_health = assess_soil_health(nutrients)
+    except Exception as e:
+        logger.error(f"[SoilCSV] Error analyzing district nutrients: {e}")
+        return get_fallback_soil_knowledge(location, query)
+
+def district_analysis(record: SoilRecord, irrigation_focus: bool, scores: Optional[SoilScores] = None, index: int = 0) -> Dict:
+    """
+    The part of a district's soil analysis that depends only on its soil.csv row
+    and the irrigation flag. "soil_type" is left empty and "recommended_crops"
+    holds only the nutrient-driven crops; with_location() fills in both.
+    Row `index` of precomputed `scores`, when given, supplies the nutrient
+    classes and soil health.
+    """
+    district_name = record.district
+    
+    # Nutrient percentages
+    nutrients = dict(record.nutrients)
+    
+    # Classify nutrient levels
+    nutrient_status = scores.nutrient_status(index) if scores is not None else classify_nutrients(nutrients)
+    
+    # Determine soil health and fertility
+    soil_health = scores.soil_health(index) if scores is not None else assess_soil_health(nutrients)
+    
+    # Get irrigation and fertilizer recommendations
+    management_advice = get_soil_management_advice(nutrients, "", irrigation_focus)
+    
+    return {
+        "location": f"{district_name} (District Data)",
+        "data_source": "Indian Soil Survey CSV Data",
+        "quality_score": "9/10",
         
-        # Get crop recommendations based on nutrients
-        recommended_crops = get_crops_for_nutrients(nutrients, location)
+        # Nutrient Analysis
+        "zinc_status": f"{nutrients['zinc']:.1f}% ({nutrient_status['zinc']})",
+        "iron_status": f"{nutrients['iron']:.1f}% ({nutrient_status['iron']})",
+        "copper_status": f"{nutrients['copper']:.1f}% ({nutrient_status['copper']})",
+        "manganese_status": f"{nutrients['manganese']:.1f}% ({nutrient_status['manganese']})",
+        "boron_status": f"{nutrients['boron']:.1f}% ({nutrient_status['boron']})",
+        "sulfur_status": f"{nutrients['sulfur']:.1f}% ({nutrient_status['sulfur']})",
         
-        # Get irrigation and fertilizer recommendations
-        management_advice = get_soil_management_advice(nutrients, query)
+        # Overall Assessment
+        "soil_health": soil_health['overall'],
+        "fertility_status": soil_health['fertility'],
+        "limiting_factors": tuple(soil_health['limitations']),
         
-        # Generate comprehensive analysis
-        soil_analysis = {
-            "location": f"{district_name} (District Data)",
-            "data_source": "Indian Soil Survey CSV Data",
-            "quality_score": "9/10",
-            
-            # Nutrient Analysis
-            "zinc_status": f"{nutrients['zinc']:.1f}% ({nutrient_status['zinc']})",
-            "iron_status": f"{nutrients['iron']:.1f}% ({nutrient_status['iron']})",
-            "copper_status": f"{nutrients['copper']:.1f}% ({nutrient_status['copper']})",
-            "manganese_status": f"{nutrients['manganese']:.1f}% ({nutrient_status['manganese']})",
-            "boron_status": f"{nutrients['boron']:.1f}% ({nutrient_status['boron']})",
-            "sulfur_status": f"{nutrients['sulfur']:.1f}% ({nutrient_status['sulfur']})",
-            
-            # Overall Assessment
-            "soil_health": soil_health['overall'],
-            "fertility_status": soil_health['fertility'],
-            "limiting_factors": soil_health['limitations'],
-            
-            # Recommendations
-            "recommended_crops": recommended_crops,
-            "irrigation_guidance": management_advice['irrigation'],
-            "fertilizer_recommendations": management_advice['fertilizers'],
-            
-            # Formatted for compatibility
-            "soil_type": determine_soil_type_from_location(location),
-            "ph": "6.5-7.5 (Neutral - typical for region)",
-            "nitrogen": "Medium (estimated from regional data)",
-            "organic_carbon": "1.0-2.0% (Medium)",
-            "sand_content": "35-45%",
-            "clay_content": "25-35%",
-            "silt_content": "25-35%",
-            
-            # AI Recommendation
-            "ai_recommendation": generate_detailed_recommendation(district_name, nutrients, query)
-        }
+        # Recommendations (regional crop defaults depend on the location)
+        "recommended_crops": tuple(dict.fromkeys(nutrient_crops(nutrients)))[:6],
+        "irrigation_guidance": management_advice['irrigation'],
+        "fertilizer_recommendations": management_advice['fertilizers'],
         
-        logger.info(f"[SoilCSV] Generated nutrient analysis for {district_name}")
-        return soil_analysis
+        # Formatted for compatibility
+        "soil_type": None,
+        "ph": "6.5-7.5 (Neutral - typical for region)",
+        "nitrogen": "Medium (estimated from regional data)",
+        "organic_carbon": "1.0-2.0% (Medium)",
+        "sand_content": "35-45%",
+        "clay_content": "25-35%",
+        "silt_content": "25-35%",
         
-    except Exception as e:
-        logger.error(f"[SoilCSV] Error analyzing district nutrients: {e}")
-        return get_fallback_soil_knowledge(location, query)
+        # AI Recommendation
+        "ai_recommendation": generate_detailed_recommendation(district_name, nutrients, "", irrigation_focus)
+    }
+
+def with_location(district_result: Mapping, location: str) -> Dict:
+    """A fresh response dict from a district_analysis() result plus the location-dependent fields"""
+    soil_analysis = dict(district_result)
+    soil_analysis["limiting_factors"] = list(district_result["limiting_factors"])
+    soil_analysis["recommended_crops"] = list(district_result["recommended_crops"]) or regional_default_crops(location)
+    soil_analysis["soil_type"] = determine_soil_type_from_location(location)
+    return soil_analysis
+
+class SoilAnalysisTable:
+    """
+    district_analysis() for every district of a SoilRepository and both
+    irrigation variants, computed once and stored as read-only mappings.
+    `scores` holds the vectorized nutrient scores of all districts, in
+    repository order, for dashboards and bulk exports.
+    """
+    
+    def __init__(self, repository: SoilRepository):
+        self.repository = repository
+        self.scores = (
+            score_matrix(repository.matrix, [record.district for record in repository.records])
+            if repository.matrix is not None else score_records(repository.records)
+        )
+        self._analyses: Dict[tuple, Mapping] = {
+            (record.row, irrigation_focus): MappingProxyType(
+                district_analysis(record, irrigation_focus, self.scores, index)
+            )
+            for index, record in enumerate(repository.records)
+            for irrigation_focus in (False, True)
+        }
+    
+    def __len__(self) -> int:
+        return len(self._analyses)
+    
+    def get(self, record: SoilRecord, irrigation_focus: bool) -> Mapping:
+        """Precomputed analysis of a record from this table's repository"""
+        return self._analyses[(record.row, bool(irrigation_focus))]
+
+_analysis_table: Optional[SoilAnalysisTable] = None
+_analysis_table_lock = threading.Lock()
+
+def get_soil_analysis_table() -> SoilAnalysisTable:
+    """Return the process-wide analysis table, recomputing it whenever the soil repository is rebuilt"""
+    global _analysis_table
+    repository = get_soil_repository()
+    table = _analysis_table
+    if table is not None and table.repository is repository:
+        return table
+    with _analysis_table_lock:
+        if _analysis_table is None or _analysis_table.repository is not repository:
+            start_time = time.perf_counter()
+            _analysis_table = SoilAnalysisTable(repository)
+            get_logger("soil_plugins").info(
+                f"[SoilCSV] Precomputed {len(_analysis_table)} district analyses "
+                f"in {time.perf_counter() - start_time:.3f}s"
+            )
+        return _analysis_table
 
 def classify_nutrients(nutrients: Dict[str, float]) -> Dict[str, str]:
-    """Classify nutrient levels as Low, Medium, or High"""
-    
-    # Classification thresholds based on Indian soil standards
-    thresholds = {
-        'zinc': {'low': 30, 'medium': 70},
-        'iron': {'low': 40, 'medium': 80},
-        'copper': {'low': 60, 'medium': 90},
-        'manganese': {'low': 50, 'medium': 85},
-        'boron': {'low': 30, 'medium': 70},
-        'sulfur': {'low': 40, 'medium': 80}
-    }
+    """Classify nutrient levels as Low, Medium, or High (see soil_scoring for whole-table scoring)"""
     
     classification = {}
     
     for nutrient, value in nutrients.items():
-        if nutrient in thresholds:
-            if value < thresholds[nutrient]['low']:
+        if nutrient in CLASS_THRESHOLDS:
+            if value < CLASS_THRESHOLDS[nutrient]['low']:
                 classification[nutrient] = 'Low'
-            elif value < thresholds[nutrient]['medium']:
+            elif value < CLASS_THRESHOLDS[nutrient]['medium']:
                 classification[nutrient] = 'Medium'
             else:
                 classification[nutrient] = 'High'
@@ -217,43 +324,35 @@ def assess_soil_health(nutrients: Dict[str, float]) -> Dict[str, str]:
     sufficient_nutrients = 0
     limiting_factors = []
     
-    thresholds = {
-        'zinc': 50, 'iron': 60, 'copper': 70, 
-        'manganese': 60, 'boron': 50, 'sulfur': 60
-    }
-    
     for nutrient, value in nutrients.items():
-        if nutrient in thresholds:
-            if value >= thresholds[nutrient]:
+        if nutrient in SUFFICIENCY_THRESHOLDS:
+            if value >= SUFFICIENCY_THRESHOLDS[nutrient]:
                 sufficient_nutrients += 1
             else:
                 limiting_factors.append(nutrient.capitalize())
     
     # Overall health assessment
     sufficiency_ratio = sufficient_nutrients / total_nutrients
-    
-    if sufficiency_ratio >= 0.8:
-        overall = "Excellent"
-        fertility = "High"
-    elif sufficiency_ratio >= 0.6:
-        overall = "Good"
-        fertility = "Medium to High"
-    elif sufficiency_ratio >= 0.4:
-        overall = "Moderate"
-        fertility = "Medium"
-    else:
-        overall = "Poor"
-        fertility = "Low to Medium"
+    _, overall, fertility = next(band for band in HEALTH_BANDS if sufficiency_ratio >= band[0])
     
     return {
         'overall': overall,
         'fertility': fertility,
-        'limitations': limiting_factors[:3] if limiting_factors else ['None identified']
+        'limitations': limiting_factors[:MAX_LIMITING_FACTORS] if limiting_factors else ['None identified']
     }
 
 def get_crops_for_nutrients(nutrients: Dict[str, float], location: str) -> List[str]:
     """Recommend crops based on nutrient profile"""
     
+    suitable_crops = nutrient_crops(nutrients) or regional_default_crops(location)
+    
+    # Remove duplicates and return top 6
+    unique_crops = list(dict.fromkeys(suitable_crops))
+    return unique_crops[:6]
+
+def nutrient_crops(nutrients: Dict[str, float]) -> List[str]:
+    """Crops suited to the nutrients the soil is rich in (may repeat, may be empty)"""
+    
     suitable_crops = []
     
     # High zinc crops
@@ -280,49 +379,35 @@ def get_crops_for_nutrients(nutrients: Dict[str, float], location: str) -> List[
     if nutrients['sulfur'] > 70:
         suitable_crops.extend(['Onion', 'Garlic', 'Cruciferous vegetables'])
     
-    # Regional defaults based on location
-    if not suitable_crops:
-        location_lower = location.lower()
-        if any(state in location_lower for state in ['punjab', 'haryana']):
-            suitable_crops = ['Wheat', 'Rice', 'Maize', 'Cotton']
-        elif any(state in location_lower for state in ['maharashtra', 'gujarat']):
-            suitable_crops = ['Cotton', 'Sugarcane', 'Soybean', 'Jowar']
-        elif any(state in location_lower for state in ['karnataka', 'kerala']):
-            suitable_crops = ['Rice', 'Ragi', 'Coconut', 'Spices']
-        else:
-            suitable_crops = ['Rice', 'Wheat', 'Pulses', 'Vegetables']
-    
-    # Remove duplicates and return top 6
-    unique_crops = list(dict.fromkeys(suitable_crops))
-    return unique_crops[:6]
+    return suitable_crops
 
-def get_soil_management_advice(nutrients: Dict[str, float], query: str) -> Dict[str, str]:
+def regional_default_crops(location: str) -> List[str]:
+    """Regional defaults based on location, for soils with no nutrient-driven crops"""
+    location_lower = location.lower()
+    if any(state in location_lower for state in ['punjab', 'haryana']):
+        return ['Wheat', 'Rice', 'Maize', 'Cotton']
+    elif any(state in location_lower for state in ['maharashtra', 'gujarat']):
+        return ['Cotton', 'Sugarcane', 'Soybean', 'Jowar']
+    elif any(state in location_lower for state in ['karnataka', 'kerala']):
+        return ['Rice', 'Ragi', 'Coconut', 'Spices']
+    else:
+        return ['Rice', 'Wheat', 'Pulses', 'Vegetables']
+
+def get_soil_management_advice(nutrients: Dict[str, float], query: str, irrigation_focus: Optional[bool] = None) -> Dict[str, str]:
     """Generate irrigation and fertilizer recommendations"""
+    if irrigation_focus is None:
+        irrigation_focus = mentions_irrigation(query)
     
     irrigation_advice = "Monitor soil moisture regularly. Irrigate based on crop requirements and weather conditions."
     fertilizer_advice = []
     
     # Specific fertilizer recommendations based on deficiencies
-    if nutrients['zinc'] < 50:
-        fertilizer_advice.append("Apply Zinc Sulfate (25 kg/ha)")
-    
-    if nutrients['iron'] < 60:
-        fertilizer_advice.append("Apply Iron Sulfate or FeSO4 (20 kg/ha)")
-    
-    if nutrients['copper'] < 70:
-        fertilizer_advice.append("Apply Copper Sulfate (10 kg/ha)")
-    
-    if nutrients['manganese'] < 60:
-        fertilizer_advice.append("Apply Manganese Sulfate (15 kg/ha)")
-    
-    if nutrients['boron'] < 50:
-        fertilizer_advice.append("Apply Borax (10 kg/ha)")
-    
-    if nutrients['sulfur'] < 60:
-        fertilizer_advice.append("Apply Gypsum or Sulfur fertilizer (200 kg/ha)")
+    for nutrient, fertilizer in DEFICIENCY_FERTILIZERS.items():
+        if nutrients[nutrient] < SUFFICIENCY_THRESHOLDS[nutrient]:
+            fertilizer_advice.append(fertilizer)
     
     # Irrigation-specific advice for query
-    if "irrigat" in query.lower():
+    if irrigation_focus:
         avg_nutrients = sum(nutrients.values()) / len(nutrients)
         if avg_nutrients > 80:
             irrigation_advice = "Soil has high nutrient retention. Irrigate moderately to prevent nutrient leaching."
@@ -355,29 +440,27 @@ def determine_soil_type_from_location(location: str) -> str:
     else:
         return "Mixed Indian Agricultural Soil"
 
-def generate_detailed_recommendation(district: str, nutrients: Dict[str, float], query: str) -> str:
+def generate_detailed_recommendation(district: str, nutrients: Dict[str, float], query: str, irrigation_focus: Optional[bool] = None) -> str:
     """Generate detailed AI-style recommendation"""
+    if irrigation_focus is None:
+        irrigation_focus = mentions_irrigation(query)
     
     recommendation = f"""
 COMPREHENSIVE SOIL ANALYSIS FOR {district.upper()}:
 
 NUTRIENT STATUS ANALYSIS:
-- Zinc (Zn): {nutrients['zinc']:.1f}% - {'Sufficient' if nutrients['zinc'] > 50 else 'Deficient'}
-- Iron (Fe): {nutrients['iron']:.1f}% - {'Sufficient' if nutrients['iron'] > 60 else 'Deficient'}  
-- Copper (Cu): {nutrients['copper']:.1f}% - {'Sufficient' if nutrients['copper'] > 70 else 'Deficient'}
-- Manganese (Mn): {nutrients['manganese']:.1f}% - {'Sufficient' if nutrients['manganese'] > 60 else 'Deficient'}
-- Boron (B): {nutrients['boron']:.1f}% - {'Sufficient' if nutrients['boron'] > 50 else 'Deficient'}
-- Sulfur (S): {nutrients['sulfur']:.1f}% - {'Sufficient' if nutrients['sulfur'] > 60 else 'Deficient'}
-
-PRIORITY RECOMMENDATIONS:
 """
+    # Sufficient at or above the shared threshold, as in assess_soil_health
+    for nutrient, label in NUTRIENT_LABELS.items():
+        status = 'Sufficient' if nutrients[nutrient] >= SUFFICIENCY_THRESHOLDS[nutrient] else 'Deficient'
+        recommendation += f"- {label}: {nutrients[nutrient]:.1f}% - {status}\n"
+    recommendation += "\nPRIORITY RECOMMENDATIONS:\n"
     
     # Add specific recommendations based on deficiencies
-    deficient_nutrients = []
-    for nutrient, value in nutrients.items():
-        thresholds = {'zinc': 50, 'iron': 60, 'copper': 70, 'manganese': 60, 'boron': 50, 'sulfur': 60}
-        if value < thresholds.get(nutrient, 50):
-            deficient_nutrients.append(nutrient)
+    deficient_nutrients = [
+        nutrient for nutrient, value in nutrients.items()
+        if value < SUFFICIENCY_THRESHOLDS.get(nutrient, 50)
+    ]
     
     if deficient_nutrients:
         recommendation += f"\n1. IMMEDIATE ACTION: Address {', '.join(deficient_nutrients)} deficiency through targeted fertilization"
@@ -388,7 +471,7 @@ PRIORITY RECOMMENDATIONS:
         recommendation += f"\n2. OPTIMIZATION: Focus on organic matter enhancement for sustained productivity"
     
     # Add irrigation-specific advice if mentioned in query
-    if "irrigat" in query.lower():
+    if irrigation_focus:
         avg_nutrients = sum(nutrients.values()) / len(nutrients)
         if avg_nutrients > 75:
             recommendation += f"\n\nIRRIGATION STRATEGY: High nutrient soil - irrigate moderately to prevent leaching"
@@ -399,12 +482,17 @@ PRIORITY RECOMMENDATIONS:
     
     return recommendation
 
-def get_regional_soil_analysis(location: str, query: str) -> Dict:
+def get_regional_soil_analysis(location: str, query: str, irrigation_focus: Optional[bool] = None) -> Dict:
     """Get regional soil analysis when specific district data is not available"""
     
     logger = get_logger("soil_plugins")
     logger.info(f"[SoilCSV] Generating regional analysis for {location}")
     
+    return analyze_district_nutrients(regional_soil_record(location), location, query, irrigation_focus)
+
+def regional_soil_record(location: str) -> SoilRecord:
+    """Soil record of regional nutrient averages for a location with no district data"""
+    
     # Regional nutrient averages (estimated from CSV data patterns)
     regional_data = {
         'north_india': {'zinc': 70, 'iron': 75, 'copper': 95, 'manganese': 80, 'boron': 55, 'sulfur': 75},
@@ -432,18 +520,10 @@ def get_regional_soil_analysis(location: str, query: str) -> Dict:
         nutrients = regional_data['central_india']
         region = 'Central India'
     
-    return analyze_district_nutrients(
-        pd.Series({
-            'District ': f"{location} ({region} Regional)",
-            'Zn %': nutrients['zinc'],
-            'Fe%': nutrients['iron'],
-            'Cu %': nutrients['copper'],
-            'Mn %': nutrients['manganese'],
-            'B %': nutrients['boron'],
-            'S %': nutrients['sulfur']
-        }),
-        location,
-        query
+    return SoilRecord(
+        -1,
+        f"{location} ({region} Regional)",
+        MappingProxyType({nutrient: float(value) for nutrient, value in nutrients.items()}),
     )
 
 def get_fallback_soil_knowledge(location: str, query: str) -> Dict:
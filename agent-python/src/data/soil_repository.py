@@ -0,0 +1,343 @@
+"""
+Soil Repository
+Description: soil.csv loaded once per process into immutable district records,
+indexed by normalized district name and by common name variations so a
+location lookup is a few dictionary probes instead of a scan of every row.
+The repository is rebuilt automatically when soil.csv changes on disk.
+
+Workers load it from a columnar build of soil.csv (soil_columnar/: .npy
+arrays memory-mapped read-only, so the OS shares their pages between
+processes) and fall back to parsing the CSV with the csv module when the
+build is missing or out of date. Neither path imports pandas.
+
+Rebuild the columnar files after editing soil.csv:
+    python -m src.data.soil_repository
+"""
+import bisect
+import csv
+import hashlib
+import json
+import os
+import sys
+import threading
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.aho_corasick import AhoCorasick
+from src.utils.loggers import get_logger
+from src.utils.query_keys import normalize_query
+
+SOIL_CSV_PATH = os.path.join(os.path.dirname(__file__), 'soil.csv')
+SOIL_DATASET_DIR = os.path.join(os.path.dirname(__file__), 'soil_columnar')
+
+# Files of the columnar dataset, each a plain .npy array that can be memory-mapped
+ROWS_FILE = "rows.npy"               # (n,) int32 soil.csv row of each district
+DISTRICTS_FILE = "districts.npy"     # district string table: UTF-8 names, stripped and newline-separated (uint8)
+NUTRIENTS_FILE = "nutrients.npy"     # (n, 6) float64 percentages in NUTRIENT_COLUMNS order; missing are 0
+META_FILE = "meta.json"              # nutrient order and the sha256 of the soil.csv it was built from
+
+DISTRICT_COLUMN = 'District '
+# Nutrient name -> soil.csv column (percentage of samples sufficient in the nutrient)
+NUTRIENT_COLUMNS = {
+    'zinc': 'Zn %',
+    'iron': 'Fe%',
+    'copper': 'Cu %',
+    'manganese': 'Mn %',
+    'boron': 'B %',
+    'sulfur': 'S %',
+}
+
+# Common spelling variations of place names (either side may appear in soil.csv)
+LOCATION_NAME_VARIATIONS = {
+    'bangalore': ['bengaluru', 'bangalore urban'],
+    'bengaluru': ['bangalore', 'bangalore urban'],
+    'mumbai': ['bombay'],
+    'delhi': ['new delhi'],
+    'pune': ['poona'],
+    'kolkata': ['calcutta'],
+    'chennai': ['madras'],
+    'hyderabad': ['secunderabad'],
+    'gurgaon': ['gurugram'],
+    'noida': ['gautam buddha nagar'],
+    'faridabad': ['faridabad'],
+    'ghaziabad': ['ghaziabad']
+}
+
+# Shortest location matched as a bare substring of a district name
+MIN_SUBSTRING_LENGTH = 4
+RESOLVED_CACHE_MAX_ENTRIES = 16384
+
+
+class SoilRecord(NamedTuple):
+    row: int                          # Position in soil.csv
+    district: str                     # District name as written in soil.csv (stripped)
+    nutrients: Mapping[str, float]    # Read-only {nutrient: %}; missing values are 0
+
+
+def name_variations(location: str) -> List[str]:
+    """The location plus its common spelling variations"""
+    variations = [location]
+    for original, alts in LOCATION_NAME_VARIATIONS.items():
+        if original in location:
+            for alt in alts:
+                variations.append(location.replace(original, alt))
+        for alt in alts:
+            if alt in location:
+                variations.append(location.replace(alt, original))
+    return list(dict.fromkeys(variations))
+
+
+def _district_names(district: str) -> List[str]:
+    """Normalized names a district answers to ("Kaimur (Bhabua)" -> kaimur bhabua, kaimur, bhabua)"""
+    name = normalize_query(district)
+    names = [name]
+    if "(" in district:
+        outer, _, inner = district.partition("(")
+        names += [normalize_query(outer), normalize_query(inner.rstrip(")"))]
+    if name.startswith("the "):
+        names.append(name[4:])
+    return [name for name in names if name]
+
+
+class SoilRepository:
+    """
+    Immutable, indexed view of soil.csv.
+
+    find() resolves a location with, in order: the exact normalized name
+    (including parenthetical and "The"-less forms), a district name contained
+    in the location ("Pune, Maharashtra"), a location that is a run of whole
+    words of a district name ("Godavari"), the same for spelling variations
+    ("Gurugram"), and finally a plain substring of a district name. Ties go to
+    the first district in file order, as with the original row scan.
+    """
+
+    def __init__(self, records: Iterable[SoilRecord], mtime: Optional[float] = None):
+        self.records = tuple(records)
+        self.mtime = mtime
+        # (n x 6) nutrient matrix in record order, when loaded from columns
+        self.matrix: Optional[np.ndarray] = None
+        self._by_name: Dict[str, SoilRecord] = {}
+        self._by_variation: Dict[str, SoilRecord] = {}
+        self._by_words: Dict[str, SoilRecord] = {}
+        # Memoized find() results; safe because the repository never changes
+        self._resolved: Dict[str, Optional[SoilRecord]] = {}
+
+        for record in self.records:
+            for name in _district_names(record.district):
+                self._by_name.setdefault(name, record)
+        for record in self.records:
+            for name in _district_names(record.district):
+                for variation in name_variations(name)[1:]:
+                    if variation not in self._by_name:
+                        self._by_variation.setdefault(variation, record)
+                words = name.split()
+                for start in range(len(words)):
+                    for end in range(start + 1, len(words) + 1):
+                        self._by_words.setdefault(" ".join(words[start:end]), record)
+
+        # First district (file order) per name, for names contained in a longer location
+        self._automaton = AhoCorasick(
+            (name, record) for name, record in self._by_name.items()
+        ) if self._by_name else None
+
+        # All names in one newline-separated string so a substring search is a single str.find
+        self._names = list(self._by_name)
+        self._names_text = "\n".join(self._names)
+        self._name_offsets = []
+        offset = 0
+        for name in self._names:
+            self._name_offsets.append(offset)
+            offset += len(name) + 1
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @classmethod
+    def from_columns(cls, rows: Sequence[int], districts: Sequence[str], nutrients: np.ndarray,
+                     mtime: Optional[float] = None) -> "SoilRepository":
+        """Build from parallel columns: soil.csv rows, district names and an (n x 6) nutrient matrix"""
+        nutrient_names = tuple(NUTRIENT_COLUMNS)
+        repository = cls(
+            (
+                SoilRecord(row, district, MappingProxyType(dict(zip(nutrient_names, values))))
+                for row, district, values in zip(np.asarray(rows).tolist(), districts, np.asarray(nutrients).tolist())
+            ),
+            mtime,
+        )
+        repository.matrix = nutrients
+        return repository
+
+    @classmethod
+    def from_frame(cls, soil_df, mtime: Optional[float] = None) -> "SoilRepository":
+        """Build from a soil.csv DataFrame"""
+        records = []
+        for row, values in enumerate(soil_df.itertuples(index=False)):
+            data = dict(zip(soil_df.columns, values))
+            district = data.get(DISTRICT_COLUMN)
+            if not isinstance(district, str) or not district.strip():
+                continue
+            nutrients = {}
+            for nutrient, column in NUTRIENT_COLUMNS.items():
+                value = data.get(column)
+                nutrients[nutrient] = float(value) if value is not None and value == value else 0.0
+            records.append(SoilRecord(row, district.strip(), MappingProxyType(nutrients)))
+        return cls(records, mtime)
+
+    def find(self, location: Optional[str]) -> Optional[SoilRecord]:
+        """District record for a location name, or None"""
+        name = normalize_query(location)
+        if not name:
+            return None
+        if name in self._resolved:
+            return self._resolved[name]
+        record = self._by_name.get(name) or self._contained(name) or self._by_words.get(name)
+        if record is None:
+            record = self._by_variation.get(name)
+        if record is None:
+            for variation in name_variations(name)[1:]:
+                record = self._contained(variation) or self._by_words.get(variation)
+                if record is not None:
+                    break
+        if record is None:
+            record = self._substring(name)
+        if len(self._resolved) >= RESOLVED_CACHE_MAX_ENTRIES:
+            self._resolved.clear()
+        self._resolved[name] = record
+        return record
+
+    def find_many(self, locations: Iterable[Optional[str]]) -> Dict[str, Optional[SoilRecord]]:
+        """Resolve many locations at once: {normalized location: record or None}, one lookup per distinct name"""
+        resolved: Dict[str, Optional[SoilRecord]] = {}
+        for location in locations:
+            name = normalize_query(location)
+            if name and name not in resolved:
+                resolved[name] = self.find(name)
+        return resolved
+
+    def _substring(self, name: str) -> Optional[SoilRecord]:
+        """Last resort: the location is part of a word of a district name ("nicobar" -> Nicobars)"""
+        if len(name) < MIN_SUBSTRING_LENGTH:
+            return None
+        position = self._names_text.find(name)
+        if position < 0:
+            return None
+        return self._by_name[self._names[bisect.bisect_right(self._name_offsets, position) - 1]]
+
+    def _contained(self, name: str) -> Optional[SoilRecord]:
+        if self._automaton is None:
+            return None
+        matches = self._automaton.find_all(name)
+        return min((match.value for match in matches), key=lambda record: record.row) if matches else None
+
+
+def _percentage(value: str) -> float:
+    """soil.csv cell as a float; blank cells are 0"""
+    value = value.strip()
+    return float(value) if value else 0.0
+
+
+def read_soil_csv(path: str = SOIL_CSV_PATH) -> Tuple[List[int], List[str], List[List[float]]]:
+    """soil.csv as (rows, districts, nutrient rows), skipping rows without a district"""
+    rows, districts, nutrients = [], [], []
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        district_index = header.index(DISTRICT_COLUMN)
+        # A missing nutrient column reads as all 0
+        nutrient_indexes = [header.index(column) if column in header else None for column in NUTRIENT_COLUMNS.values()]
+        for row, cells in enumerate(reader):
+            district = cells[district_index].strip() if district_index < len(cells) else ''
+            if not district:
+                continue
+            rows.append(row)
+            districts.append(district)
+            nutrients.append([
+                _percentage(cells[index]) if index is not None and index < len(cells) else 0.0
+                for index in nutrient_indexes
+            ])
+    return rows, districts, nutrients
+
+
+def file_sha256(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_soil_dataset(csv_path: str = SOIL_CSV_PATH, output_dir: str = SOIL_DATASET_DIR) -> str:
+    """Write soil.csv as columnar .npy files plus a meta.json recording its source"""
+    rows, districts, nutrients = read_soil_csv(csv_path)
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, ROWS_FILE), np.array(rows, dtype=np.int32))
+    np.save(os.path.join(output_dir, DISTRICTS_FILE), np.frombuffer("\n".join(districts).encode("utf-8"), dtype=np.uint8))
+    np.save(os.path.join(output_dir, NUTRIENTS_FILE),
+            np.array(nutrients, dtype=np.float64).reshape(-1, len(NUTRIENT_COLUMNS)))
+    # Written last: a half-written build never matches its source
+    meta = {
+        "nutrients": list(NUTRIENT_COLUMNS),
+        "districts": len(districts),
+        "source_sha256": file_sha256(csv_path),
+    }
+    with open(os.path.join(output_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+    get_logger("soil_repository").info(f"[SoilRepository] Built columnar dataset ({len(districts)} districts) in {output_dir}")
+    return output_dir
+
+
+def load_soil_dataset(dataset_dir: str = SOIL_DATASET_DIR, csv_path: str = SOIL_CSV_PATH,
+                      mtime: Optional[float] = None) -> Optional[SoilRepository]:
+    """Repository from the memory-mapped columnar files, or None if they are missing or not built from csv_path"""
+    try:
+        with open(os.path.join(dataset_dir, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("nutrients") != list(NUTRIENT_COLUMNS) or meta.get("source_sha256") != file_sha256(csv_path):
+        get_logger("soil_repository").warning(
+            f"[SoilRepository] {dataset_dir} does not match {csv_path}; rebuild it with python -m src.data.soil_repository"
+        )
+        return None
+
+    def array(filename):
+        return np.load(os.path.join(dataset_dir, filename), mmap_mode="r")
+
+    rows = array(ROWS_FILE)
+    districts = array(DISTRICTS_FILE).tobytes().decode("utf-8").split("\n") if len(rows) else []
+    return SoilRepository.from_columns(rows, districts, array(NUTRIENTS_FILE), mtime)
+
+
+def load_soil_repository(path: str = SOIL_CSV_PATH, dataset_dir: Optional[str] = None) -> SoilRepository:
+    """Load soil.csv into a new repository, from its columnar build (default SOIL_DATASET_DIR) when that is up to date"""
+    mtime = os.path.getmtime(path)
+    repository = load_soil_dataset(dataset_dir or SOIL_DATASET_DIR, path, mtime)
+    if repository is None:
+        rows, districts, nutrients = read_soil_csv(path)
+        repository = SoilRepository.from_columns(
+            rows, districts, np.array(nutrients, dtype=np.float64).reshape(-1, len(NUTRIENT_COLUMNS)), mtime
+        )
+    return repository
+
+
+_repository: Optional[SoilRepository] = None
+_repository_lock = threading.Lock()
+
+
+def get_soil_repository() -> SoilRepository:
+    """Return the process-wide repository, rebuilding it only after soil.csv changes"""
+    global _repository
+    mtime = os.path.getmtime(SOIL_CSV_PATH)
+    repository = _repository
+    if repository is not None and repository.mtime == mtime:
+        return repository
+    with _repository_lock:
+        if _repository is None or _repository.mtime != mtime:
+            _repository = load_soil_repository(SOIL_CSV_PATH)
+            get_logger("soil_repository").info(f"[SoilRepository] Indexed {len(_repository)} districts")
+        return _repository
+
+
+if __name__ == "__main__":
+    # python -m src.data.soil_repository [csv_path] [output_dir]
+    build_soil_dataset(*sys.argv[1:3])
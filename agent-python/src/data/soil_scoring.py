@@ -0,0 +1,148 @@
+"""
+Soil Scoring
+Description: Vectorized nutrient classification and soil-health scoring.
+The six nutrient columns of soil.csv are scored as one (districts x 6)
+matrix, so classes, sufficiency, limiting factors and health scores for
+every district come out of a handful of NumPy operations. The thresholds
+here are the single source used by the per-district soil analysis too.
+"""
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from src.data.soil_repository import NUTRIENT_COLUMNS, SoilRecord
+
+# Column order of every nutrient matrix
+NUTRIENTS = tuple(NUTRIENT_COLUMNS)
+
+# Classification thresholds based on Indian soil standards:
+# below 'low' is Low, below 'medium' is Medium, otherwise High
+CLASS_THRESHOLDS = {
+    'zinc': {'low': 30, 'medium': 70},
+    'iron': {'low': 40, 'medium': 80},
+    'copper': {'low': 60, 'medium': 90},
+    'manganese': {'low': 50, 'medium': 85},
+    'boron': {'low': 30, 'medium': 70},
+    'sulfur': {'low': 40, 'medium': 80}
+}
+CLASS_LABELS = ('Low', 'Medium', 'High')
+
+# A nutrient is sufficient at or above this percentage, deficient below it
+SUFFICIENCY_THRESHOLDS = {
+    'zinc': 50, 'iron': 60, 'copper': 70,
+    'manganese': 60, 'boron': 50, 'sulfur': 60
+}
+
+# (minimum sufficiency ratio, overall health, fertility), best first
+HEALTH_BANDS = (
+    (0.8, "Excellent", "High"),
+    (0.6, "Good", "Medium to High"),
+    (0.4, "Moderate", "Medium"),
+    (0.0, "Poor", "Low to Medium"),
+)
+
+# Limiting factors reported per district
+MAX_LIMITING_FACTORS = 3
+
+_LOW = np.array([CLASS_THRESHOLDS[nutrient]['low'] for nutrient in NUTRIENTS], dtype=np.float64)
+_MEDIUM = np.array([CLASS_THRESHOLDS[nutrient]['medium'] for nutrient in NUTRIENTS], dtype=np.float64)
+_SUFFICIENT = np.array([SUFFICIENCY_THRESHOLDS[nutrient] for nutrient in NUTRIENTS], dtype=np.float64)
+_BAND_MINIMUMS = np.array([band[0] for band in HEALTH_BANDS])
+
+
+def nutrient_matrix(nutrient_rows: Iterable[Mapping[str, float]]) -> np.ndarray:
+    """(n x 6) float64 matrix in NUTRIENTS order; missing nutrients are 0"""
+    return np.array(
+        [[row.get(nutrient, 0.0) for nutrient in NUTRIENTS] for row in nutrient_rows],
+        dtype=np.float64,
+    ).reshape(-1, len(NUTRIENTS))
+
+
+class SoilScores(NamedTuple):
+    """Per-district scores; row i of every array belongs to districts[i]"""
+    districts: Sequence[str]
+    nutrients: np.ndarray           # (n, 6) nutrient percentages
+    classes: np.ndarray             # (n, 6) index into CLASS_LABELS
+    sufficient: np.ndarray          # (n, 6) bool
+    sufficiency_ratio: np.ndarray   # (n,) share of the six nutrients that are sufficient
+    health_score: np.ndarray        # (n,) mean nutrient percentage, out of 100
+    health_band: np.ndarray         # (n,) index into HEALTH_BANDS
+
+    def __len__(self) -> int:
+        return len(self.districts)
+
+    def nutrient_status(self, i: int) -> Dict[str, str]:
+        """{nutrient: 'Low'|'Medium'|'High'} for one district (classify_nutrients format)"""
+        return {nutrient: CLASS_LABELS[label] for nutrient, label in zip(NUTRIENTS, self.classes[i].tolist())}
+
+    def limiting_factors(self, i: int) -> List[str]:
+        """Deficient nutrients of one district, in NUTRIENTS order"""
+        return [nutrient.capitalize() for nutrient, ok in zip(NUTRIENTS, self.sufficient[i].tolist()) if not ok]
+
+    def soil_health(self, i: int) -> Dict:
+        """Overall health, fertility and limitations for one district (assess_soil_health format)"""
+        _, overall, fertility = HEALTH_BANDS[self.health_band[i]]
+        limitations = self.limiting_factors(i)[:MAX_LIMITING_FACTORS]
+        return {
+            'overall': overall,
+            'fertility': fertility,
+            'limitations': limitations or ['None identified'],
+        }
+
+    def to_records(self) -> List[Dict]:
+        """One plain dict per district, for bulk exports"""
+        return [
+            {
+                "district": district,
+                **{nutrient: value for nutrient, value in zip(NUTRIENTS, self.nutrients[i].tolist())},
+                **{f"{nutrient}_class": status for nutrient, status in self.nutrient_status(i).items()},
+                "sufficiency_ratio": float(self.sufficiency_ratio[i]),
+                "health_score": float(self.health_score[i]),
+                "limiting_factors": self.limiting_factors(i),
+                "soil_health": HEALTH_BANDS[self.health_band[i]][1],
+                "fertility_status": HEALTH_BANDS[self.health_band[i]][2],
+            }
+            for i, district in enumerate(self.districts)
+        ]
+
+    def summary(self, rows: Optional[Sequence[int]] = None) -> Dict:
+        """Aggregate scores over some districts (all by default), e.g. one state's"""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.intp)
+        if rows.size == 0:
+            return {"districts": 0}
+        bands = np.bincount(self.health_band[rows], minlength=len(HEALTH_BANDS))
+        deficient_share = 1.0 - self.sufficient[rows].mean(axis=0)
+        return {
+            "districts": int(rows.size),
+            "mean_health_score": float(self.health_score[rows].mean()),
+            "mean_sufficiency_ratio": float(self.sufficiency_ratio[rows].mean()),
+            "soil_health": {band[1]: int(count) for band, count in zip(HEALTH_BANDS, bands)},
+            "deficient_share": {nutrient: float(share) for nutrient, share in zip(NUTRIENTS, deficient_share)},
+        }
+
+
+def score_matrix(matrix: np.ndarray, districts: Optional[Sequence[str]] = None) -> SoilScores:
+    """Score an (n x 6) nutrient matrix in one pass"""
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(-1, len(NUTRIENTS))
+    classes = (matrix >= _LOW).astype(np.int8) + (matrix >= _MEDIUM)
+    sufficient = matrix >= _SUFFICIENT
+    sufficiency_ratio = sufficient.mean(axis=1)
+    # First band whose minimum the ratio reaches
+    health_band = (sufficiency_ratio[:, None] < _BAND_MINIMUMS).sum(axis=1)
+    return SoilScores(
+        districts=tuple(districts) if districts is not None else tuple(str(i) for i in range(len(matrix))),
+        nutrients=matrix,
+        classes=classes,
+        sufficient=sufficient,
+        sufficiency_ratio=sufficiency_ratio,
+        health_score=matrix.mean(axis=1),
+        health_band=health_band,
+    )
+
+
+def score_records(records: Sequence[SoilRecord]) -> SoilScores:
+    """Score soil repository records"""
+    return score_matrix(
+        nutrient_matrix(record.nutrients for record in records),
+        [record.district for record in records],
+    )
@@ -1,15 +1,41 @@
 import os
+import httpx
 import requests
 from typing import Dict
 from src.utils.loggers import get_logger
-from src.config.settings import WEATHER_API
+from src.utils.http_client import get_async_client, get_sync_session
+from src.utils.instrumentation import measure_call
+from src.config.settings import WEATHER_API, HTTP_TIMEOUT_SECONDS
 
-def fetch_weather_data(city_name: str) -> Dict:
+WEATHER_API_URL = "https://api.openweathermap.org/data/2.5/weather"
+
+def _weather_params(city_name: str) -> Dict:
+    """Build OpenWeatherMap query parameters, validating the API key."""
+    logger = get_logger("weather_plugins")
+    
+    if not WEATHER_API:
+        logger.error("[WeatherPlugins] WEATHER_API key is not set in the environment variables.")
+        raise ValueError("WEATHER_API key is missing.")
+    
+    return {"q": city_name, "appid": WEATHER_API, "units": "metric"}
+
+def _parse_weather_response(data: Dict) -> Dict:
+    """Extract relevant data from the OpenWeatherMap API response."""
+    return {
+        "temperature": f"{data['main']['temp']}°C",
+        "condition": data['weather'][0]['main'],
+        "humidity": f"{data['main']['humidity']}%",
+        "wind_speed": f"{data['wind']['speed']} km/h",
+        "precipitation": f"{data.get('rain', {}).get('1h', 0)} mm"
+    }
+
+def fetch_weather_data(city_name: str, timeout: float = HTTP_TIMEOUT_SECONDS) -> Dict:
     """
     Fetch current weather data for a given city using OpenWeatherMap API.
 
     Args:
         city_name (str): Name of the city to fetch weather data for.
+        timeout (float): Seconds to wait for the API before giving up.
 
     Returns:
         Dict: A dictionary containing weather details (temperature, condition, humidity, wind speed, precipitation).
@@ -17,33 +43,50 @@ def fetch_weather_data(city_name: str) -> Dict:
     logger = get_logger("weather_plugins")
     logger.info(f"[WeatherPlugins] Fetching weather data for city: {city_name}")
 
-    # Get API key from environment variables
-    
-    if not WEATHER_API:
-        logger.error("[WeatherPlugins] WEATHER_API key is not set in the environment variables.")
-        raise ValueError("WEATHER_API key is missing.")
-
-    # Construct the API URL
-    url = f"https://api.openweathermap.org/data/2.5/weather?q={city_name}&appid={WEATHER_API}&units=metric"
+    params = _weather_params(city_name)
 
     try:
         # Make the API request
-        response = requests.get(url)
+        with measure_call("openweather") as call:
+            response = get_sync_session().get(WEATHER_API_URL, params=params, timeout=timeout)
+            call.add_bytes(sent=len(response.request.url), received=len(response.content))
         response.raise_for_status()
-        data = response.json()
-
-        # Extract relevant data from the API response
-        forecast = {
-            "temperature": f"{data['main']['temp']}°C",
-            "condition": data['weather'][0]['main'],
-            "humidity": f"{data['main']['humidity']}%",
-            "wind_speed": f"{data['wind']['speed']} km/h",
-            "precipitation": f"{data.get('rain', {}).get('1h', 0)} mm"
-        }
+        forecast = _parse_weather_response(response.json())
 
         logger.info(f"[WeatherPlugins] Weather data fetched successfully: {forecast}")
         return forecast
 
     except requests.exceptions.RequestException as e:
         logger.error(f"[WeatherPlugins] Error fetching weather data: {e}")
-        raise ValueError("Failed to fetch weather data.")
\ No newline at end of file
+        raise ValueError("Failed to fetch weather data.")
+
+async def afetch_weather_data(city_name: str, timeout: float = HTTP_TIMEOUT_SECONDS) -> Dict:
+    """
+    Async variant of fetch_weather_data using the shared httpx client,
+    so the event loop is never blocked on the OpenWeatherMap round-trip.
+
+    Args:
+        city_name (str): Name of the city to fetch weather data for.
+        timeout (float): Seconds to wait for the API before giving up.
+
+    Returns:
+        Dict: A dictionary containing weather details (temperature, condition, humidity, wind speed, precipitation).
+    """
+    logger = get_logger("weather_plugins")
+    logger.info(f"[WeatherPlugins] Fetching weather data (async) for city: {city_name}")
+
+    params = _weather_params(city_name)
+
+    try:
+        with measure_call("openweather") as call:
+            response = await get_async_client().get(WEATHER_API_URL, params=params, timeout=timeout)
+            call.add_bytes(sent=len(str(response.request.url)), received=len(response.content))
+        response.raise_for_status()
+        forecast = _parse_weather_response(response.json())
+
+        logger.info(f"[WeatherPlugins] Weather data fetched successfully: {forecast}")
+        return forecast
+
+    except httpx.HTTPError as e:
+        logger.error(f"[WeatherPlugins] Error fetching weather data: {e}")
+        raise ValueError("Failed to fetch weather data.")
@@ -5,8 +5,42 @@ Simple market data collector - no LLM calls
 from src.graph_arc.state import GlobalState
 from src.utils.loggers import get_logger
 from src.tools.mandi_price_tool import get_mandi_price
+from src.graph_arc.deadline import call_timeout
 from typing import Dict, Any
 
+def _price_request(state: GlobalState) -> Dict[str, Any]:
+    """Extract entities for the mandi API call."""
+    entities = state.get("entities", {})
+    return {
+        "commodity": entities.get("commodity", "Unknown"),
+        "mandi_name": entities.get("mandi", None),
+        "market": entities.get("market", None),
+        "state_name": entities.get("state", None),
+        "district": entities.get("district", None),
+    }
+
+def _tool_input(request: Dict[str, Any], state: GlobalState) -> Dict[str, Any]:
+    return {
+        "commodity": request["commodity"],
+        "state": request["state_name"],
+        "district": request["district"],
+        "market": request["market"] or request["mandi_name"],
+        "timeout": call_timeout(state, "agents")
+    }
+
+def _market_result(request: Dict[str, Any], current_price) -> Dict[str, Any]:
+    result = {
+        "commodity": request["commodity"],
+        "mandi_name": request["mandi_name"] or request["market"],
+        "current_price": current_price,
+        "price_forecast": None,  # No individual forecasts - handled by aggregate node
+        "selling_suggestion": None  # No individual suggestions - handled by aggregate node
+    }
+    if not current_price:
+        # No price (the Agmarknet client returns no records on any failure): never cached
+        result["degraded"] = True
+    return result
+
 def market_price_agent(state: GlobalState) -> Dict[str, Any]:
     """
     Collect market price data from mandi API - simple data gathering only.
@@ -14,32 +48,34 @@ def market_price_agent(state: GlobalState) -> Dict[str, Any]:
     logger = get_logger("market_price_agent")
     logger.info("[MarketPriceAgent] Collecting market price data")
     
-    # Extract entities for API call
-    entities = state.get("entities", {})
-    commodity = entities.get("commodity", "Unknown")
-    mandi_name = entities.get("mandi", None)
-    market = entities.get("market", None)
-    state_name = entities.get("state", None)
-    district = entities.get("district", None)
+    request = _price_request(state)
     
     # Try to get price data from mandi API
     try:
-        price_data = get_mandi_price.invoke({
-            "commodity": commodity,
-            "state": state_name,
-            "district": district,
-            "market": market or mandi_name
-        })
+        price_data = get_mandi_price.invoke(_tool_input(request, state))
         current_price = price_data if isinstance(price_data, (int, float)) else 0.0
-        logger.info(f"[MarketPriceAgent] Price data collected for {commodity}: ₹{current_price}")
+        logger.info(f"[MarketPriceAgent] Price data collected for {request['commodity']}: ₹{current_price}")
     except Exception as e:
         logger.error(f"[MarketPriceAgent] Failed to fetch price: {e}")
         current_price = None
     
-    return {
-        "commodity": commodity,
-        "mandi_name": mandi_name or market,
-        "current_price": current_price,
-        "price_forecast": None,  # No individual forecasts - handled by aggregate node
-        "selling_suggestion": None  # No individual suggestions - handled by aggregate node
-    }
+    return _market_result(request, current_price)
+
+async def amarket_price_agent(state: GlobalState) -> Dict[str, Any]:
+    """
+    Async variant of market_price_agent - awaits the Agmarknet call.
+    """
+    logger = get_logger("market_price_agent")
+    logger.info("[MarketPriceAgent] Collecting market price data (async)")
+    
+    request = _price_request(state)
+    
+    try:
+        price_data = await get_mandi_price.ainvoke(_tool_input(request, state))
+        current_price = price_data if isinstance(price_data, (int, float)) else 0.0
+        logger.info(f"[MarketPriceAgent] Price data collected for {request['commodity']}: ₹{current_price}")
+    except Exception as e:
+        logger.error(f"[MarketPriceAgent] Failed to fetch price: {e}")
+        current_price = None
+    
+    return _market_result(request, current_price)
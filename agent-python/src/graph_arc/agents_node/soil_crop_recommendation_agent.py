@@ -18,9 +18,9 @@ def soil_crop_recommendation_agent(state: GlobalState) -> Dict[str, Any]:
     location = state.get("location") or state.get("entities", {}).get("location", "Unknown")
     user_query = state.get("raw_query", "")
     
-    # Fetch soil data using CSV
+    # Fetch soil data using CSV (keyword flags come from the shared query analysis)
     try:
-        soil_health = get_soil_data_from_csv(location, user_query)
+        soil_health = get_soil_data_from_csv(location, user_query, analysis=state.get("query_analysis"))
         soil_type = soil_health.get("soil_type", "Unknown")
         recommended_crops = soil_health.get("recommended_crops", [])
         logger.info(f"[SoilCropAgent] Soil data collected for {location}")
@@ -4,9 +4,29 @@ Simple weather data collector - no LLM calls
 """
 from src.graph_arc.state import GlobalState
 from src.utils.loggers import get_logger
-from src.data.weather_plugins import fetch_weather_data
+from src.data.weather_plugins import fetch_weather_data, afetch_weather_data
+from src.graph_arc.deadline import call_timeout
 from typing import Dict, Any
 
+UNAVAILABLE_FORECAST = {
+    "temperature": "N/A",
+    "condition": "N/A", 
+    "humidity": "N/A",
+    "wind_speed": "N/A",
+    "precipitation": "N/A"
+}
+
+def _weather_result(forecast: Dict[str, Any], degraded: bool = False) -> Dict[str, Any]:
+    result = {
+        "date_range": "today",
+        "forecast": forecast,
+        "recommendation": None  # No individual recommendations - handled by aggregate node
+    }
+    if degraded:
+        # Placeholder forecast: still usable for the answer, but never cached
+        result["degraded"] = True
+    return result
+
 def weather_agent(state: GlobalState) -> Dict[str, Any]:
     """
     Collect weather data from API - simple data gathering only.
@@ -19,20 +39,28 @@ def weather_agent(state: GlobalState) -> Dict[str, Any]:
     
     # Fetch weather data
     try:
-        forecast = fetch_weather_data(location)
+        forecast = fetch_weather_data(location, timeout=call_timeout(state, "agents"))
         logger.info(f"[WeatherAgent] Weather data collected for {location}")
     except Exception as e:
         logger.error(f"[WeatherAgent] Failed to fetch weather: {e}")
-        forecast = {
-            "temperature": "N/A",
-            "condition": "N/A", 
-            "humidity": "N/A",
-            "wind_speed": "N/A",
-            "precipitation": "N/A"
-        }
+        return _weather_result(dict(UNAVAILABLE_FORECAST), degraded=True)
     
-    return {
-        "date_range": "today",
-        "forecast": forecast,
-        "recommendation": None  # No individual recommendations - handled by aggregate node
-    }
+    return _weather_result(forecast)
+
+async def aweather_agent(state: GlobalState) -> Dict[str, Any]:
+    """
+    Async variant of weather_agent - awaits the OpenWeatherMap call.
+    """
+    logger = get_logger("weather_agent")
+    logger.info("[WeatherAgent] Collecting weather data (async)")
+    
+    location = state.get("location") or state.get("entities", {}).get("location", "Unknown")
+    
+    try:
+        forecast = await afetch_weather_data(location, timeout=call_timeout(state, "agents"))
+        logger.info(f"[WeatherAgent] Weather data collected for {location}")
+    except Exception as e:
+        logger.error(f"[WeatherAgent] Failed to fetch weather: {e}")
+        return _weather_result(dict(UNAVAILABLE_FORECAST), degraded=True)
+    
+    return _weather_result(forecast)
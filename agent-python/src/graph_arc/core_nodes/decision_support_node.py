@@ -7,12 +7,21 @@ from src.utils.loggers import get_logger
 from langchain_core.runnables import RunnableConfig
 from src.config.model_conf import Configuration
 from langchain_google_genai import ChatGoogleGenerativeAI
-from src.config.settings import GEMINI_API_KEY
+from src.config.settings import GEMINI_API_KEY, REQUEST_DEADLINE_SECONDS
 from src.graph_arc.prompts import decision_support_prompt
+from src.graph_arc.deadline import call_timeout, missing_sections, stage_timeout
+from src.utils.incremental_json import DELTA, IncrementalJSONObjectParser
+from src.utils.instrumentation import measure_call
+from langgraph.config import get_stream_writer
 from typing import Dict, Any
+import asyncio
 import json
 import re
 
+# Custom stream message types emitted while the decision is generated
+DECISION_DELTA = "decision_delta"
+DECISION_SECTION = "decision_section"
+
 def decision_support_agent(state: GlobalState) -> Dict[str, Any]:
     """
     Process decision support requests and aggregate information from other agents.
@@ -68,9 +77,106 @@ def decision_support_agent(state: GlobalState) -> Dict[str, Any]:
         "explanation": explanation
     }
 
+def _summarize_agent_results(state: GlobalState, logger) -> Dict[str, Any]:
+    """Collect the non-empty agent results that will be sent to the LLM."""
+    agent_results = state.get("agent_results", {}) or {}
+    original_query = state.get("raw_query", "")
+    
+    logger.info(f"[AggregateDecisions] Processing {len(agent_results)} agent results for query: '{original_query}'")
+    logger.info(f"[AggregateDecisions] Available agent results: {list(agent_results.keys())}")
+    
+    # Debug: Print the actual agent_results content
+    logger.info(f"[AggregateDecisions] Full agent_results content: {agent_results}")
+    
+    # Prepare agent results summary for LLM
+    agent_results_summary = {}
+    for agent_type, agent_output in agent_results.items():
+        if agent_output and not agent_output.get("timed_out"):  # Only include non-empty, on-time results
+            agent_results_summary[agent_type] = agent_output
+            logger.info(f"[AggregateDecisions] Including {agent_type} results in summary")
+    return agent_results_summary
+
+def _insufficient_data_decision(state: GlobalState, logger) -> GlobalState:
+    """Decision returned when no agent produced any data."""
+    logger.warning("[AggregateDecisions] No agent results available, providing fallback decision")
+    fallback_decision = {
+        "aggregated_data": {},
+        "final_advice": "Insufficient data available to provide specific recommendations. Please provide more details about your agricultural needs.",
+        "explanation": "No specific agent data was available to analyze.",
+        "fallback_used": True
+    }
+    updated_state = GlobalState(**state)
+    updated_state["decision"] = fallback_decision
+    return updated_state
+
+def _mark_missing_sections(updated_state: GlobalState, missing: list, logger) -> GlobalState:
+    """Record the agent sections that were cut off by the request deadline."""
+    if missing:
+        logger.warning(f"[AggregateDecisions] Proceeding without timed-out sections: {missing}")
+    updated_state["decision"] = {**updated_state["decision"], "missing_sections": missing}
+    return updated_state
+
+def _build_decision_llm(config: RunnableConfig, timeout: float) -> ChatGoogleGenerativeAI:
+    """Initialize the decision-support LLM from the runnable config."""
+    configurable = Configuration.from_runnable_config(config)
+    return ChatGoogleGenerativeAI(
+        model=configurable.decision_support_model,
+        temperature=0.3,
+        max_output_tokens=2000,
+        api_key=GEMINI_API_KEY,
+        timeout=timeout,
+        max_retries=1,
+    )
+
+def _format_decision_prompt(original_query: str, agent_results_summary: Dict[str, Any]) -> str:
+    """Format the decision-support prompt with agent results."""
+    return decision_support_prompt.format(
+        original_query=original_query,
+        agent_results=json.dumps(agent_results_summary, indent=2)
+    )
+
+def _decision_from_llm_content(raw_content: str, agent_results_summary: Dict[str, Any], original_query: str, logger, state: GlobalState) -> GlobalState:
+    """Parse the raw LLM response into the decision, falling back to rules on bad JSON."""
+    logger.info(f"[AggregateDecisions] Raw LLM response received: {len(raw_content)} characters")
+    
+    # Debug: Log the actual raw response to see what we're getting
+    logger.info(f"[AggregateDecisions] Raw response content: {raw_content[:500]}...")
+    
+    # Clean and parse LLM response
+    cleaned_content = re.sub(r"```json|```", "", raw_content).strip()
+    
+    try:
+        parsed_decision = json.loads(cleaned_content)
+        logger.info("[AggregateDecisions] Successfully parsed LLM decision response")
+        
+        # Store the complete parsed JSON as the final_advice for comprehensive display
+        decision = {
+            "aggregated_data": agent_results_summary,
+            "final_advice": json.dumps(parsed_decision, indent=2),  # Store full JSON
+            "explanation": parsed_decision.get("detailed_explanation", "No explanation provided")
+        }
+        
+        # Log the decision components
+        logger.info(f"[AggregateDecisions] Full JSON response stored for comprehensive display")
+        logger.info(f"[AggregateDecisions] Confidence from LLM: {parsed_decision.get('confidence_score', 'Not provided')}")
+        
+        # Update GlobalState with decision
+        updated_state = GlobalState(**state)
+        updated_state["decision"] = decision
+        return updated_state
+        
+    except json.JSONDecodeError as e:
+        logger.error(f"[AggregateDecisions] Failed to parse LLM JSON response: {e}")
+        logger.error(f"[AggregateDecisions] Raw response was: {cleaned_content}")
+        
+        # Fallback to rule-based decision
+        return _generate_fallback_decision(agent_results_summary, original_query, logger, state)
+
 def aggregate_decisions(state: GlobalState, config: RunnableConfig) -> GlobalState:
     """
     Aggregates results from all agents and provides comprehensive decision support using LLM.
+    Agents cut off by the request deadline are listed in decision["missing_sections"];
+    when no time is left for the LLM the rule-based fallback is used instead.
     
     Args:
         state: The GlobalState with agent_results from the router
@@ -82,93 +188,100 @@ def aggregate_decisions(state: GlobalState, config: RunnableConfig) -> GlobalSta
     logger = get_logger("aggregate_decisions")
     logger.info("[AggregateDecisions] Starting decision aggregation process")
     
-    # Extract agent results from the GlobalState
-    agent_results = state.get("agent_results", {})
     original_query = state.get("raw_query", "")
-    
-    logger.info(f"[AggregateDecisions] Processing {len(agent_results)} agent results for query: '{original_query}'")
-    logger.info(f"[AggregateDecisions] Available agent results: {list(agent_results.keys())}")
-    
-    # Debug: Print the actual agent_results content
-    logger.info(f"[AggregateDecisions] Full agent_results content: {agent_results}")
-    
-    # Prepare agent results summary for LLM
-    agent_results_summary = {}
-    for agent_type, agent_output in agent_results.items():
-        if agent_output:  # Only include non-empty results
-            agent_results_summary[agent_type] = agent_output
-            logger.info(f"[AggregateDecisions] Including {agent_type} results in summary")
+    agent_results_summary = _summarize_agent_results(state, logger)
+    missing = missing_sections(state.get("agent_results"))
     
     # If no agent results available, provide fallback
     if not agent_results_summary:
-        logger.warning("[AggregateDecisions] No agent results available, providing fallback decision")
-        fallback_decision = {
-            "aggregated_data": {},
-            "final_advice": "Insufficient data available to provide specific recommendations. Please provide more details about your agricultural needs.",
-            "explanation": "No specific agent data was available to analyze."
-        }
-        updated_state = GlobalState(**state)
-        updated_state["decision"] = fallback_decision
-        return updated_state
+        return _mark_missing_sections(_insufficient_data_decision(state, logger), missing, logger)
+    
+    # Out of time: answer from the rules instead of waiting on the LLM
+    if stage_timeout(state, "decision") == 0:
+        logger.warning("[AggregateDecisions] Deadline reached, skipping LLM")
+        return _mark_missing_sections(_generate_fallback_decision(agent_results_summary, original_query, logger, state), missing, logger)
     
     try:
-        # Initialize LLM
-        configurable = Configuration.from_runnable_config(config)
-        llm = ChatGoogleGenerativeAI(
-            model=configurable.decision_support_model,
-            temperature=0.3,
-            max_output_tokens=2000,
-            api_key=GEMINI_API_KEY,
-        )
+        llm = _build_decision_llm(config, call_timeout(state, "decision", default=REQUEST_DEADLINE_SECONDS))
         logger.info("[AggregateDecisions] Initialized LLM for decision support")
         
-        # Format the prompt with agent results
-        formatted_prompt = decision_support_prompt.format(
-            original_query=original_query,
-            agent_results=json.dumps(agent_results_summary, indent=2)
-        )
+        formatted_prompt = _format_decision_prompt(original_query, agent_results_summary)
         
         logger.info("[AggregateDecisions] Invoking LLM for comprehensive decision support")
-        response = llm.invoke(formatted_prompt)
-        raw_content = response.content
-        logger.info(f"[AggregateDecisions] Raw LLM response received: {len(raw_content)} characters")
-        
-        # Debug: Log the actual raw response to see what we're getting
-        logger.info(f"[AggregateDecisions] Raw response content: {raw_content[:500]}...")
-        
-        # Clean and parse LLM response
-        cleaned_content = re.sub(r"```json|```", "", raw_content).strip()
-        
-        try:
-            parsed_decision = json.loads(cleaned_content)
-            logger.info("[AggregateDecisions] Successfully parsed LLM decision response")
-            
-            # Store the complete parsed JSON as the final_advice for comprehensive display
-            decision = {
-                "aggregated_data": agent_results_summary,
-                "final_advice": json.dumps(parsed_decision, indent=2),  # Store full JSON
-                "explanation": parsed_decision.get("detailed_explanation", "No explanation provided")
-            }
-            
-            # Log the decision components
-            logger.info(f"[AggregateDecisions] Full JSON response stored for comprehensive display")
-            logger.info(f"[AggregateDecisions] Confidence from LLM: {parsed_decision.get('confidence_score', 'Not provided')}")
-            
-            # Update GlobalState with decision
-            updated_state = GlobalState(**state)
-            updated_state["decision"] = decision
-            return updated_state
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"[AggregateDecisions] Failed to parse LLM JSON response: {e}")
-            logger.error(f"[AggregateDecisions] Raw response was: {cleaned_content}")
-            
-            # Fallback to rule-based decision
-            return _generate_fallback_decision(agent_results_summary, original_query, logger, state)
+        with measure_call("gemini_decision") as call:
+            call.add_bytes(sent=len(formatted_prompt.encode("utf-8")))
+            response = llm.invoke(formatted_prompt)
+            call.add_bytes(received=len(str(response.content).encode("utf-8")))
+        updated_state = _decision_from_llm_content(response.content, agent_results_summary, original_query, logger, state)
             
     except Exception as e:
         logger.error(f"[AggregateDecisions] Error during LLM processing: {e}")
-        return _generate_fallback_decision(agent_results_summary, original_query, logger, state)
+        updated_state = _generate_fallback_decision(agent_results_summary, original_query, logger, state)
+    return _mark_missing_sections(updated_state, missing, logger)
+
+async def _astream_decision(llm: ChatGoogleGenerativeAI, formatted_prompt: str) -> str:
+    """
+    Stream the LLM answer token by token. final_advice text is forwarded to the
+    graph's custom stream as it is generated, and every other section as soon
+    as its JSON value is complete. Returns the full raw response.
+    """
+    writer = get_stream_writer()
+    parser = IncrementalJSONObjectParser(stream_fields=["final_advice"])
+    raw_chunks = []
+    async for chunk in llm.astream(formatted_prompt):
+        text = chunk.content if isinstance(chunk.content, str) else ""
+        raw_chunks.append(text)
+        for kind, key, value in parser.feed(text):
+            if kind == DELTA:
+                writer({"type": DECISION_DELTA, "field": key, "delta": value})
+            else:
+                writer({"type": DECISION_SECTION, "section": key, "content": value})
+    return "".join(raw_chunks)
+
+async def aaggregate_decisions(state: GlobalState, config: RunnableConfig) -> GlobalState:
+    """
+    Async variant of aggregate_decisions - awaits the LLM with ainvoke so the
+    event loop stays free while Gemini generates the answer. With
+    stream_decision_tokens configured, the answer is streamed instead.
+    """
+    logger = get_logger("aggregate_decisions")
+    logger.info("[AggregateDecisions] Starting async decision aggregation process")
+    
+    original_query = state.get("raw_query", "")
+    agent_results_summary = _summarize_agent_results(state, logger)
+    missing = missing_sections(state.get("agent_results"))
+    
+    if not agent_results_summary:
+        return _mark_missing_sections(_insufficient_data_decision(state, logger), missing, logger)
+    
+    if stage_timeout(state, "decision") == 0:
+        logger.warning("[AggregateDecisions] Deadline reached, skipping LLM")
+        return _mark_missing_sections(_generate_fallback_decision(agent_results_summary, original_query, logger, state), missing, logger)
+    
+    try:
+        timeout = call_timeout(state, "decision", default=REQUEST_DEADLINE_SECONDS)
+        llm = _build_decision_llm(config, timeout)
+        formatted_prompt = _format_decision_prompt(original_query, agent_results_summary)
+        
+        with measure_call("gemini_decision") as call:
+            call.add_bytes(sent=len(formatted_prompt.encode("utf-8")))
+            if Configuration.from_runnable_config(config).stream_decision_tokens:
+                logger.info("[AggregateDecisions] Streaming LLM tokens for comprehensive decision support")
+                raw_content = await asyncio.wait_for(_astream_decision(llm, formatted_prompt), timeout=timeout)
+            else:
+                logger.info("[AggregateDecisions] Invoking LLM (async) for comprehensive decision support")
+                response = await asyncio.wait_for(llm.ainvoke(formatted_prompt), timeout=timeout)
+                raw_content = response.content
+            call.add_bytes(received=len(str(raw_content).encode("utf-8")))
+        updated_state = _decision_from_llm_content(raw_content, agent_results_summary, original_query, logger, state)
+    
+    except asyncio.TimeoutError:
+        logger.warning(f"[AggregateDecisions] LLM did not answer within {timeout:.2f}s, using fallback")
+        updated_state = _generate_fallback_decision(agent_results_summary, original_query, logger, state)
+    except Exception as e:
+        logger.error(f"[AggregateDecisions] Error during LLM processing: {e}")
+        updated_state = _generate_fallback_decision(agent_results_summary, original_query, logger, state)
+    return _mark_missing_sections(updated_state, missing, logger)
 
 def _generate_fallback_decision(agent_results: Dict[str, Any], original_query: str, logger, state: GlobalState) -> GlobalState:
     """
@@ -226,7 +339,8 @@ def _generate_fallback_decision(agent_results: Dict[str, Any], original_query: s
     decision = {
         "aggregated_data": agent_results,
         "final_advice": final_advice,
-        "explanation": explanation
+        "explanation": explanation,
+        "fallback_used": True
     }
     
     logger.info(f"[AggregateDecisions] Fallback decision generated: {final_advice[:100]}...")
@@ -1,78 +1,30 @@
 from src.utils.loggers import get_logger
 from src.graph_arc.state import GlobalState
-import pickle
-import string
-import os
+from src.services.intent_model_registry import IntentModelRegistry
+from src.services.query_analysis_cache import QueryAnalysisCache
+from src.services.user_location_cache import QUERY_SOURCE, REQUEST_SOURCE, user_locations
+from src.graph_arc.query_analysis import QueryAnalysis, analysis_key, analyze_text, clean_text
+from src.utils.instrumentation import measure_lookup
+import numpy as np
 
-# Simple intent classifier using trained model
-model = None
-vectorizer = None
-binarizer = None
+# Versioned intent models; a swap clears the memoized analyses
+intent_models = IntentModelRegistry(on_swap=lambda model: analysis_cache.clear())
 
 def load_intent_model():
-    """Load trained model once"""
-    global model, vectorizer, binarizer
-    if model is not None:
-        return True
-    
-    try:
-        # Get model directory - go up from current file to agent-python root, then to model
-        current_dir = os.path.dirname(__file__)  # core_nodes
-        graph_arc_dir = os.path.dirname(current_dir)  # graph_arc  
-        src_dir = os.path.dirname(graph_arc_dir)  # src
-        agent_python_dir = os.path.dirname(src_dir)  # agent-python
-        model_dir = os.path.join(agent_python_dir, "model")
-        
-        with open(os.path.join(model_dir, "agricultural_multilabel_model.pkl"), 'rb') as f:
-            model = pickle.load(f)
-        
-        with open(os.path.join(model_dir, "multilabel_binarizer.pkl"), 'rb') as f:
-            binarizer = pickle.load(f)
-            
-        with open(os.path.join(model_dir, "multilabel_tfidf_vectorizer.pkl"), 'rb') as f:
-            vectorizer = pickle.load(f)
-        
-        return True
-    except Exception as e:
-        print(f"Error loading model: {e}")
-        return False
+    """Load the active model version once (concurrent first callers wait for a single load)"""
+    return intent_models.get() is not None
 
-def clean_text(text):
-    """Clean text for model"""
-    if not text:
-        return ""
-    text = str(text).lower()
-    text = text.translate(str.maketrans('', '', string.punctuation))
-    return ' '.join(text.split())
+def reload_intent_model():
+    """Reload the active version from the files currently on disk"""
+    return intent_models.reload() is not None
 
-def get_intents(query, threshold=0.2):
-    """Get intents using trained model with enhanced multi-intent detection"""
-    if not load_intent_model():
-        return [], 0.0
-    
-    cleaned = clean_text(query)
-    query_vector = vectorizer.transform([cleaned])
-    prediction_probs = model.predict_proba(query_vector)
-    
-    intents = []
-    max_prob = 0.0
-    
-    # Lower threshold for better multi-intent detection
-    for i, class_name in enumerate(binarizer.classes_):
-        prob = prediction_probs[i][0][1] if len(prediction_probs[i][0]) > 1 else prediction_probs[i][0][0]
-        if prob > threshold:
-            intents.append(class_name)
-        max_prob = max(max_prob, prob)
-    
-    # Enhanced rule-based intent detection for common combinations
-    query_lower = query.lower()
-    
-    # Fertilizer + Price queries should trigger both soil and market
-    fertilizer_keywords = ['fertilizer', 'fertiliser', 'manure', 'urea', 'phosphate', 'nutrient']
-    price_keywords = ['price', 'rate', 'cost', 'market', 'selling', 'buying']
-    
-    has_fertilizer = any(keyword in query_lower for keyword in fertilizer_keywords)
-    has_price = any(keyword in query_lower for keyword in price_keywords)
+def _intent_classes():
+    return intent_models.get().classes
+
+def _apply_keyword_rules(analysis: QueryAnalysis, intents, max_prob):
+    """Enhanced rule-based intent detection for common combinations"""
+    has_fertilizer = analysis.mentions_fertilizer or analysis.mentions_nutrient
+    has_price = analysis.mentions_price
     
     if has_fertilizer and has_price:
         # Add both soil and market intents if not already present
@@ -86,69 +38,107 @@ def get_intents(query, threshold=0.2):
         intents.append('soil')
         max_prob = max(max_prob, 0.7)
     
-    # If still no intents, get the highest probability intent
-    if not intents and len(binarizer.classes_) > 0:
-        best_idx = 0
-        best_prob = 0
-        for i, class_name in enumerate(binarizer.classes_):
-            prob = prediction_probs[i][0][1] if len(prediction_probs[i][0]) > 1 else prediction_probs[i][0][0]
-            if prob > best_prob:
-                best_prob = prob
-                best_idx = i
-        intents = [binarizer.classes_[best_idx]]
-        max_prob = best_prob
-    
     return intents, max_prob
 
+def _classify(analyses, threshold):
+    """Score analyzed queries together and apply threshold, keyword rules and fallback"""
+    if not analyses:
+        return []
+    # One model reference for the whole batch, so a concurrent swap cannot mix versions
+    intent_model = intent_models.get()
+    if intent_model is None:
+        return [([], 0.0) for _ in analyses]
+    
+    probs = intent_model.positive_probabilities([analysis.normalized for analysis in analyses])
+    classes = np.asarray(intent_model.classes)
+    
+    above_threshold = probs > threshold
+    max_probs = probs.max(axis=1)
+    best_classes = classes[probs.argmax(axis=1)]
+    
+    results = []
+    for row, analysis in enumerate(analyses):
+        intents = classes[above_threshold[row]].tolist()
+        intents, max_prob = _apply_keyword_rules(analysis, intents, float(max_probs[row]))
+        
+        # If still no intents, fall back to the highest probability intent
+        if not intents:
+            intents = [str(best_classes[row])]
+        
+        results.append((intents, max_prob))
+    return results
+
+def get_intents_batch(queries, threshold=0.2):
+    """
+    Get intents for many queries at once. All queries are vectorized and
+    scored together; thresholding and the best-intent fallback are applied to
+    the whole probability matrix.
+    
+    Returns:
+        List of (intents, confidence) tuples, one per query, in input order
+    """
+    return _classify([analyze_text(query) for query in queries], threshold)
+
+def get_intents(query, threshold=0.2):
+    """Get intents using trained model with enhanced multi-intent detection"""
+    return get_intents_batch([query], threshold)[0]
+
+# Memoized analyses, cleared when the pinned version or the model files change
+# (the registry then loads the new files in the background and swaps them in)
+analysis_cache = QueryAnalysisCache(signature=intent_models.signature, on_change=intent_models.sync)
+
+def analyze_query(query):
+    """
+    Intents, confidence and the immutable QueryAnalysis for a query, memoized
+    on its analysis_key so repeated (e.g. quick-reply) questions skip the
+    model and the gazetteer entirely. The raw query is analyzed, exactly as
+    get_intents_batch does, so both paths classify a query the same way.
+    
+    Returns:
+        (intents, confidence, analysis); intents is a fresh list
+    """
+    key = analysis_key(query)
+    with measure_lookup("query_analysis_cache") as lookup:
+        cached = analysis_cache.get(key)
+        lookup.cache_result(cached is not None)
+    if cached is None:
+        generation = analysis_cache.generation
+        analysis = analyze_text(query)
+        intents, confidence = _classify([analysis], 0.2)[0]
+        cached = (intents, confidence, analysis)
+        analysis_cache.put(key, cached, generation)
+    intents, confidence, analysis = cached
+    return list(intents), confidence, analysis
+
 def understand_query(state: GlobalState, config=None) -> GlobalState:
     logger = get_logger("query_understanding_node")
     
     query = state.get("raw_query", "")
     logger.info(f"Using trained model for intent classification: {query}")
     
-    # Get intents using trained model
-    intents, confidence = get_intents(query)
-    
-    # Simple entity extraction
-    entities = extract_entities(query)
+    # One pass over the query: intents (trained model), entities and keyword flags
+    intents, confidence, analysis = analyze_query(query)
+    entities = dict(analysis.entities)
     
     state["intents"] = intents
     state["entities"] = entities
     state["confidence_score"] = confidence
+    state["query_analysis"] = analysis
+    state["intent_model_version"] = intent_models.active_version
+    
+    # Resolve the location once, so every agent queries the same place
+    location, source = user_locations.resolve(state.get("user_id"), state.get("location"), analysis.location)
+    if source in (QUERY_SOURCE, REQUEST_SOURCE):
+        user_locations.put(state.get("user_id"), location)
+    state["location"] = location
+    state["location_source"] = source
     
     logger.info(f"Predicted intents: {intents}, confidence: {confidence}")
+    logger.info(f"Location: {location} (from {source})")
     logger.info(f"Extracted entities: {entities}")
     
     return state
 
 def extract_entities(query: str) -> dict:
-    """Simple entity extraction for agricultural terms"""
-    query_lower = query.lower()
-    entities = {}
-    
-    # Common crops
-    crops = ['rice', 'wheat', 'cotton', 'sugarcane', 'maize', 'corn', 'soybean', 'potato', 'tomato', 'onion']
-    for crop in crops:
-        if crop in query_lower:
-            entities['commodity'] = crop.title()
-            entities['crop'] = crop.title()
-            break
-    
-    # Investment/savings amounts
-    import re
-    amount_pattern = r'(\d+)\s*lakh'
-    amount_match = re.search(amount_pattern, query_lower)
-    if amount_match:
-        entities['investment'] = f"{amount_match.group(1)} lakh"
-    
-    # Fertilizer keywords
-    fertilizer_keywords = ['fertilize', 'fertilizer', 'manure', 'urea', 'phosphate']
-    if any(keyword in query_lower for keyword in fertilizer_keywords):
-        entities['fertilizer_needed'] = True
-    
-    # Market/price keywords
-    price_keywords = ['price', 'rate', 'cost', 'market', 'selling']
-    if any(keyword in query_lower for keyword in price_keywords):
-        entities['price_inquiry'] = True
-    
-    return entities
+    """Entity extraction for agricultural terms (one gazetteer pass over the query)"""
+    return dict(analyze_text(query).entities)
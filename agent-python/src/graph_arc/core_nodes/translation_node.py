@@ -7,17 +7,54 @@ from src.utils.loggers import get_logger
 from langchain_core.runnables import RunnableConfig
 from src.config.model_conf import Configuration
 from langchain_google_genai import ChatGoogleGenerativeAI
-from src.config.settings import GEMINI_API_KEY
+from src.config.settings import GEMINI_API_KEY, REQUEST_DEADLINE_SECONDS
+from src.graph_arc.deadline import call_timeout, stage_timeout
+from src.utils.instrumentation import measure_call
+import asyncio
 import json
 import re
 
-def translation_language_agent(state: GlobalState, config: RunnableConfig) -> dict:
+# Language mapping
+LANGUAGE_NAMES = {
+    "hi": "Hindi", "bn": "Bengali", "te": "Telugu", "ta": "Tamil",
+    "gu": "Gujarati", "mr": "Marathi", "kn": "Kannada", "ml": "Malayalam",
+    "pa": "Punjabi", "or": "Odia"
+}
+
+def _build_translation_llm(config: RunnableConfig, timeout: float) -> ChatGoogleGenerativeAI:
+    """Initialize the translation LLM from the runnable config."""
+    configurable = Configuration.from_runnable_config(config)
+    return ChatGoogleGenerativeAI(
+        model=configurable.translation_model,
+        temperature=0.2,
+        max_output_tokens=3000,
+        api_key=GEMINI_API_KEY,
+        timeout=timeout,
+        max_retries=1,
+    )
+
+def _translation_prompt(target_lang: str, advice: str, explanation: str) -> str:
+    """Enhanced translation prompt"""
+    return f"""
+        You are an expert agricultural translator. Translate the following agricultural advice and explanation into {target_lang}. 
+        Maintain technical accuracy and farming terminology. Return ONLY a JSON object with 'advice' and 'explanation' fields.
+        
+        ADVICE TO TRANSLATE: {advice}
+        
+        EXPLANATION TO TRANSLATE: {explanation}
+        
+        Return format:
+        {{
+            "advice": "translated advice in {target_lang}",
+            "explanation": "translated explanation in {target_lang}"
+        }}
+        """
+
+def _prepare_translation(state: GlobalState, logger):
     """
-    Simple translation: Read decision + explanation, translate to user language.
+    Read user language and the content to translate.
+    Returns None when no translation is needed.
     """
-    logger = get_logger("translation_language_agent")
-    logger.info("[TranslationAgent] Starting translation")
-    
     # Get user language
     user_language = state.get("language", "en").lower()
     logger.info(f"[TranslationAgent] User language: {user_language}")
@@ -27,7 +64,12 @@ def translation_language_agent(state: GlobalState, config: RunnableConfig) -> di
     if user_language in ["en", "english"]:
         logger.info("[TranslationAgent] English - no translation needed")
         print("❌ No translation needed for English")
-        return {}
+        return None
+    
+    # Out of time: keep the untranslated advice rather than overrun the deadline
+    if stage_timeout(state, "translation") == 0:
+        logger.warning("[TranslationAgent] Deadline reached, skipping translation")
+        return None
     
     # Get content to translate
     decision = state.get("decision", {})
@@ -36,134 +78,155 @@ def translation_language_agent(state: GlobalState, config: RunnableConfig) -> di
     
     logger.info(f"[TranslationAgent] Translating to {user_language}")
     print(f"🔄 Translating advice: {advice[:100]}...")
+    return user_language, decision, advice, explanation
+
+def _translation_from_content(raw_content: str, state: GlobalState, user_language: str, decision: dict, advice: str, explanation: str, logger) -> dict:
+    """Parse the LLM translation, using per-language fallbacks on bad JSON."""
+    target_lang = LANGUAGE_NAMES.get(user_language, user_language)
+    content = re.sub(r"```json|```", "", raw_content).strip()
+    
+    print(f"🤖 Translation response received: {content[:200]}...")
     
     try:
-        # Initialize LLM
-        configurable = Configuration.from_runnable_config(config)
-        llm = ChatGoogleGenerativeAI(
-            model=configurable.translation_model,
-            temperature=0.2,
-            max_output_tokens=3000,
-            api_key=GEMINI_API_KEY,
-        )
+        result = json.loads(content)
+        translated_advice = result.get("advice", advice)
+        translated_explanation = result.get("explanation", explanation)
         
-        # Language mapping
-        lang_map = {
-            "hi": "Hindi", "bn": "Bengali", "te": "Telugu", "ta": "Tamil",
-            "gu": "Gujarati", "mr": "Marathi", "kn": "Kannada", "ml": "Malayalam",
-            "pa": "Punjabi", "or": "Odia"
-        }
-        target_lang = lang_map.get(user_language, user_language)
+        logger.info("[TranslationAgent] Translation completed successfully")
+        print(f"✅ Translation completed for {target_lang}")
+        print(f"📝 Translated advice: {translated_advice[:100]}...")
         
-        # Enhanced translation prompt
-        prompt = f"""
-        You are an expert agricultural translator. Translate the following agricultural advice and explanation into {target_lang}. 
-        Maintain technical accuracy and farming terminology. Return ONLY a JSON object with 'advice' and 'explanation' fields.
-        
-        ADVICE TO TRANSLATE: {advice}
-        
-        EXPLANATION TO TRANSLATE: {explanation}
-        
-        Return format:
-        {{
-            "advice": "translated advice in {target_lang}",
-            "explanation": "translated explanation in {target_lang}"
-        }}
-        """
-        
-        # Get translation
-        response = llm.invoke(prompt)
-        content = re.sub(r"```json|```", "", response.content).strip()
+        # Return updated state with translation
+        return {
+            "translation": {
+                "detected_language": "en",
+                "target_language": user_language,
+                "translated_query": state.get("raw_query", ""),
+                "translated_response": translated_advice,
+                "translated_explanation": translated_explanation,
+                "original_advice": advice,
+                "original_explanation": explanation
+            },
+            # Also update decision with translated content
+            "decision": {
+                **decision,
+                "final_advice": translated_advice,
+                "explanation": translated_explanation,
+                "original_advice": advice,
+                "original_explanation": explanation
+            }
+        }
         
-        print(f"🤖 Translation response received: {content[:200]}...")
+    except json.JSONDecodeError:
+        logger.error("[TranslationAgent] JSON parse failed - using enhanced fallback")
+        print("❌ JSON parsing failed, using fallback translation")
         
-        try:
-            result = json.loads(content)
-            translated_advice = result.get("advice", advice)
-            translated_explanation = result.get("explanation", explanation)
-            
-            logger.info("[TranslationAgent] Translation completed successfully")
-            print(f"✅ Translation completed for {target_lang}")
-            print(f"📝 Translated advice: {translated_advice[:100]}...")
-            
-            # Return updated state with translation
-            return {
-                "translation": {
-                    "detected_language": "en",
-                    "target_language": user_language,
-                    "translated_query": state.get("raw_query", ""),
-                    "translated_response": translated_advice,
-                    "translated_explanation": translated_explanation,
-                    "original_advice": advice,
-                    "original_explanation": explanation
-                },
-                # Also update decision with translated content
-                "decision": {
-                    **decision,
-                    "final_advice": translated_advice,
-                    "explanation": translated_explanation,
-                    "original_advice": advice,
-                    "original_explanation": explanation
-                }
-            }
-            
-        except json.JSONDecodeError:
-            logger.error("[TranslationAgent] JSON parse failed - using enhanced fallback")
-            print("❌ JSON parsing failed, using fallback translation")
-            
-            # Enhanced fallback with better Hindi translations
-            fallback_translations = {
-                "hi": {
-                    "advice": f"कृषि सलाह: {advice}",
-                    "explanation": f"विवरण: {explanation}",
-                    "default_advice": "आपके खेती संबंधी प्रश्न के लिए विशेषज्ञ सलाह उपलब्ध है। कृपया स्थानीय कृषि कार्यालय से संपर्क करें।",
-                    "default_explanation": "विस्तृत जानकारी के लिए कृषि विशेषज्ञ से सलाह लें।"
-                },
-                "pa": {
-                    "advice": f"ਖੇਤੀ ਸਲਾਹ: {advice}",
-                    "explanation": f"ਵਿਆਖਿਆ: {explanation}",
-                    "default_advice": "ਤੁਹਾਡੇ ਖੇਤੀ ਸਬੰਧੀ ਸਵਾਲ ਲਈ ਮਾਹਰ ਸਲਾਹ ਉਪਲਬਧ ਹੈ।",
-                    "default_explanation": "ਵਿਸਤ੍ਰਿਤ ਜਾਣਕਾਰੀ ਲਈ ਖੇਤੀ ਮਾਹਰ ਨਾਲ ਸਲਾਹ ਕਰੋ।"
-                },
-                "gu": {
-                    "advice": f"કૃષિ સલાહ: {advice}",
-                    "explanation": f"સમજૂતી: {explanation}",
-                    "default_advice": "તમારા ખેતી સંબંધિત પ્રશ્ન માટે નિષ્ણાત સલાહ ઉપલબ્ધ છે।",
-                    "default_explanation": "વિગતવાર માહિતી માટે કૃષિ નિષ્ણાત સાથે સલાહ કરો।"
-                }
+        # Enhanced fallback with better Hindi translations
+        fallback_translations = {
+            "hi": {
+                "advice": f"कृषि सलाह: {advice}",
+                "explanation": f"विवरण: {explanation}",
+                "default_advice": "आपके खेती संबंधी प्रश्न के लिए विशेषज्ञ सलाह उपलब्ध है। कृपया स्थानीय कृषि कार्यालय से संपर्क करें।",
+                "default_explanation": "विस्तृत जानकारी के लिए कृषि विशेषज्ञ से सलाह लें।"
+            },
+            "pa": {
+                "advice": f"ਖੇਤੀ ਸਲਾਹ: {advice}",
+                "explanation": f"ਵਿਆਖਿਆ: {explanation}",
+                "default_advice": "ਤੁਹਾਡੇ ਖੇਤੀ ਸਬੰਧੀ ਸਵਾਲ ਲਈ ਮਾਹਰ ਸਲਾਹ ਉਪਲਬਧ ਹੈ।",
+                "default_explanation": "ਵਿਸਤ੍ਰਿਤ ਜਾਣਕਾਰੀ ਲਈ ਖੇਤੀ ਮਾਹਰ ਨਾਲ ਸਲਾਹ ਕਰੋ।"
+            },
+            "gu": {
+                "advice": f"કૃષિ સલાહ: {advice}",
+                "explanation": f"સમજૂતી: {explanation}",
+                "default_advice": "તમારા ખેતી સંબંધિત પ્રશ્ન માટે નિષ્ણાત સલાહ ઉપલબ્ધ છે।",
+                "default_explanation": "વિગતવાર માહિતી માટે કૃષિ નિષ્ણાત સાથે સલાહ કરો।"
             }
-            
-            fallback = fallback_translations.get(user_language, {
-                "advice": f"Agricultural advice in {target_lang}: {advice}",
-                "explanation": f"Explanation in {target_lang}: {explanation}",
-                "default_advice": f"Expert agricultural advice available in {target_lang}.",
-                "default_explanation": f"Detailed information available in {target_lang}."
-            })
-            
-            final_advice = fallback.get("advice", fallback["default_advice"])
-            final_explanation = fallback.get("explanation", fallback["default_explanation"])
-            
-            return {
-                "translation": {
-                    "detected_language": "en",
-                    "target_language": user_language,
-                    "translated_query": state.get("raw_query", ""),
-                    "translated_response": final_advice,
-                    "translated_explanation": final_explanation,
-                    "original_advice": advice,
-                    "original_explanation": explanation,
-                    "fallback_used": True
-                },
-                "decision": {
-                    **decision,
-                    "final_advice": final_advice,
-                    "explanation": final_explanation,
-                    "original_advice": advice,
-                    "original_explanation": explanation
-                }
+        }
+
+        fallback = fallback_translations.get(user_language, {
+            "advice": f"Agricultural advice in {target_lang}: {advice}",
+            "explanation": f"Explanation in {target_lang}: {explanation}",
+            "default_advice": f"Expert agricultural advice available in {target_lang}.",
+            "default_explanation": f"Detailed information available in {target_lang}."
+        })
+
+        final_advice = fallback.get("advice", fallback["default_advice"])
+        final_explanation = fallback.get("explanation", fallback["default_explanation"])
+
+        return {
+            "translation": {
+                "detected_language": "en",
+                "target_language": user_language,
+                "translated_query": state.get("raw_query", ""),
+                "translated_response": final_advice,
+                "translated_explanation": final_explanation,
+                "original_advice": advice,
+                "original_explanation": explanation,
+                "fallback_used": True
+            },
+            "decision": {
+                **decision,
+                "final_advice": final_advice,
+                "explanation": final_explanation,
+                "original_advice": advice,
+                "original_explanation": explanation
             }
+        }
+
+def translation_language_agent(state: GlobalState, config: RunnableConfig) -> dict:
+    """
+    Simple translation: Read decision + explanation, translate to user language.
+    """
+    logger = get_logger("translation_language_agent")
+    logger.info("[TranslationAgent] Starting translation")
+    
+    request = _prepare_translation(state, logger)
+    if request is None:
+        return {}
+    user_language, decision, advice, explanation = request
+    
+    try:
+        llm = _build_translation_llm(config, call_timeout(state, "translation", default=REQUEST_DEADLINE_SECONDS))
+        target_lang = LANGUAGE_NAMES.get(user_language, user_language)
+        
+        # Get translation
+        prompt = _translation_prompt(target_lang, advice, explanation)
+        with measure_call("gemini_translation") as call:
+            call.add_bytes(sent=len(prompt.encode("utf-8")))
+            response = llm.invoke(prompt)
+            call.add_bytes(received=len(str(response.content).encode("utf-8")))
+        return _translation_from_content(response.content, state, user_language, decision, advice, explanation, logger)
             
     except Exception as e:
         logger.error(f"[TranslationAgent] Translation failed: {e}")
         print(f"💥 Translation error: {e}")
         return {}
+
+async def atranslation_language_agent(state: GlobalState, config: RunnableConfig) -> dict:
+    """
+    Async variant of translation_language_agent - awaits the LLM with ainvoke.
+    """
+    logger = get_logger("translation_language_agent")
+    logger.info("[TranslationAgent] Starting async translation")
+    
+    request = _prepare_translation(state, logger)
+    if request is None:
+        return {}
+    user_language, decision, advice, explanation = request
+    
+    try:
+        timeout = call_timeout(state, "translation", default=REQUEST_DEADLINE_SECONDS)
+        llm = _build_translation_llm(config, timeout)
+        target_lang = LANGUAGE_NAMES.get(user_language, user_language)
+        
+        prompt = _translation_prompt(target_lang, advice, explanation)
+        with measure_call("gemini_translation") as call:
+            call.add_bytes(sent=len(prompt.encode("utf-8")))
+            response = await asyncio.wait_for(llm.ainvoke(prompt), timeout=timeout)
+            call.add_bytes(received=len(str(response.content).encode("utf-8")))
+        return _translation_from_content(response.content, state, user_language, decision, advice, explanation, logger)
+    
+    except Exception as e:
+        logger.error(f"[TranslationAgent] Translation failed: {e}")
+        print(f"💥 Translation error: {e}")
+        return {}
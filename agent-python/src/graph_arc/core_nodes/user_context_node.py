@@ -1,4 +1,5 @@
 from src.graph_arc.state import GlobalState
+from src.graph_arc.deadline import assign_deadline
 from src.utils.loggers import get_logger
 
 """
@@ -19,12 +20,14 @@ def get_user_context(state: GlobalState) -> GlobalState:
     original_device = state.get("device_type")
     
     state["language"] = state.get("language") or "en"
-    state["location"] = state.get("location") or "Satara"
+    # Location is resolved in query understanding, where the query itself can name it
     state["device_type"] = state.get("device_type") or "web"
+    assign_deadline(state)
 
     logger.info(f"[UserContextNode] Language: {original_language} -> {state['language']}")
-    logger.info(f"[UserContextNode] Location: {original_location} -> {state['location']}")
+    logger.info(f"[UserContextNode] Requested location: {original_location}")
     logger.info(f"[UserContextNode] Device type: {original_device} -> {state['device_type']}")
+    logger.info(f"[UserContextNode] Deadline budget: {state['deadline_seconds']:.1f}s")
     
     print(f"[UserContextNode] Updated state: {state}")
     logger.info("[UserContextNode] User context extraction completed successfully")
@@ -0,0 +1,70 @@
+"""
+Deadline Budgets
+Description: End-to-end request deadline shared by every node through GlobalState.
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+from src.graph_arc.state import GlobalState
+from src.config.settings import DEVICE_DEADLINE_SECONDS, HTTP_TIMEOUT_SECONDS, REQUEST_DEADLINE_SECONDS
+
+# Fraction of the total budget held back for the stages that run after each stage
+STAGE_RESERVES = {
+    "agents": 0.5,        # decision support + translation
+    "decision": 0.15,     # translation
+    "translation": 0.0,
+}
+
+def deadline_budget(state: Dict[str, Any]) -> float:
+    """
+    The request's end-to-end budget in seconds. An explicit per-request
+    `deadline_seconds` wins; otherwise the device_type budget applies.
+    """
+    return float(state.get("deadline_seconds") or DEVICE_DEADLINE_SECONDS.get(
+        (state.get("device_type") or "web").lower(), REQUEST_DEADLINE_SECONDS
+    ))
+
+def assign_deadline(state: GlobalState) -> GlobalState:
+    """Fix the request's absolute deadline from its deadline_budget."""
+    if state.get("deadline"):
+        return state
+    budget = deadline_budget(state)
+    state["deadline_seconds"] = budget
+    state["deadline"] = time.time() + budget
+    return state
+
+def remaining_time(state: GlobalState) -> Optional[float]:
+    """Seconds left before the request deadline, or None without a deadline."""
+    deadline = state.get("deadline")
+    if not deadline:
+        return None
+    return max(0.0, deadline - time.time())
+
+def stage_timeout(state: GlobalState, stage: str) -> Optional[float]:
+    """
+    Time the given stage may spend, leaving the reserve for later stages.
+    Returns None when the request carries no deadline.
+    """
+    remaining = remaining_time(state)
+    if remaining is None:
+        return None
+    reserve = (state.get("deadline_seconds") or 0.0) * STAGE_RESERVES.get(stage, 0.0)
+    return max(0.0, remaining - reserve)
+
+def call_timeout(state: GlobalState, stage: str, default: float = HTTP_TIMEOUT_SECONDS) -> float:
+    """Timeout for a single external call made during `stage`, capped by the deadline."""
+    timeout = stage_timeout(state, stage)
+    if timeout is None:
+        return default
+    return max(0.1, min(default, timeout))
+
+def timed_out_result(result_key: str, timeout: float) -> Dict[str, Any]:
+    """Placeholder result for an agent cut off by the deadline."""
+    return {"error": f"{result_key} did not respond within {timeout:.2f}s", "timed_out": True}
+
+def missing_sections(agent_results: Optional[Dict[str, Any]]) -> List[str]:
+    """Agent result keys that were cut off by the deadline."""
+    return [
+        result_key for result_key, result in (agent_results or {}).items()
+        if isinstance(result, dict) and result.get("timed_out")
+    ]
@@ -1,25 +1,88 @@
+from functools import partial
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import START, END
 from langgraph.graph import StateGraph
 from src.graph_arc.state import GlobalState
 from src.config.model_conf import Configuration
 from src.graph_arc.core_nodes.user_context_node import get_user_context
 from src.graph_arc.core_nodes.query_understanding_node import understand_query
-from src.graph_arc.router import conditional_router
-from src.graph_arc.core_nodes.decision_support_node import aggregate_decisions
-from src.graph_arc.core_nodes.translation_node import translation_language_agent
+from src.graph_arc.router import (
+    AGENT_REGISTRY,
+    UNHANDLED_INTENTS_NODE,
+    aconditional_router,
+    agent_node_name,
+    conditional_router,
+    make_agent_fanout,
+    make_agent_node,
+    make_unhandled_intents_node,
+)
+from src.graph_arc.core_nodes.decision_support_node import aggregate_decisions, aaggregate_decisions
+from src.graph_arc.core_nodes.translation_node import translation_language_agent, atranslation_language_agent
+from src.utils.instrumentation import instrument_node
 
-# Import all agent nodes
-from src.graph_arc.agents_node.soil_crop_recommendation_agent import soil_crop_recommendation_agent
-from src.graph_arc.agents_node.weather_agent import weather_agent
-from src.graph_arc.agents_node.market_price_agent import market_price_agent
-from src.graph_arc.agents_node.crop_health_pest_agent import crop_health_pest_agent
-from src.graph_arc.agents_node.government_schemes_agent import government_schemes_agent
+
+def add_agent_stage(graph: StateGraph, source: str, target: str, parallel_agents: bool = True, registry: dict = None):
+    """
+    Wire the agent stage between `source` and `target`.
+    
+    With parallel_agents=True every agent is its own node and the matched ones
+    are fanned out from `source` via a conditional edge, so LangGraph runs them
+    in a single superstep and merges their results through the state reducer.
+    Otherwise all agents run inside the single `conditional_router` node.
+    """
+    registry = AGENT_REGISTRY if registry is None else registry
+    
+    if not parallel_agents:
+        graph.add_node("conditional_router", instrument_node("conditional_router", RunnableLambda(
+            partial(conditional_router, registry=registry),
+            afunc=partial(aconditional_router, registry=registry),
+            name="conditional_router",
+        )))
+        graph.add_edge(source, "conditional_router")
+        graph.add_edge("conditional_router", target)
+        return
+    
+    agent_nodes = []
+    for result_key, agent_fn in registry.values():
+        node_name = agent_node_name(result_key)
+        if node_name in agent_nodes:
+            continue
+        graph.add_node(node_name, instrument_node(node_name, make_agent_node(result_key, agent_fn)))
+        graph.add_edge(node_name, target)
+        agent_nodes.append(node_name)
+    
+    # Intents without an agent still get their error entry in agent_results
+    graph.add_node(UNHANDLED_INTENTS_NODE, make_unhandled_intents_node(registry))
+    graph.add_edge(UNHANDLED_INTENTS_NODE, target)
+    
+    graph.add_conditional_edges(source, make_agent_fanout(registry, fallback=target), agent_nodes + [UNHANDLED_INTENTS_NODE, target])
 
 
-def build_graph():
+def build_agent_stage(parallel_agents: bool = True, registry: dict = None):
+    """
+    Builds a graph containing only the agent stage (START -> agents -> END).
+    Used to benchmark the fan-out strategies in isolation.
+    """
+    graph = StateGraph(GlobalState)
+    graph.add_node("agent_stage_start", lambda state: {})
+    graph.add_edge(START, "agent_stage_start")
+    add_agent_stage(graph, "agent_stage_start", END, parallel_agents, registry)
+    return graph.compile()
+
+
+def build_graph(parallel_agents: bool = True):
     """
     Builds and returns the LangGraph workflow.
     
+    Nodes that wait on external services (agents, decision support,
+    translation) carry both sync and async implementations, so the same
+    compiled graph serves workflow.invoke and a non-blocking workflow.ainvoke.
+    Every node is instrumented into the `_performance` section of the state.
+    
+    Args:
+        parallel_agents: Register each agent as its own node (default). When
+            False, all agents run inside the single conditional_router node.
+    
     Returns:
         Compiled LangGraph workflow
     """
@@ -27,21 +90,23 @@ def build_graph():
     graph = StateGraph(GlobalState, config=Configuration)
     
     # Adding core nodes to the graph
-    graph.add_node("user_context", get_user_context)
-    graph.add_node("query_understanding", understand_query)
-    graph.add_node("conditional_router", conditional_router)
+    graph.add_node("user_context", instrument_node("user_context", get_user_context))
+    graph.add_node("query_understanding", instrument_node("query_understanding", understand_query))
     
     # Adding decision and translation nodes
-    graph.add_node("decision_support", aggregate_decisions)
-    graph.add_node("translation_language", translation_language_agent)
+    graph.add_node("decision_support", instrument_node("decision_support", RunnableLambda(
+        aggregate_decisions, afunc=aaggregate_decisions, name="decision_support"
+    )))
+    graph.add_node("translation_language", instrument_node("translation_language", RunnableLambda(
+        translation_language_agent, afunc=atranslation_language_agent, name="translation_language"
+    )))
     
-    # Core flow - router processes all agents internally
+    # Core flow
     graph.add_edge(START, "user_context")
     graph.add_edge("user_context", "query_understanding")
-    graph.add_edge("query_understanding", "conditional_router")
     
-    # Router processes all agents and flows directly to decision support
-    graph.add_edge("conditional_router", "decision_support")
+    # Agents run between query understanding and decision support
+    add_agent_stage(graph, "query_understanding", "decision_support", parallel_agents)
     
     # After decision support, conditionally go to translation if needed
     def should_translate(state):
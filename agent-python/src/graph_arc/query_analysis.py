@@ -0,0 +1,137 @@
+"""
+Query Analysis
+Description: One immutable, single-pass analysis of the user query (normalized
+text, tokens, gazetteer matches, entities and keyword flags) that the
+query-understanding node stores in GlobalState for downstream agents.
+"""
+import re
+import string
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Optional, Tuple
+
+from src.data.gazetteer import (
+    CITY, COMMODITY, DISTRICT, FERTILIZER, FERTILIZER_KEYWORD, IRRIGATION_KEYWORD, KEYWORD, MANDI,
+    NUTRIENT_KEYWORD, PEST, PRICE_KEYWORD, STATE, GazetteerMatch, get_gazetteer, state_of,
+)
+from src.utils.query_keys import normalize_query
+
+AMOUNT_PATTERN = re.compile(r'(\d+)\s*lakh')
+
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+
+def clean_text(text) -> str:
+    """Clean text for model: lower-case, punctuation removed, whitespace collapsed"""
+    if not text:
+        return ""
+    text = str(text).lower()
+    text = text.translate(_PUNCTUATION_TABLE)
+    return ' '.join(text.split())
+
+
+@dataclass(frozen=True)
+class QueryAnalysis:
+    normalized: str                        # Model input (clean_text)
+    tokens: Tuple[str, ...]
+    matches: Tuple[GazetteerMatch, ...]    # Gazetteer matches in query order
+    keywords: FrozenSet[str]               # Keyword flags, e.g. {"price", "irrigation"}
+    entities: Mapping[str, object]         # Read-only view; copy before modifying
+
+    @property
+    def mentions_fertilizer(self) -> bool:
+        return FERTILIZER_KEYWORD in self.keywords or any(m.category == FERTILIZER for m in self.matches)
+
+    @property
+    def mentions_nutrient(self) -> bool:
+        return NUTRIENT_KEYWORD in self.keywords
+
+    @property
+    def mentions_price(self) -> bool:
+        return PRICE_KEYWORD in self.keywords
+
+    @property
+    def mentions_irrigation(self) -> bool:
+        return IRRIGATION_KEYWORD in self.keywords
+
+    def values(self, category: str) -> Tuple[str, ...]:
+        """Distinct matched values of a category, in query order."""
+        return tuple(dict.fromkeys(m.value for m in self.matches if m.category == category))
+
+    def first(self, category: str) -> Optional[str]:
+        """Leftmost matched value of a category."""
+        values = self.values(category)
+        return values[0] if values else None
+
+    @property
+    def location(self) -> Optional[str]:
+        """Place named in the query (district or city, else state), if any."""
+        return self.entities.get('location')
+
+
+def _entities(matches: Tuple[GazetteerMatch, ...], keywords: FrozenSet[str], text: str) -> dict:
+    entities = {}
+
+    # First (leftmost) commodity, mandi, district and fertilizer mentioned
+    for match in matches:
+        if match.category == COMMODITY and 'commodity' not in entities:
+            entities['commodity'] = match.value
+            entities['crop'] = match.value
+        elif match.category == MANDI and 'mandi' not in entities:
+            entities['mandi'] = match.value
+        elif match.category == DISTRICT and 'district' not in entities:
+            entities['district'] = match.value
+        elif match.category == FERTILIZER and 'fertilizer' not in entities:
+            entities['fertilizer'] = match.value
+        elif match.category == STATE and 'state' not in entities:
+            entities['state'] = match.value
+
+    # Location: the most specific place named (district or city), else the state
+    place = next((match.value for match in matches if match.category in (DISTRICT, CITY)), None)
+    if place:
+        entities['location'] = place
+        state = entities.get('state') or state_of(place)
+        if state:
+            entities['state'] = state
+    elif 'state' in entities:
+        entities['location'] = entities['state']
+
+    pests = [match.value for match in matches if match.category == PEST]
+    if pests:
+        entities['pests'] = tuple(dict.fromkeys(pests))
+
+    # Investment/savings amounts
+    amount_match = AMOUNT_PATTERN.search(text)
+    if amount_match:
+        entities['investment'] = f"{amount_match.group(1)} lakh"
+
+    if FERTILIZER_KEYWORD in keywords or any(match.category == FERTILIZER for match in matches):
+        entities['fertilizer_needed'] = True
+    if PRICE_KEYWORD in keywords:
+        entities['price_inquiry'] = True
+
+    return entities
+
+
+def analysis_key(query: Optional[str]) -> Tuple[str, str]:
+    """
+    Everything analyze_text() depends on: the model input (clean_text, which
+    drops punctuation) and the gazetteer text (normalize_query, which turns
+    punctuation into spaces so "Pune,Maharashtra" stays two words).
+    """
+    return clean_text(query), normalize_query(query)
+
+
+def analyze_text(query: Optional[str]) -> QueryAnalysis:
+    """Build the analysis of the raw query with one normalization and one gazetteer pass."""
+    normalized, words = analysis_key(query)
+    matches = tuple(get_gazetteer().match(words))
+    keywords = frozenset(match.value for match in matches if match.category == KEYWORD)
+    entities = _entities(matches, keywords, words)
+    return QueryAnalysis(
+        normalized=normalized,
+        tokens=tuple(normalized.split()),
+        matches=matches,
+        keywords=keywords,
+        entities=MappingProxyType(entities),
+    )
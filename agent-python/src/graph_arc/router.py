@@ -1,27 +1,157 @@
 # Import agent node functions
-from src.graph_arc.agents_node.weather_agent import weather_agent
+from src.graph_arc.agents_node.weather_agent import weather_agent, aweather_agent
 from src.graph_arc.agents_node.soil_crop_recommendation_agent import soil_crop_recommendation_agent
-from src.graph_arc.agents_node.market_price_agent import market_price_agent
+from src.graph_arc.agents_node.market_price_agent import market_price_agent, amarket_price_agent
 from src.graph_arc.agents_node.crop_health_pest_agent import crop_health_pest_agent
 from src.graph_arc.agents_node.government_schemes_agent import government_schemes_agent
 from src.graph_arc.core_nodes.offline_access_agent import offline_access_agent
 # Import state types
 from src.graph_arc.state import GlobalState
+from src.graph_arc.deadline import stage_timeout, timed_out_result
+from src.config.settings import ROUTER_MAX_WORKERS, WORKFLOW_MAX_CONCURRENCY
 from src.utils.loggers import get_logger
-from typing import Dict, Any, List, Union
+from langchain_core.runnables import RunnableLambda
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Union, Callable, Tuple
+import asyncio
+import contextvars
+import time
 
-def conditional_router(state: GlobalState) -> GlobalState:
+# Intent -> (agent_results key, agent function)
+AGENT_REGISTRY: Dict[str, Tuple[str, Callable[[GlobalState], Dict[str, Any]]]] = {
+    "weather": ("weather", weather_agent),
+    "soil": ("soil_crop_recommendation", soil_crop_recommendation_agent),
+    "market": ("market_price", market_price_agent),
+    "crop_health": ("crop_health_pest", crop_health_pest_agent),
+    "government_schemes": ("government_schemes", government_schemes_agent),
+    "offline": ("offline_access", offline_access_agent),
+}
+
+# Native async implementations for I/O-bound agents (sync agent -> async agent).
+# Agents without an entry here run in a worker thread on the async path.
+ASYNC_AGENT_VARIANTS: Dict[Callable, Callable] = {
+    weather_agent: aweather_agent,
+    market_price_agent: amarket_price_agent,
+}
+
+# Intents handled outside the router (decision support / translation nodes)
+NON_AGENT_INTENTS = ["translation", "decision_support", "policy"]
+
+# Fan-out branch that records the intents no agent handles
+UNHANDLED_INTENTS_NODE = "unhandled_intents"
+
+# Shared, bounded pool so a burst of requests cannot spawn unbounded threads.
+# By default it holds every agent of every admitted workflow run, so an agent
+# never spends its budget queued behind other requests' agents.
+# Work is submitted with a copy of the caller's context so per-node
+# instrumentation still sees the agents' external calls.
+AGENT_POOL_SIZE = ROUTER_MAX_WORKERS or WORKFLOW_MAX_CONCURRENCY * len(AGENT_REGISTRY)
+_agent_executor = ThreadPoolExecutor(max_workers=AGENT_POOL_SIZE, thread_name_prefix="agent")
+# Agents running as graph branches get their own pool: the branch thread only
+# waits on its agent to enforce the deadline and must not queue behind the
+# router's agents. A cut-off agent keeps its thread here until it returns.
+_branch_executor = ThreadPoolExecutor(max_workers=AGENT_POOL_SIZE, thread_name_prefix="agent-branch")
+
+def _cut_off(future, result_key: str, timeout: float):
+    """Give up on an overrunning agent. A running thread cannot be stopped: it stays busy until the agent returns."""
+    if future.cancel():
+        get_logger("conditional_router").warning(f"[ConditionalRouter] Agent {result_key} cut off after {timeout:.2f}s before it started")
+    else:
+        get_logger("conditional_router").warning(
+            f"[ConditionalRouter] Agent {result_key} cut off after {timeout:.2f}s; its thread keeps running until the agent returns"
+        )
+
+def _run_agent(result_key: str, agent_fn: Callable, state: GlobalState) -> Tuple[Dict[str, Any], float]:
+    """Run a single agent and measure its wall time."""
+    logger = get_logger("conditional_router")
+    start_time = time.perf_counter()
+    try:
+        result = agent_fn(state)
+    except Exception as e:
+        logger.error(f"[ConditionalRouter] Agent {result_key} failed: {e}")
+        result = {"error": str(e)}
+    return result, time.perf_counter() - start_time
+
+def _run_agent_with_deadline(result_key: str, agent_fn: Callable, state: GlobalState) -> Tuple[Dict[str, Any], float]:
+    """
+    Run a single agent, cutting it off when it overruns the agent-stage budget.
+    Called on a graph branch thread, which waits while the agent runs on the
+    dedicated branch pool.
+    """
+    timeout = stage_timeout(state, "agents")
+    if timeout is None:
+        return _run_agent(result_key, agent_fn, state)
+    
+    start_time = time.perf_counter()
+    future = _branch_executor.submit(contextvars.copy_context().run, _run_agent, result_key, agent_fn, state)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        _cut_off(future, result_key, timeout)
+        return timed_out_result(result_key, timeout), time.perf_counter() - start_time
+
+async def _arun_agent(result_key: str, agent_fn: Callable, state: GlobalState) -> Tuple[Dict[str, Any], float]:
+    """Async counterpart of _run_agent; never blocks the event loop or overruns the deadline."""
+    logger = get_logger("conditional_router")
+    timeout = stage_timeout(state, "agents")
+    start_time = time.perf_counter()
+    try:
+        async_fn = ASYNC_AGENT_VARIANTS.get(agent_fn)
+        if async_fn is not None:
+            pending = async_fn(state)
+        else:
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(_agent_executor, contextvars.copy_context().run, agent_fn, state)
+        result = await asyncio.wait_for(pending, timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"[ConditionalRouter] Agent {result_key} cut off after {timeout:.2f}s")
+        result = timed_out_result(result_key, timeout)
+    except Exception as e:
+        logger.error(f"[ConditionalRouter] Agent {result_key} failed: {e}")
+        result = {"error": str(e)}
+    return result, time.perf_counter() - start_time
+
+def unhandled_intents(state: GlobalState, registry: Dict[str, Tuple[str, Callable]]) -> List[str]:
+    """Detected intents with no agent that are not handled by later nodes either."""
+    unhandled: List[str] = []
+    for intent in state.get("intents", []):
+        if intent not in registry and intent not in NON_AGENT_INTENTS and intent not in unhandled:
+            unhandled.append(intent)
+    return unhandled
+
+def unhandled_intent_result(intent: str) -> Dict[str, Any]:
+    """agent_results entry recorded for an intent without a handler."""
+    return {"error": f"No handler for intent '{intent}'"}
+
+def _schedule_agents(state: GlobalState, registry: Dict[str, Tuple[str, Callable]], results: Dict[str, Any]) -> Dict[str, Callable]:
+    """Resolve each detected intent to its agent, skipping duplicates."""
+    logger = get_logger("conditional_router")
+    scheduled: Dict[str, Callable] = {}
+    for intent in state.get("intents", []):
+        if intent in registry:
+            result_key, agent_fn = registry[intent]
+            scheduled.setdefault(result_key, agent_fn)
+    for intent in unhandled_intents(state, registry):
+        logger.warning(f"[ConditionalRouter] No handler found for intent: {intent}")
+        results[intent] = unhandled_intent_result(intent)
+    return scheduled
+
+def conditional_router(state: GlobalState, registry: Dict[str, Tuple[str, Callable]] = None) -> GlobalState:
     """
     Routes the query to appropriate agent nodes based on detected intents.
-    Takes GlobalState as input and updates it with agent results.
+    All matched agents run concurrently on a bounded thread pool, so a
+    multi-intent query costs the slowest agent instead of the sum of all.
+    Agents still running when the agent-stage budget runs out are cut off.
     
     Args:
         state: The GlobalState containing user query, intents, and entities
+        registry: Optional intent -> (result key, agent) table, defaults to AGENT_REGISTRY
         
     Returns:
-        Updated GlobalState with agent results
+        Updated GlobalState with agent results and per-agent timings
     """
     logger = get_logger("conditional_router")
+    registry = AGENT_REGISTRY if registry is None else registry
     logger.info("[ConditionalRouter] Starting agent routing process")
     
     intents = state.get("intents", [])
@@ -32,44 +162,134 @@ def conditional_router(state: GlobalState) -> GlobalState:
     
     # Initialize empty results dictionary
     results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
     
-    # Process each intent through the appropriate agent
-    for intent in intents:
-        logger.info(f"[ConditionalRouter] Processing intent: {intent}")
-        
-        if intent == "weather":
-            logger.info("[ConditionalRouter] Invoking weather agent")
-            results["weather"] = weather_agent(state)
-            logger.info("[ConditionalRouter] Weather agent completed")
-        elif intent == "soil":
-            logger.info("[ConditionalRouter] Invoking soil crop recommendation agent")
-            results["soil_crop_recommendation"] = soil_crop_recommendation_agent(state)
-            logger.info("[ConditionalRouter] Soil crop agent completed")
-        elif intent == "market":
-            logger.info("[ConditionalRouter] Invoking market price agent")
-            results["market_price"] = market_price_agent(state)
-            logger.info("[ConditionalRouter] Market price agent completed")
-        elif intent == "crop_health":
-            logger.info("[ConditionalRouter] Invoking crop health pest agent")
-            results["crop_health_pest"] = crop_health_pest_agent(state)
-            logger.info("[ConditionalRouter] Crop health agent completed")
-        elif intent == "government_schemes":
-            logger.info("[ConditionalRouter] Invoking government schemes agent")
-            results["government_schemes"] = government_schemes_agent(state)
-            logger.info("[ConditionalRouter] Government schemes agent completed")
-        elif intent == "offline":
-            logger.info("[ConditionalRouter] Invoking offline access agent")
-            results["offline_access"] = offline_access_agent(state)
-            logger.info("[ConditionalRouter] Offline access agent completed")
-        elif intent not in ["translation", "decision_support", "policy"]:  # These are handled separately
-            logger.warning(f"[ConditionalRouter] No handler found for intent: {intent}")
-            results[intent] = {"error": f"No handler for intent '{intent}'"}
-    
-    logger.info(f"[ConditionalRouter] Agent routing completed. Processed {len(results)} agents")
+    scheduled = _schedule_agents(state, registry, results)
+    
+    # Fan out all matched agents and collect results as they finish
+    timeout = stage_timeout(state, "agents")
+    start_time = time.perf_counter()
+    futures = {
+        _agent_executor.submit(contextvars.copy_context().run, _run_agent, result_key, agent_fn, state): result_key
+        for result_key, agent_fn in scheduled.items()
+    }
+    logger.info(f"[ConditionalRouter] Invoking {len(futures)} agents concurrently: {list(scheduled.keys())}")
+    
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            result_key = futures[future]
+            results[result_key], timings[result_key] = future.result()
+            logger.info(f"[ConditionalRouter] {result_key} agent completed in {timings[result_key]:.3f}s")
+    except FutureTimeoutError:
+        # Agents still running past the budget are cut off; decision support
+        # proceeds with whatever has arrived
+        for future, result_key in futures.items():
+            if result_key not in results:
+                _cut_off(future, result_key, timeout)
+                results[result_key] = timed_out_result(result_key, timeout)
+                timings[result_key] = time.perf_counter() - start_time
+    
+    total_time = time.perf_counter() - start_time
+    logger.info(f"[ConditionalRouter] Agent routing completed. Processed {len(results)} agents in {total_time:.3f}s")
     logger.info(f"[ConditionalRouter] Agent results keys: {list(results.keys())}")
     
     # Update GlobalState with agent results
     updated_state = GlobalState(**state)
     updated_state["agent_results"] = results
+    updated_state["agent_timings"] = timings
+    
+    return updated_state
+
+async def aconditional_router(state: GlobalState, registry: Dict[str, Tuple[str, Callable]] = None) -> GlobalState:
+    """
+    Async variant of conditional_router. Matched agents run as concurrent
+    asyncio tasks; I/O-bound agents await their HTTP calls directly.
+    """
+    logger = get_logger("conditional_router")
+    registry = AGENT_REGISTRY if registry is None else registry
+    logger.info(f"[ConditionalRouter] Starting async agent routing for intents: {state.get('intents', [])}")
+    
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    scheduled = _schedule_agents(state, registry, results)
+    
+    async def run(result_key: str, agent_fn: Callable):
+        return result_key, await _arun_agent(result_key, agent_fn, state)
+    
+    start_time = time.perf_counter()
+    tasks = [run(result_key, agent_fn) for result_key, agent_fn in scheduled.items()]
+    for finished in asyncio.as_completed(tasks):
+        result_key, (results[result_key], timings[result_key]) = await finished
+        logger.info(f"[ConditionalRouter] {result_key} agent completed in {timings[result_key]:.3f}s")
+    
+    logger.info(f"[ConditionalRouter] Async agent routing completed in {time.perf_counter() - start_time:.3f}s")
+    
+    updated_state = GlobalState(**state)
+    updated_state["agent_results"] = results
+    updated_state["agent_timings"] = timings
+    return updated_state
+
+
+def agent_node_name(result_key: str) -> str:
+    """Graph node name used for an agent when it runs as its own branch."""
+    return f"{result_key}_agent"
+
+def make_agent_node(result_key: str, agent_fn: Callable[[GlobalState], Dict[str, Any]]) -> RunnableLambda:
+    """
+    Wrap an agent so it can be registered as a standalone LangGraph node.
+    The node returns a partial update that the merge_dicts reducer folds
+    into GlobalState.agent_results / agent_timings. It carries both a sync
+    implementation (workflow.invoke) and an async one (workflow.ainvoke).
+    """
+    def node_update(result: Dict[str, Any], elapsed: float) -> Dict[str, Any]:
+        get_logger("conditional_router").info(f"[AgentNode] {result_key} agent completed in {elapsed:.3f}s")
+        return {
+            "agent_results": {result_key: result},
+            "agent_timings": {result_key: elapsed},
+        }
+    
+    def agent_node(state: GlobalState) -> Dict[str, Any]:
+        return node_update(*_run_agent_with_deadline(result_key, agent_fn, state))
+    
+    async def aagent_node(state: GlobalState) -> Dict[str, Any]:
+        return node_update(*await _arun_agent(result_key, agent_fn, state))
+    
+    return RunnableLambda(agent_node, afunc=aagent_node, name=agent_node_name(result_key))
+
+def make_unhandled_intents_node(registry: Dict[str, Tuple[str, Callable]] = None) -> Callable:
+    """
+    Build the fan-out branch that records intents without a handler in
+    agent_results, as conditional_router does in single-node mode.
+    """
+    registry = AGENT_REGISTRY if registry is None else registry
+    
+    def unhandled_intents_node(state: GlobalState) -> Dict[str, Any]:
+        return {"agent_results": {intent: unhandled_intent_result(intent) for intent in unhandled_intents(state, registry)}}
+    
+    return unhandled_intents_node
+
+def make_agent_fanout(registry: Dict[str, Tuple[str, Callable]] = None, fallback: str = "decision_support") -> Callable:
+    """
+    Build the conditional-edge function that fans out to one node per matched
+    intent, plus UNHANDLED_INTENTS_NODE when an intent has no handler.
+    LangGraph runs all returned nodes in the same superstep.
+    """
+    registry = AGENT_REGISTRY if registry is None else registry
+    
+    def route_to_agents(state: GlobalState) -> List[str]:
+        logger = get_logger("conditional_router")
+        targets: List[str] = []
+        for intent in state.get("intents", []):
+            if intent in registry:
+                node_name = agent_node_name(registry[intent][0])
+                if node_name not in targets:
+                    targets.append(node_name)
+        unhandled = unhandled_intents(state, registry)
+        if unhandled:
+            logger.warning(f"[AgentFanout] No handler found for intents: {unhandled}")
+            targets.append(UNHANDLED_INTENTS_NODE)
+        
+        logger.info(f"[AgentFanout] Dispatching to agent nodes: {targets or [fallback]}")
+        return targets or [fallback]
     
-    return updated_state
\ No newline at end of file
+    return route_to_agents
@@ -1,14 +1,39 @@
-from typing import TypedDict, Optional
+from typing import TypedDict, Optional, Annotated
+
+from src.graph_arc.query_analysis import QueryAnalysis
+
+
+def merge_dicts(left: Optional[dict], right: Optional[dict]) -> dict:
+    """Reducer that merges dict updates coming from parallel graph branches."""
+    return {**(left or {}), **(right or {})}
+
+
+def merge_performance(left: Optional[dict], right: Optional[dict]) -> dict:
+    """Reducer folding per-node performance records from parallel branches."""
+    left, right = left or {}, right or {}
+    return {
+        **left,
+        **right,
+        "nodes": {**left.get("nodes", {}), **right.get("nodes", {})},
+    }
+
 
 class GlobalState(TypedDict):
     user_id: str
-    location: Optional[str]        # Detected from context node
+    location: Optional[str]        # Resolved in query understanding (query > request > user history > default)
+    location_source: Optional[str] # "query", "request", "user_cache" or "default"
     language: str                  # User preferred/detected language
     device_type: Optional[str]     # Phone/SMS/IVR
     raw_query: str
     intents: list[str]              # ["weather", "soil", ...]
     entities: dict                  # {"crop": "wheat", "mandi": "Azadpur"}
     confidence_score: float
-    agent_results: Optional[dict]   # Results from various agents
+    intent_model_version: Optional[str]      # Intent model version that classified raw_query
+    query_analysis: Optional[QueryAnalysis]  # Immutable single-pass analysis of raw_query
+    deadline_seconds: Optional[float]  # End-to-end budget for this request
+    deadline: Optional[float]          # Absolute deadline (epoch seconds)
+    agent_results: Annotated[Optional[dict], merge_dicts]   # Results from various agents
+    agent_timings: Annotated[Optional[dict], merge_dicts]   # Wall time (seconds) per agent
     decision: Optional[dict]        # Final decision from decision support
-    translation: Optional[dict]     # Translation results from translation agent
\ No newline at end of file
+    translation: Optional[dict]     # Translation results from translation agent
+    _performance: Annotated[Optional[dict], merge_performance]  # Per-node timings and external calls
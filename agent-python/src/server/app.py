@@ -5,13 +5,14 @@ Description: Real-time chat server with WebSocket support for agricultural queri
 import asyncio
 import json
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 import logging
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from pydantic import BaseModel, ValidationError
 
 # Import your agricultural workflow
@@ -25,13 +26,35 @@ try:
 except ImportError:
     print("❌ Error: Could not import workflow from src.graph_arc.graph")
     raise
+from src.config.settings import INTENT_BATCH_MAX_QUERIES
 from src.utils.loggers import get_logger
+from src.utils.http_client import aclose_async_client, close_sync_session, get_async_client
+from src.services.warmup import startup_warmup
+from src.services.workflow_scheduler import WorkflowScheduler, SchedulerBusyError
+from src.services.single_flight import SingleFlight
+from src.services.response_cache import ResponseCache, is_cacheable, response_cache_key
+from src.graph_arc.core_nodes.query_understanding_node import analysis_cache, analyze_query, get_intents_batch, intent_models
+from src.services.user_location_cache import user_locations
+from src.utils.instrumentation import CACHED, EXECUTED, SHARED, performance_report
+from src.utils.query_keys import request_key
+from src.graph_arc.deadline import deadline_budget
+from src.server.streaming import custom_message, node_messages
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Server lifecycle: warm up before accepting traffic, release pooled HTTP connections on shutdown"""
+    get_async_client()
+    await asyncio.get_running_loop().run_in_executor(None, startup_warmup.run)
+    yield
+    await aclose_async_client()
+    close_sync_session()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Agricultural AI Assistant API",
     description="Real-time WebSocket server for agricultural advisory chat",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS for frontend connections
@@ -46,6 +69,15 @@ app.add_middleware(
 # Set up logging
 logger = get_logger("agricultural_server")
 
+# Bounded execution pool shared by HTTP and WebSocket entry points
+scheduler = WorkflowScheduler(workflow)
+
+# Identical concurrent queries share one workflow execution
+coalescer = SingleFlight()
+
+# Complete answers are reused until their intent-dependent TTL expires
+response_cache = ResponseCache()
+
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
@@ -107,8 +139,20 @@ class ChatMessage(BaseModel):
     raw_query: str
     language: Optional[str] = "hi"
     location: Optional[str] = None
+    device_type: Optional[str] = None
+    deadline_seconds: Optional[float] = None
+    stream: Optional[bool] = False
+    debug: Optional[bool] = False
     additional_context: Optional[Dict] = None
 
+class IntentBatchRequest(BaseModel):
+    queries: List[str]
+    threshold: Optional[float] = 0.2
+
+class ModelActivationRequest(BaseModel):
+    version: str
+    background: Optional[bool] = True
+
 class ChatResponse(BaseModel):
     message_id: str
     user_id: str
@@ -120,33 +164,117 @@ class ChatResponse(BaseModel):
     error: Optional[str] = None
 
 # Agricultural processing function
+def build_initial_state(message: ChatMessage) -> Dict:
+    """Translate a chat message into the workflow's initial GlobalState"""
+    initial_state = {
+        "user_id": message.user_id,
+        "raw_query": message.raw_query,
+        "language": message.language or "hi",
+    }
+    
+    # Add location if provided
+    if message.location:
+        initial_state["location"] = message.location
+    
+    # Device type and explicit budget drive the end-to-end deadline
+    if message.device_type:
+        initial_state["device_type"] = message.device_type
+    if message.deadline_seconds:
+        initial_state["deadline_seconds"] = message.deadline_seconds
+    
+    # Add any additional context
+    if message.additional_context:
+        initial_state.update(message.additional_context)
+    return initial_state
+
+def format_workflow_result(result: Dict) -> Dict:
+    """Shape the final workflow state into the client-facing response payload"""
+    processed_result = {
+        "query": result.get('raw_query', ''),
+        "location": result.get('location', 'Unknown'),
+        "language": result.get('language', 'hi'),
+        "detected_intents": result.get('intents', []),
+        "intent_model_version": result.get('intent_model_version'),
+        "agent_results": result.get('agent_results', {}),
+        "missing_sections": result.get('decision', {}).get('missing_sections', []),
+        "comprehensive_advice": None,
+        "final_advice": None,
+        "explanation": None,
+        "translated_response": None
+    }
+    
+    # Extract final advice and check if it's comprehensive JSON
+    if "decision" in result:
+        decision = result["decision"]
+        final_advice = decision.get('final_advice', 'No advice available')
+    
+        # Try to parse final_advice as comprehensive JSON
+        try:
+            import json
+            if isinstance(final_advice, str) and final_advice.strip().startswith('{'):
+                comprehensive_json = json.loads(final_advice)
+                processed_result["comprehensive_advice"] = comprehensive_json
+                processed_result["final_advice"] = comprehensive_json.get("final_advice", "No advice available")
+            else:
+                # If not JSON, create a simple structure
+                processed_result["final_advice"] = final_advice
+                processed_result["comprehensive_advice"] = {
+                    "final_advice": final_advice,
+                    "confidence_score": 0.8
+                }
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.warning(f"Failed to parse comprehensive advice as JSON: {e}")
+            processed_result["final_advice"] = final_advice
+            processed_result["comprehensive_advice"] = {
+                "final_advice": final_advice,
+                "confidence_score": 0.8
+            }
+    
+        processed_result["explanation"] = decision.get('explanation', 'No explanation available')
+    
+    # Extract translation if available
+    if "translation" in result:
+        translation = result["translation"]
+        print(f"🌐 Processing translation data: {translation}")
+    
+        # Update response with translated content
+        if translation.get('translated_response'):
+            processed_result["final_advice"] = translation['translated_response']
+            processed_result["response"] = translation['translated_response']
+    
+        if translation.get('translated_explanation'):
+            processed_result["explanation"] = translation['translated_explanation']
+    
+        # Add translation metadata
+        processed_result["translation"] = {
+            "target_language": translation.get('target_language', 'hi'),
+            "translated_response": translation.get('translated_response', ''),
+            "translated_explanation": translation.get('translated_explanation', ''),
+            "original_advice": translation.get('original_advice', ''),
+            "original_explanation": translation.get('original_explanation', ''),
+            "fallback_used": translation.get('fallback_used', False)
+        }
+    
+        logger.info(f"[AgriProcessor] Translation applied for language: {translation.get('target_language', 'hi')}")
+    else:
+        print("❌ No translation data found in result")
+        logger.info("[AgriProcessor] No translation data available")
+    return processed_result
+
 async def process_agricultural_query(message: ChatMessage) -> Dict:
     """Process agricultural query through the AI workflow"""
     try:
         logger.info(f"[AgriProcessor] Processing query for user {message.user_id}")
         
-        # Prepare initial state
-        initial_state = {
-            "user_id": message.user_id,
-            "raw_query": message.raw_query,
-            "language": message.language or "hi",
-        }
+        initial_state = build_initial_state(message)
         
-        # Add location if provided
-        if message.location:
-            initial_state["location"] = message.location
-            
-        # Add any additional context
-        if message.additional_context:
-            initial_state.update(message.additional_context)
-
         # Send status update
         await manager.send_status_update("processing", message.user_id, {"stage": "analyzing_query"})
         
-        # Process through workflow (this runs synchronously)
+        # Process through workflow, subject to admission control
         logger.info("[AgriProcessor] Invoking optimized agricultural workflow")
         start_time_workflow = datetime.now()
-        result = workflow.invoke(initial_state)
+        result, cache_status, shared = await run_cached(message, initial_state)
         workflow_time = (datetime.now() - start_time_workflow).total_seconds()
         
         # Log performance metrics
@@ -158,75 +286,11 @@ async def process_agricultural_query(message: ChatMessage) -> Dict:
             "workflow_time": f"{workflow_time:.2f}s"
         })
         
-        # Process result for WebSocket response
-        processed_result = {
-            "query": result.get('raw_query', ''),
-            "location": result.get('location', 'Unknown'),
-            "language": result.get('language', 'hi'),
-            "detected_intents": result.get('intents', []),
-            "agent_results": result.get('agent_results', {}),
-            "comprehensive_advice": None,
-            "final_advice": None,
-            "explanation": None,
-            "translated_response": None
-        }
-        
-        # Extract final advice and check if it's comprehensive JSON
-        if "decision" in result:
-            decision = result["decision"]
-            final_advice = decision.get('final_advice', 'No advice available')
-            
-            # Try to parse final_advice as comprehensive JSON
-            try:
-                import json
-                if isinstance(final_advice, str) and final_advice.strip().startswith('{'):
-                    comprehensive_json = json.loads(final_advice)
-                    processed_result["comprehensive_advice"] = comprehensive_json
-                    processed_result["final_advice"] = comprehensive_json.get("final_advice", "No advice available")
-                else:
-                    # If not JSON, create a simple structure
-                    processed_result["final_advice"] = final_advice
-                    processed_result["comprehensive_advice"] = {
-                        "final_advice": final_advice,
-                        "confidence_score": 0.8
-                    }
-            except (json.JSONDecodeError, AttributeError) as e:
-                logger.warning(f"Failed to parse comprehensive advice as JSON: {e}")
-                processed_result["final_advice"] = final_advice
-                processed_result["comprehensive_advice"] = {
-                    "final_advice": final_advice,
-                    "confidence_score": 0.8
-                }
-            
-            processed_result["explanation"] = decision.get('explanation', 'No explanation available')
-        
-        # Extract translation if available
-        if "translation" in result:
-            translation = result["translation"]
-            print(f"🌐 Processing translation data: {translation}")
-            
-            # Update response with translated content
-            if translation.get('translated_response'):
-                processed_result["final_advice"] = translation['translated_response']
-                processed_result["response"] = translation['translated_response']
-                
-            if translation.get('translated_explanation'):
-                processed_result["explanation"] = translation['translated_explanation']
-            
-            # Add translation metadata
-            processed_result["translation"] = {
-                "target_language": translation.get('target_language', 'hi'),
-                "translated_response": translation.get('translated_response', ''),
-                "translated_explanation": translation.get('translated_explanation', ''),
-                "original_advice": translation.get('original_advice', ''),
-                "original_explanation": translation.get('original_explanation', ''),
-                "fallback_used": translation.get('fallback_used', False)
-            }
-            
-            logger.info(f"[AgriProcessor] Translation applied for language: {translation.get('target_language', 'hi')}")
-        else:
-            print("❌ No translation data found in result")
-            logger.info("[AgriProcessor] No translation data available")
+        processed_result = format_workflow_result(result)
+        if message.debug:
+            # A cached or shared answer did no work of its own; its stored _performance is another run's
+            source = CACHED if cache_status == "hit" else SHARED if shared else EXECUTED
+            processed_result["_performance"] = performance_report(result.get("_performance"), cache_status, source)
         
         logger.info(f"[AgriProcessor] Successfully processed query for user {message.user_id}")
         return {
@@ -235,6 +299,10 @@ async def process_agricultural_query(message: ChatMessage) -> Dict:
             "error": None
         }
         
+    except SchedulerBusyError as e:
+        logger.warning(f"[AgriProcessor] Server busy, rejected query for user {message.user_id}")
+        return busy_result(e)
+        
     except Exception as e:
         logger.error(f"[AgriProcessor] Error processing query for user {message.user_id}: {str(e)}")
         return {
@@ -243,6 +311,139 @@ async def process_agricultural_query(message: ChatMessage) -> Dict:
             "error": str(e)
         }
 
+def resolve_request_location(message: ChatMessage, analysis) -> str:
+    """
+    The location the workflow will use for this message (query, request,
+    user's last known location, default), so requests for different places
+    never share a cache entry or an in-flight execution.
+    """
+    location, _ = user_locations.resolve(message.user_id, message.location, analysis.location)
+    return location
+
+async def run_cached(message: ChatMessage, initial_state: Dict) -> Tuple[Dict, Optional[str], bool]:
+    """
+    Serve the workflow result from the response cache when possible. The key
+    is the canonical query, location, language and locally classified intents,
+    so a hit never reaches the scheduler, the agents or Gemini.
+    
+    Returns:
+        (result, cache status, shared) where the status is "hit", "miss" or
+        None when the request bypasses the cache, and shared is True when the
+        result came from another request's in-flight execution
+    """
+    if message.additional_context:
+        result, shared = await run_coalesced(message, initial_state)
+        return result, None, shared
+    
+    intents, _, analysis = analyze_query(message.raw_query)
+    location = resolve_request_location(message, analysis)
+    key = response_cache_key(message.raw_query, location, message.language or "hi", intents)
+    cached = response_cache.get(key)
+    if cached is not None:
+        logger.info(f"[AgriProcessor] Response cache hit for user {message.user_id}")
+        return cached, "hit", False
+    
+    result, shared = await run_coalesced(message, initial_state, location)
+    if is_cacheable(result):
+        response_cache.put(key, result)
+    return result, "miss", shared
+
+async def run_coalesced(message: ChatMessage, initial_state: Dict, location: Optional[str] = None) -> Tuple[Dict, bool]:
+    """
+    Run the workflow, sharing one execution among concurrent requests with the
+    same normalized (query, location, language), device type and deadline
+    budget, so a short-budget SMS/IVR request never waits on a long web run
+    and a web request never receives an IVR partial answer. Requests carrying
+    additional_context always run on their own. Pass the request's `location`
+    when it is already resolved (run_cached does), so the query is not
+    analysed and the user's location not looked up again.
+    
+    Returns:
+        (result, shared) where shared is True when this request joined
+        another request's execution
+    """
+    if message.additional_context:
+        return await scheduler.run(initial_state), False
+    
+    if location is None:
+        location = resolve_request_location(message, analyze_query(message.raw_query)[2])
+    key = request_key(message.raw_query, location, message.language or "hi") + (
+        (initial_state.get("device_type") or "web").lower(),
+        deadline_budget(initial_state),
+    )
+    result, shared = await coalescer.do(key, lambda: scheduler.run(initial_state))
+    if shared:
+        logger.info(f"[AgriProcessor] Query for user {message.user_id} joined an in-flight execution")
+    return result, shared
+
+async def stream_agricultural_query(message: ChatMessage, send: Callable[[Dict], Awaitable]) -> Dict:
+    """
+    Process agricultural query with workflow.astream, pushing a typed message
+    (intents, agent_result, decision, translation) through `send` as soon as
+    each graph node finishes. The decision LLM answer is streamed token by
+    token in between. Returns the same payload as process_agricultural_query.
+    """
+    try:
+        logger.info(f"[AgriProcessor] Streaming query for user {message.user_id}")
+        
+        final_state = build_initial_state(message)
+        start_time_workflow = datetime.now()
+        async for mode, chunk in scheduler.stream(
+            final_state,
+            config={"configurable": {"stream_decision_tokens": True}},
+            stream_mode=["updates", "values", "custom"],
+        ):
+            if mode == "values":
+                final_state = chunk
+                continue
+            if mode == "custom":
+                await send(custom_message(chunk))
+                continue
+            for node_name, update in chunk.items():
+                for node_message in node_messages(node_name, update):
+                    await send(node_message)
+        
+        workflow_time = (datetime.now() - start_time_workflow).total_seconds()
+        logger.info(f"[AgriProcessor] Streamed workflow completed in {workflow_time:.2f}s")
+        processed_result = format_workflow_result(final_state)
+        if message.debug:
+            processed_result["_performance"] = performance_report(final_state.get("_performance"))
+        return {
+            "success": True,
+            "result": processed_result,
+            "error": None
+        }
+    
+    except SchedulerBusyError as e:
+        logger.warning(f"[AgriProcessor] Server busy, rejected streamed query for user {message.user_id}")
+        return busy_result(e)
+    
+    except Exception as e:
+        logger.error(f"[AgriProcessor] Error streaming query for user {message.user_id}: {str(e)}")
+        return {
+            "success": False,
+            "result": None,
+            "error": str(e)
+        }
+
+def busy_result(error: SchedulerBusyError) -> Dict:
+    """Processing result for a request rejected by the scheduler"""
+    return {
+        "success": False,
+        "status": "busy",
+        "retry_after": error.retry_after,
+        "result": None,
+        "error": str(error)
+    }
+
+def busy_exception(result: Dict) -> HTTPException:
+    """503 response for a request rejected by the scheduler"""
+    return HTTPException(
+        status_code=503,
+        detail={"status": "busy", "error": result["error"], "retry_after": result["retry_after"]},
+        headers={"Retry-After": str(result["retry_after"])}
+    )
+
 # WebSocket endpoint
 @app.websocket("/ws/{user_id}")
 async def websocket_endpoint(websocket: WebSocket, user_id: str):
@@ -286,11 +487,28 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
                 }
                 await manager.send_personal_message(ack_message, user_id)
                 
-                # Process the agricultural query
+                # Process the agricultural query, streaming node results if requested
                 start_time = datetime.now()
-                result = await process_agricultural_query(chat_message)
+                if chat_message.stream:
+                    result = await stream_agricultural_query(
+                        chat_message, lambda node_message: manager.send_personal_message(node_message, user_id)
+                    )
+                else:
+                    result = await process_agricultural_query(chat_message)
                 processing_time = (datetime.now() - start_time).total_seconds()
                 
+                if result.get("status") == "busy":
+                    busy_message = {
+                        "type": "busy",
+                        "status": "busy",
+                        "message": "सर्वर व्यस्त है। कृपया थोड़ी देर बाद पुनः प्रयास करें।",
+                        "query": chat_message.raw_query,
+                        "retry_after": result["retry_after"],
+                        "timestamp": datetime.now().isoformat()
+                    }
+                    await manager.send_personal_message(busy_message, user_id)
+                    continue
+                
                 # Create response
                 message_id = str(uuid.uuid4())
                 response = {
@@ -520,17 +738,80 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "connections": manager.get_connection_stats()
+        "connections": manager.get_connection_stats(),
+        "scheduler": scheduler.get_stats(),
+        "single_flight": coalescer.get_stats(),
+        "response_cache": response_cache.get_stats(),
+        "query_analysis_cache": analysis_cache.get_stats(),
+        "user_location_cache": user_locations.get_stats(),
+        "intent_model": intent_models.status()
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 200 only once startup warmup has completed; failed steps are retried in the background"""
+    report = startup_warmup.poll()
+    report["timestamp"] = datetime.now().isoformat()
+    if not report["ready"]:
+        return JSONResponse(status_code=503, content=report)
+    return report
+
 @app.get("/stats")
 async def get_stats():
     """Get server statistics"""
     return {
         "server_stats": manager.get_connection_stats(),
+        "scheduler_stats": scheduler.get_stats(),
+        "single_flight_stats": coalescer.get_stats(),
+        "response_cache_stats": response_cache.get_stats(),
+        "query_analysis_cache_stats": analysis_cache.get_stats(),
+        "user_location_cache_stats": user_locations.get_stats(),
+        "intent_model": intent_models.status(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.delete("/cache")
+async def invalidate_cache(query: Optional[str] = None, location: Optional[str] = None, intent: Optional[str] = None):
+    """Invalidate cached responses matching the given filters (all when none given)"""
+    removed = response_cache.invalidate(query=query, location=location, intent=intent)
+    return {
+        "invalidated": removed,
+        "cache": response_cache.get_stats(),
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/models")
+async def list_intent_models():
+    """Active, previous and available intent model versions"""
+    return intent_models.status()
+
+@app.post("/models/activate")
+async def activate_intent_model(request: ModelActivationRequest):
+    """
+    Load an intent model version and swap it in. By default the load runs in
+    the background and the current version keeps serving until it completes.
+    """
+    try:
+        if request.background:
+            intent_models.activate(request.version, background=True)
+        else:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, intent_models.activate, request.version)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {**intent_models.status(), "timestamp": datetime.now().isoformat()}
+
+@app.post("/models/rollback")
+async def rollback_intent_model():
+    """Swap back to the previously active intent model version"""
+    try:
+        intent_models.rollback()
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {**intent_models.status(), "timestamp": datetime.now().isoformat()}
+
 @app.get("/test-page", response_class=HTMLResponse)
 async def test_page():
     """Simple test page for WebSocket testing"""
@@ -1474,6 +1755,9 @@ async def chat_endpoint(message: ChatMessage):
         result = await process_agricultural_query(message)
         processing_time = (datetime.now() - start_time).total_seconds()
         
+        if result.get("status") == "busy":
+            raise busy_exception(result)
+        
         return ChatResponse(
             message_id=str(uuid.uuid4()),
             user_id=message.user_id,
@@ -1484,6 +1768,8 @@ async def chat_endpoint(message: ChatMessage):
             success=result["success"],
             error=result["error"]
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1495,6 +1781,9 @@ async def comprehensive_chat_endpoint(message: ChatMessage):
         result = await process_agricultural_query(message)
         processing_time = (datetime.now() - start_time).total_seconds()
         
+        if result.get("status") == "busy":
+            raise busy_exception(result)
+        
         response_data = {
             "message_id": str(uuid.uuid4()),
             "user_id": message.user_id,
@@ -1513,6 +1802,34 @@ async def comprehensive_chat_endpoint(message: ChatMessage):
             response_data["error"] = result["error"]
         
         return response_data
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/intents/batch")
+async def intents_batch_endpoint(request: IntentBatchRequest):
+    """Classify many queries in one vectorized pass"""
+    if len(request.queries) > INTENT_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {INTENT_BATCH_MAX_QUERIES} queries per batch"
+        )
+    try:
+        start_time = datetime.now()
+        loop = asyncio.get_running_loop()
+        predictions = await loop.run_in_executor(
+            None, get_intents_batch, request.queries, request.threshold
+        )
+        return {
+            "results": [
+                {"query": query, "intents": intents, "confidence": confidence}
+                for query, (intents, confidence) in zip(request.queries, predictions)
+            ],
+            "count": len(predictions),
+            "processing_time": (datetime.now() - start_time).total_seconds(),
+            "timestamp": datetime.now().isoformat()
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -7,7 +7,7 @@ from typing import List, Optional, Dict
 from datetime import datetime
 import uuid
 
-from server.app import manager, ChatMessage, process_agricultural_query
+from server.app import manager, ChatMessage, process_agricultural_query, busy_exception
 
 # Create router
 router = APIRouter(prefix="/api/v1", tags=["Agricultural AI"])
@@ -38,6 +38,9 @@ async def process_query(message: ChatMessage):
     try:
         result = await process_agricultural_query(message)
         
+        if result.get("status") == "busy":
+            raise busy_exception(result)
+        
         if result["success"]:
             return {
                 "message_id": str(uuid.uuid4()),
@@ -47,6 +50,8 @@ async def process_query(message: ChatMessage):
             }
         else:
             raise HTTPException(status_code=500, detail=result["error"])
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,84 @@
+"""
+Progressive Streaming
+Description: Maps workflow node updates (workflow.astream) to typed WebSocket messages
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from src.graph_arc.core_nodes.decision_support_node import DECISION_DELTA, DECISION_SECTION
+from src.graph_arc.router import UNHANDLED_INTENTS_NODE
+
+# Message types, in the order a client normally receives them
+INTENTS = "intents"
+AGENT_RESULT = "agent_result"
+DECISION = "decision"
+TRANSLATION = "translation"
+# Token-level decision messages arrive between the agent results and DECISION:
+# DECISION_DELTA carries final_advice text, DECISION_SECTION each completed section
+
+def custom_message(chunk: Dict) -> Dict:
+    """Stamp a message a node wrote to the custom stream (get_stream_writer)"""
+    return {**chunk, "timestamp": datetime.now().isoformat()}
+
+def _parse_advice(final_advice: Any) -> Tuple[Any, Any]:
+    """Split the decision's final_advice into (headline advice, comprehensive JSON)"""
+    if isinstance(final_advice, str) and final_advice.strip().startswith('{'):
+        try:
+            comprehensive = json.loads(final_advice)
+            return comprehensive.get("final_advice", "No advice available"), comprehensive
+        except json.JSONDecodeError:
+            pass
+    return final_advice, {"final_advice": final_advice, "confidence_score": 0.8}
+
+def _agent_messages(update: Dict) -> List[Dict]:
+    timings = update.get("agent_timings") or {}
+    return [
+        {"type": AGENT_RESULT, "agent": agent, "data": result, "elapsed": timings.get(agent)}
+        for agent, result in (update.get("agent_results") or {}).items()
+    ]
+
+def node_messages(node_name: str, update: Dict) -> List[Dict]:
+    """
+    Typed messages for one finished graph node.
+    Nodes the client does not need to see (e.g. user_context) produce none.
+    """
+    if not update:
+        return []
+    
+    if node_name == "query_understanding":
+        messages = [{
+            "type": INTENTS,
+            "intents": update.get("intents", []),
+            "entities": update.get("entities", {}),
+            "confidence_score": update.get("confidence_score"),
+        }]
+    elif node_name in ("conditional_router", UNHANDLED_INTENTS_NODE) or node_name.endswith("_agent"):
+        messages = _agent_messages(update)
+    elif node_name == "decision_support":
+        decision = update.get("decision") or {}
+        final_advice, comprehensive_advice = _parse_advice(decision.get("final_advice", "No advice available"))
+        messages = [{
+            "type": DECISION,
+            "final_advice": final_advice,
+            "comprehensive_advice": comprehensive_advice,
+            "explanation": decision.get("explanation", "No explanation available"),
+            "missing_sections": decision.get("missing_sections", []),
+        }]
+    elif node_name == "translation_language" and update.get("translation"):
+        translation = update["translation"]
+        messages = [{
+            "type": TRANSLATION,
+            "target_language": translation.get("target_language"),
+            "translated_response": translation.get("translated_response", ""),
+            "translated_explanation": translation.get("translated_explanation", ""),
+            "fallback_used": translation.get("fallback_used", False),
+        }]
+    else:
+        messages = []
+    
+    timestamp = datetime.now().isoformat()
+    for message in messages:
+        message["node"] = node_name
+        message["timestamp"] = timestamp
+    return messages
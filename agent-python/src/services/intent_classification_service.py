@@ -0,0 +1,303 @@
+# src/services/intent_classification_service.py
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import sys
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.loggers import get_logger
+
+logger = get_logger("intent_classification_service")
+
+# agent-python/model
+MODEL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "model"
+)
+COMPACT_MODEL_DIR = os.path.join(MODEL_DIR, "compact")
+HASHED_MODEL_DIR = os.path.join(MODEL_DIR, "hashed")
+
+PICKLED_MODEL_FILES = {
+    "model": "agricultural_multilabel_model.pkl",
+    "binarizer": "multilabel_binarizer.pkl",
+    "vectorizer": "multilabel_tfidf_vectorizer.pkl",
+}
+
+# Files of the compact format, each a plain .npy array that can be memory-mapped
+VOCABULARY_FILE = "vocabulary.npy"   # sorted n-gram terms (unicode)
+COLUMNS_FILE = "columns.npy"         # feature column of each sorted term
+IDF_FILE = "idf.npy"                 # (n_features,) IDF weights
+COEF_FILE = "coef.npy"               # (n_features, n_classes) per-class coefficients
+INTERCEPT_FILE = "intercept.npy"     # (n_classes,) per-class intercepts
+CLASSES_FILE = "classes.npy"         # intent names, in binarizer order
+META_FILE = "meta.json"              # tokenizer settings and the sha256 of the pickles it was exported from
+# The hashed format (hashed/) has no vocabulary or columns: terms are hashed to columns
+
+
+def model_files_signature(model_dir: str = MODEL_DIR) -> Tuple:
+    """(path, mtime_ns, size) of every model file, to detect retrained models on disk."""
+    compact_dir = os.path.join(model_dir, os.path.basename(COMPACT_MODEL_DIR))
+    hashed_dir = os.path.join(model_dir, os.path.basename(HASHED_MODEL_DIR))
+    paths = [os.path.join(model_dir, name) for name in PICKLED_MODEL_FILES.values()]
+    paths += [
+        os.path.join(compact_dir, name)
+        for name in (VOCABULARY_FILE, COLUMNS_FILE, IDF_FILE, COEF_FILE, INTERCEPT_FILE, CLASSES_FILE, META_FILE)
+    ]
+    paths += [
+        os.path.join(hashed_dir, name)
+        for name in (IDF_FILE, COEF_FILE, INTERCEPT_FILE, CLASSES_FILE, META_FILE)
+    ]
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+def load_pickled_model(model_dir: str = MODEL_DIR):
+    """Unpickle the scikit-learn (model, vectorizer, binarizer) triple."""
+    loaded = {}
+    for name, filename in PICKLED_MODEL_FILES.items():
+        with open(os.path.join(model_dir, filename), "rb") as f:
+            loaded[name] = pickle.load(f)
+    return loaded["model"], loaded["vectorizer"], loaded["binarizer"]
+
+
+def pickled_model_sha256(model_dir: str = MODEL_DIR) -> Optional[Dict[str, str]]:
+    """{pickle file name: sha256} of the pickled model in `model_dir`, or None if a pickle is missing."""
+    digests = {}
+    for filename in PICKLED_MODEL_FILES.values():
+        try:
+            with open(os.path.join(model_dir, filename), "rb") as f:
+                digests[filename] = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+    return digests
+
+
+def export_compact_model(model, vectorizer, binarizer, output_dir: str = COMPACT_MODEL_DIR,
+                         source_sha256: Optional[Dict[str, str]] = None) -> str:
+    """
+    Write a fitted TfidfVectorizer + one-vs-rest LogisticRegression model as
+    plain NumPy arrays plus a small JSON of tokenizer settings, so it can be
+    scored without scikit-learn or pickle. `source_sha256` (see
+    pickled_model_sha256) records which pickles the export was made from.
+    """
+    if vectorizer.analyzer != "word" or vectorizer.preprocessor is not None or vectorizer.tokenizer is not None:
+        raise ValueError("Only the default word analyzer can be exported")
+    if vectorizer.strip_accents is not None:
+        raise ValueError("strip_accents is not supported by the compact scorer")
+    if vectorizer.norm not in ("l2", None):
+        raise ValueError(f"Unsupported TF-IDF norm: {vectorizer.norm}")
+
+    n_features = len(vectorizer.vocabulary_)
+    coef = np.zeros((n_features, len(model.estimators_)), dtype=np.float64)
+    intercept = np.zeros(len(model.estimators_), dtype=np.float64)
+    for i, estimator in enumerate(model.estimators_):
+        if list(estimator.classes_) != [0, 1]:
+            raise ValueError(f"Estimator {i} is not a binary 0/1 classifier")
+        coef[:, i] = estimator.coef_[0]
+        intercept[i] = estimator.intercept_[0]
+
+    terms = sorted(vectorizer.vocabulary_)
+    stop_words = vectorizer.get_stop_words()
+    meta = {
+        "lowercase": bool(vectorizer.lowercase),
+        "token_pattern": vectorizer.token_pattern,
+        "ngram_range": list(vectorizer.ngram_range),
+        "stop_words": sorted(stop_words) if stop_words else [],
+        "norm": vectorizer.norm,
+        "use_idf": bool(vectorizer.use_idf),
+        "sublinear_tf": bool(vectorizer.sublinear_tf),
+    }
+    if source_sha256:
+        meta["source_sha256"] = source_sha256
+
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, VOCABULARY_FILE), np.array(terms))
+    np.save(os.path.join(output_dir, COLUMNS_FILE),
+            np.array([vectorizer.vocabulary_[term] for term in terms], dtype=np.int32))
+    idf = vectorizer.idf_ if vectorizer.use_idf else np.ones(n_features)
+    np.save(os.path.join(output_dir, IDF_FILE), np.asarray(idf, dtype=np.float64))
+    np.save(os.path.join(output_dir, COEF_FILE), coef)
+    np.save(os.path.join(output_dir, INTERCEPT_FILE), intercept)
+    np.save(os.path.join(output_dir, CLASSES_FILE), np.array([str(c) for c in binarizer.classes_]))
+    with open(os.path.join(output_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+    logger.info(f"[IntentModel] Exported compact model ({n_features} features, {len(intercept)} classes) to {output_dir}")
+    return output_dir
+
+
+class CompactIntentModel:
+    """
+    Pure-NumPy scorer for an exported intent model.
+
+    Reproduces TfidfVectorizer (word n-grams, raw or sublinear TF, IDF, L2
+    norm) and the per-class logistic regressions. Term lookup is a binary
+    search over the sorted vocabulary array, so with mmap_mode="r" every
+    worker shares one page-cached copy of the arrays instead of holding its
+    own unpickled dictionaries.
+    """
+
+    def __init__(self, vocabulary, columns, idf, coef, intercept, classes, meta):
+        self.vocabulary = vocabulary
+        self.columns = columns
+        self.idf = idf
+        self.coef = coef
+        self.intercept = np.asarray(intercept)
+        self.classes = [str(c) for c in classes]
+        self.lowercase = meta["lowercase"]
+        self.token_pattern = re.compile(meta["token_pattern"])
+        self.ngram_range = tuple(meta["ngram_range"])
+        self.stop_words = frozenset(meta["stop_words"])
+        self.norm = meta["norm"]
+        self.sublinear_tf = meta["sublinear_tf"]
+
+    @classmethod
+    def load(cls, model_dir: str = COMPACT_MODEL_DIR, mmap_mode: Optional[str] = "r") -> "CompactIntentModel":
+        """Load an exported model, memory-mapping the arrays by default."""
+        def array(filename):
+            return np.load(os.path.join(model_dir, filename), mmap_mode=mmap_mode)
+
+        with open(os.path.join(model_dir, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(
+            vocabulary=array(VOCABULARY_FILE),
+            columns=array(COLUMNS_FILE),
+            idf=array(IDF_FILE),
+            coef=array(COEF_FILE),
+            intercept=array(INTERCEPT_FILE),
+            classes=np.load(os.path.join(model_dir, CLASSES_FILE)),
+            meta=meta,
+        )
+
+    @staticmethod
+    def exists(model_dir: str = COMPACT_MODEL_DIR) -> bool:
+        return os.path.exists(os.path.join(model_dir, META_FILE))
+
+    def analyze(self, text: str) -> List[str]:
+        """Tokenize into the vectorizer's stop-word-filtered word n-grams."""
+        if self.lowercase:
+            text = text.lower()
+        tokens = [token for token in self.token_pattern.findall(text) if token not in self.stop_words]
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        terms = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            terms.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def _lookup(self, terms: Sequence[str]) -> np.ndarray:
+        """Feature columns of the terms (-1 for out-of-vocabulary terms)."""
+        if not terms:
+            return np.empty(0, dtype=np.int64)
+        terms = np.array(terms)
+        positions = np.searchsorted(self.vocabulary, terms)
+        positions = np.minimum(positions, len(self.vocabulary) - 1)
+        found = self.vocabulary[positions] == terms
+        return np.where(found, self.columns[positions], -1).astype(np.int64)
+
+    def term_frequencies(self, texts: Iterable[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """(rows, columns, tf) of every distinct known term per text, plus the number of texts."""
+        analyzed = [self.analyze(text or "") for text in texts]
+        n_texts = len(analyzed)
+        columns = self._lookup([term for terms in analyzed for term in terms])
+        rows = np.repeat(np.arange(n_texts), [len(terms) for terms in analyzed])
+        known = columns >= 0
+        rows, columns = rows[known], columns[known]
+
+        # Term counts per (row, column) pair
+        n_features = len(self.idf)
+        pairs, counts = np.unique(rows * n_features + columns, return_counts=True)
+        rows, columns = pairs // n_features, pairs % n_features
+        tf = np.log(counts) + 1.0 if self.sublinear_tf else counts.astype(np.float64)
+        return rows, columns, tf, n_texts
+
+    def tfidf(self, texts: Iterable[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """(rows, columns, weights, n_texts) of the TF-IDF vectors, normalized as configured."""
+        rows, columns, tf, n_texts = self.term_frequencies(texts)
+        weights = tf * self.idf[columns]
+        if self.norm == "l2":
+            norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n_texts))
+            norms[norms == 0] = 1.0
+            weights = weights / norms[rows]
+        return rows, columns, weights, n_texts
+
+    def decision_function(self, texts: Iterable[str]) -> np.ndarray:
+        """Linear scores of shape (n_texts, n_classes)."""
+        rows, columns, weights, n_texts = self.tfidf(texts)
+        scores = np.empty((n_texts, len(self.classes)), dtype=np.float64)
+        contributions = weights[:, None] * self.coef[columns]
+        for i in range(len(self.classes)):
+            scores[:, i] = np.bincount(rows, weights=contributions[:, i], minlength=n_texts)
+        return scores + self.intercept
+
+    def predict_proba(self, texts: Iterable[str]) -> np.ndarray:
+        """Positive-label probability per class, shape (n_texts, n_classes)."""
+        return 1.0 / (1.0 + np.exp(-self.decision_function(texts)))
+
+
+def hash_terms(terms: Sequence[str], n_features: int) -> np.ndarray:
+    """Feature column of each term: CRC32 of its UTF-8 bytes modulo n_features."""
+    return np.fromiter(
+        (zlib.crc32(term.encode("utf-8")) for term in terms), dtype=np.int64, count=len(terms)
+    ) % n_features
+
+
+class HashedIntentModel(CompactIntentModel):
+    """
+    Intent scorer over a hashing-trick featurizer. Terms are hashed to one of
+    a fixed number of columns, so there is no vocabulary to store and the
+    model does not grow with the training data; everything else (n-grams,
+    TF-IDF, per-class logistic regressions) matches CompactIntentModel.
+    """
+
+    def __init__(self, idf, coef, intercept, classes, meta):
+        super().__init__(None, None, idf, coef, intercept, classes, meta)
+        self.n_features = int(meta["n_features"])
+
+    @classmethod
+    def load(cls, model_dir: str = HASHED_MODEL_DIR, mmap_mode: Optional[str] = "r") -> "HashedIntentModel":
+        """Load a hashed model, memory-mapping the arrays by default."""
+        def array(filename):
+            return np.load(os.path.join(model_dir, filename), mmap_mode=mmap_mode)
+
+        with open(os.path.join(model_dir, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(
+            idf=array(IDF_FILE),
+            coef=array(COEF_FILE),
+            intercept=array(INTERCEPT_FILE),
+            classes=np.load(os.path.join(model_dir, CLASSES_FILE)),
+            meta=meta,
+        )
+
+    @staticmethod
+    def exists(model_dir: str = HASHED_MODEL_DIR) -> bool:
+        return os.path.exists(os.path.join(model_dir, META_FILE))
+
+    def _lookup(self, terms: Sequence[str]) -> np.ndarray:
+        if not terms:
+            return np.empty(0, dtype=np.int64)
+        return hash_terms(terms, self.n_features)
+
+
+def export_from_pickles(model_dir: str = MODEL_DIR, output_dir: str = COMPACT_MODEL_DIR) -> str:
+    """Export the pickled model in `model_dir` to the compact format."""
+    model, vectorizer, binarizer = load_pickled_model(model_dir)
+    return export_compact_model(model, vectorizer, binarizer, output_dir, pickled_model_sha256(model_dir))
+
+
+if __name__ == "__main__":
+    # python -m src.services.intent_classification_service [model_dir] [output_dir]
+    export_from_pickles(*sys.argv[1:3])
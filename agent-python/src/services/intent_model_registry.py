@@ -0,0 +1,360 @@
+# src/services/intent_model_registry.py
+
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.config.settings import INTENT_MODEL_FORMAT
+from src.services.intent_classification_service import (
+    COMPACT_MODEL_DIR,
+    HASHED_MODEL_DIR,
+    META_FILE,
+    MODEL_DIR,
+    PICKLED_MODEL_FILES,
+    CompactIntentModel,
+    HashedIntentModel,
+    load_pickled_model,
+    model_files_signature,
+    pickled_model_sha256,
+)
+from src.utils.loggers import get_logger
+
+logger = get_logger("intent_model_registry")
+
+# agent-python/model/versions/<version>/ mirrors the layout of agent-python/model:
+# the pickles and/or a compact/ export, or a hashed/ model from intent_training
+MODEL_VERSIONS_DIR = os.path.join(MODEL_DIR, "versions")
+# Name of the version every worker should serve, shared through the filesystem
+ACTIVE_POINTER_FILE = "ACTIVE"
+# The unversioned model in agent-python/model
+BASE_VERSION = "base"
+
+_VERSION_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+class IntentModel:
+    """
+    One loaded model version. Never mutated after loading, so a request that
+    took a reference keeps scoring with it while another version is swapped in.
+    """
+
+    def __init__(self, version: str, model_dir: str, model_format: str,
+                 compact: Optional[CompactIntentModel] = None, pickled: Optional[tuple] = None):
+        # compact holds either a CompactIntentModel or a HashedIntentModel
+        self.version = version
+        self.model_dir = model_dir
+        self.model_format = model_format
+        self.compact = compact
+        self.pickled = pickled
+        self.files_signature = model_files_signature(model_dir)
+        self.loaded_at = time.time()
+        self.classes = compact.classes if compact is not None else [str(c) for c in pickled[2].classes_]
+
+    def positive_probabilities(self, cleaned_queries: Sequence[str]) -> np.ndarray:
+        """Positive-label probability per class, shape (n_queries, n_classes)."""
+        if self.compact is not None:
+            return self.compact.predict_proba(cleaned_queries)
+        model, vectorizer, _ = self.pickled
+        per_class = model.predict_proba(vectorizer.transform(cleaned_queries))
+        return np.column_stack([
+            probs[:, 1] if probs.shape[1] > 1 else probs[:, 0]
+            for probs in per_class
+        ])
+
+    def describe(self) -> Dict[str, Any]:
+        return {"version": self.version, "format": self.model_format, "loaded_at": self.loaded_at}
+
+
+def compact_matches_pickles(model_dir: str) -> bool:
+    """
+    True unless `model_dir` has pickles that the compact/ export was not made
+    from (a retrained model whose export was not regenerated).
+    """
+    pickles = pickled_model_sha256(model_dir)
+    if pickles is None:
+        return True
+    with open(os.path.join(model_dir, os.path.basename(COMPACT_MODEL_DIR), META_FILE), encoding="utf-8") as f:
+        return json.load(f).get("source_sha256") == pickles
+
+
+def load_model_dir(model_dir: str, version: str, model_format: str = INTENT_MODEL_FORMAT) -> IntentModel:
+    """
+    Load the model stored in `model_dir`. With format "auto" the first of
+    compact/, hashed/ and the pickles that exists is used, except that a
+    compact/ export not made from the pickles next to it is skipped in favour
+    of the pickles; "compact", "hashed" and "pickle" require that format.
+    """
+    compact_dir = os.path.join(model_dir, os.path.basename(COMPACT_MODEL_DIR))
+    hashed_dir = os.path.join(model_dir, os.path.basename(HASHED_MODEL_DIR))
+    if model_format in ("auto", "compact") and CompactIntentModel.exists(compact_dir):
+        if model_format == "compact" or compact_matches_pickles(model_dir):
+            return IntentModel(version, model_dir, "compact", compact=CompactIntentModel.load(compact_dir))
+        logger.warning(
+            f"[IntentModelRegistry] {compact_dir} does not match the pickles in {model_dir}; using the pickles. "
+            f"Re-export it with python -m src.services.intent_classification_service"
+        )
+        return IntentModel(version, model_dir, "pickle", pickled=load_pickled_model(model_dir))
+    if model_format in ("auto", "hashed") and HashedIntentModel.exists(hashed_dir):
+        return IntentModel(version, model_dir, "hashed", compact=HashedIntentModel.load(hashed_dir))
+    if model_format in ("compact", "hashed"):
+        raise FileNotFoundError(f"No {model_format} intent model in {model_dir}")
+    return IntentModel(version, model_dir, "pickle", pickled=load_pickled_model(model_dir))
+
+
+class IntentModelRegistry:
+    """
+    Versioned intent models with background loading, atomic swap and rollback.
+
+    Versions are directories under `versions_dir` (plus BASE_VERSION, the
+    unversioned model in `base_dir`). A new version is loaded while the
+    current one keeps serving, then swapped in with a single reference
+    assignment. The active version is written to the ACTIVE pointer file so
+    other workers follow it via signature()/sync(); the last `max_history`
+    versions stay loaded for an instant rollback.
+    """
+
+    def __init__(
+        self,
+        versions_dir: str = MODEL_VERSIONS_DIR,
+        base_dir: str = MODEL_DIR,
+        model_format: str = INTENT_MODEL_FORMAT,
+        on_swap: Optional[Callable[[IntentModel], Any]] = None,
+        max_history: int = 3,
+    ):
+        self.versions_dir = versions_dir
+        self.base_dir = base_dir
+        self.model_format = model_format
+        self.on_swap = on_swap
+        self.max_history = max_history
+        self._active: Optional[IntentModel] = None
+        self._history: List[IntentModel] = []
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Thread] = {}
+        self.swaps = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def active(self) -> Optional[IntentModel]:
+        return self._active
+
+    @property
+    def active_version(self) -> Optional[str]:
+        active = self._active
+        return active.version if active is not None else None
+
+    def versions(self) -> List[str]:
+        """Available versions: BASE_VERSION (if present) and every version directory."""
+        versions = []
+        if any(os.path.exists(os.path.join(self.base_dir, name)) for name in PICKLED_MODEL_FILES.values()) \
+                or CompactIntentModel.exists(os.path.join(self.base_dir, os.path.basename(COMPACT_MODEL_DIR))) \
+                or HashedIntentModel.exists(os.path.join(self.base_dir, os.path.basename(HASHED_MODEL_DIR))):
+            versions.append(BASE_VERSION)
+        if os.path.isdir(self.versions_dir):
+            versions += sorted(
+                name for name in os.listdir(self.versions_dir)
+                if os.path.isdir(os.path.join(self.versions_dir, name)) and _VERSION_PATTERN.match(name)
+            )
+        return versions
+
+    def version_dir(self, version: str) -> str:
+        """Directory of a version; ValueError for malformed or unknown versions."""
+        if version == BASE_VERSION:
+            return self.base_dir
+        if not _VERSION_PATTERN.match(version or ""):
+            raise ValueError(f"Invalid intent model version: {version!r}")
+        path = os.path.join(self.versions_dir, version)
+        if not os.path.isdir(path):
+            raise ValueError(f"Unknown intent model version: {version}")
+        return path
+
+    def pinned_version(self) -> Optional[str]:
+        """Version named in the ACTIVE pointer file, if any."""
+        try:
+            with open(os.path.join(self.versions_dir, ACTIVE_POINTER_FILE), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _write_pointer(self, version: str):
+        os.makedirs(self.versions_dir, exist_ok=True)
+        pointer = os.path.join(self.versions_dir, ACTIVE_POINTER_FILE)
+        tmp_path = f"{pointer}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(version + "\n")
+        os.replace(tmp_path, pointer)
+
+    def get(self) -> Optional[IntentModel]:
+        """The active model, loading the pinned (or base) version on first use."""
+        active = self._active
+        if active is not None:
+            return active
+        with self._lock:
+            if self._active is None:
+                version = self.pinned_version() or BASE_VERSION
+                try:
+                    self._active = load_model_dir(self.version_dir(version), version, self.model_format)
+                    logger.info(f"[IntentModelRegistry] Loaded intent model {version} ({self._active.model_format})")
+                except Exception as e:
+                    self.last_error = str(e)
+                    logger.error(f"[IntentModelRegistry] Could not load intent model {version}: {e}")
+            return self._active
+
+    def activate(self, version: str, background: bool = False, persist: bool = True):
+        """
+        Load `version` and swap it in. With background=True the load runs in a
+        thread (returned) while the current version keeps serving.
+        """
+        model_dir = self.version_dir(version)
+        if not background:
+            return self._load_and_swap(version, model_dir, persist)
+        with self._lock:
+            thread = self._loading.get(version)
+            if thread is not None and thread.is_alive():
+                return thread
+            thread = threading.Thread(
+                target=self._load_in_background, args=(version, model_dir, persist),
+                name=f"intent-model-{version}", daemon=True,
+            )
+            self._loading[version] = thread
+        thread.start()
+        return thread
+
+    def _load_and_swap(self, version: str, model_dir: str, persist: bool) -> Optional[IntentModel]:
+        start_time = time.perf_counter()
+        try:
+            model = load_model_dir(model_dir, version, self.model_format)
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"[IntentModelRegistry] Loading intent model {version} failed; keeping {self.active_version}: {e}")
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(version, None)
+        logger.info(f"[IntentModelRegistry] Loaded intent model {version} in {time.perf_counter() - start_time:.2f}s")
+        self._swap(model, persist)
+        return model
+
+    def _load_in_background(self, version: str, model_dir: str, persist: bool):
+        try:
+            self._load_and_swap(version, model_dir, persist)
+        except Exception:
+            pass  # Logged in _load_and_swap; the current version keeps serving
+
+    def _swap(self, model: IntentModel, persist: bool, keep_previous: bool = True):
+        with self._lock:
+            previous = self._active
+            self._active = model
+            if previous is not None and keep_previous:
+                self._history.append(previous)
+                del self._history[:-self.max_history]
+            if persist:
+                self._write_pointer(model.version)
+            self.swaps += 1
+            self.last_error = None
+        logger.info(f"[IntentModelRegistry] Active intent model: {previous.version if previous else None} -> {model.version}")
+        if self.on_swap:
+            self.on_swap(model)
+
+    def rollback(self) -> IntentModel:
+        """Swap back to the previously active version (already in memory)."""
+        with self._lock:
+            if not self._history:
+                raise RuntimeError("No previous intent model version to roll back to")
+            previous = self._history.pop()
+        self._swap(previous, persist=True, keep_previous=False)
+        return previous
+
+    def reload(self) -> Optional[IntentModel]:
+        """Reload the active version from disk (files replaced in place)."""
+        version = self.active_version or self.pinned_version() or BASE_VERSION
+        try:
+            return self._load_and_swap(version, self.version_dir(version), persist=False)
+        except Exception:
+            return None
+
+    def signature(self):
+        """Fingerprint of the pointer file and the active version's files."""
+        active = self._active
+        model_dir = active.model_dir if active is not None else self.base_dir
+        return self.pinned_version(), model_files_signature(model_dir)
+
+    def sync(self, background: bool = True):
+        """
+        Follow the pointer file: load a newly pinned version, or reload the
+        active one if its files changed on disk. Called when signature() changes.
+        """
+        active = self._active
+        if active is None:
+            return
+        pinned = self.pinned_version() or active.version
+        try:
+            if pinned != active.version:
+                self.activate(pinned, background=background, persist=False)
+            elif model_files_signature(active.model_dir) != active.files_signature:
+                self.activate(pinned, background=background, persist=False)
+        except ValueError as e:
+            logger.error(f"[IntentModelRegistry] Cannot follow pinned version: {e}")
+
+    def status(self) -> Dict[str, Any]:
+        """Active version and registry state for /health."""
+        active = self._active
+        return {
+            "active_version": active.version if active is not None else None,
+            "format": active.model_format if active is not None else None,
+            "loaded_at": active.loaded_at if active is not None else None,
+            "pinned_version": self.pinned_version(),
+            "previous_versions": [model.version for model in reversed(self._history)],
+            "available_versions": self.versions(),
+            "loading": [version for version, thread in list(self._loading.items()) if thread.is_alive()],
+            "swaps": self.swaps,
+            "last_error": self.last_error,
+        }
+
+
+def publish_version(version: str, source_dir: str = MODEL_DIR, versions_dir: str = MODEL_VERSIONS_DIR) -> str:
+    """Copy the pickles and compact/hashed exports in `source_dir` into a new version directory."""
+    if not _VERSION_PATTERN.match(version) or version == BASE_VERSION:
+        raise ValueError(f"Invalid intent model version: {version!r}")
+    target = os.path.join(versions_dir, version)
+    if os.path.exists(target):
+        raise ValueError(f"Intent model version already exists: {version}")
+    tmp_target = f"{target}.tmp"
+    shutil.rmtree(tmp_target, ignore_errors=True)
+    os.makedirs(tmp_target)
+    for filename in PICKLED_MODEL_FILES.values():
+        path = os.path.join(source_dir, filename)
+        if os.path.exists(path):
+            shutil.copy2(path, tmp_target)
+    for export_dir in (COMPACT_MODEL_DIR, HASHED_MODEL_DIR):
+        name = os.path.basename(export_dir)
+        if os.path.exists(os.path.join(source_dir, name, META_FILE)):
+            shutil.copytree(os.path.join(source_dir, name), os.path.join(tmp_target, name))
+    # Appears complete or not at all
+    os.replace(tmp_target, target)
+    logger.info(f"[IntentModelRegistry] Published intent model version {version} from {source_dir}")
+    return target
+
+
+if __name__ == "__main__":
+    # python -m src.services.intent_model_registry list
+    # python -m src.services.intent_model_registry publish <version> [source_dir]
+    # python -m src.services.intent_model_registry activate <version>
+    command, args = (sys.argv[1], sys.argv[2:]) if len(sys.argv) > 1 else ("list", [])
+    registry = IntentModelRegistry()
+    if command == "publish":
+        print(publish_version(*args[:2]))
+    elif command == "activate":
+        # Validates and loads the version, then pins it; running workers follow the pointer
+        registry.activate(args[0])
+        print(f"Active intent model version: {args[0]}")
+    else:
+        pinned = registry.pinned_version() or BASE_VERSION
+        for version in registry.versions():
+            print(f"{'*' if version == pinned else ' '} {version}")
@@ -0,0 +1,289 @@
+# src/services/intent_training.py
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.services.intent_classification_service import (
+    CLASSES_FILE,
+    COEF_FILE,
+    COMPACT_MODEL_DIR,
+    HASHED_MODEL_DIR,
+    IDF_FILE,
+    INTERCEPT_FILE,
+    META_FILE,
+    MODEL_DIR,
+    PICKLED_MODEL_FILES,
+    HashedIntentModel,
+)
+from src.services.intent_model_registry import MODEL_VERSIONS_DIR, load_model_dir
+from src.utils.loggers import get_logger
+
+logger = get_logger("intent_training")
+
+# Fixed feature space of the hashing featurizer: 2**15 columns x 6 intents of float32
+# is 768 KiB, whatever the size of the training vocabulary
+DEFAULT_N_FEATURES = 2 ** 15
+
+# Tokenizer settings used when no compact export is available to copy them from
+DEFAULT_TOKENIZER = {
+    "lowercase": True,
+    "token_pattern": r"(?u)\b\w\w+\b",
+    "ngram_range": [1, 2],
+    "stop_words": [],
+    "norm": "l2",
+    "use_idf": True,
+    "sublinear_tf": False,
+}
+
+Sample = Tuple[str, List[str]]
+
+
+def load_training_data(path: str) -> List[Sample]:
+    """
+    Read labelled queries from JSON ([{"query", "intents"}]), JSONL (one such
+    object per line) or CSV (query,intents with intents separated by "|").
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            return [
+                (row["query"], [intent.strip() for intent in row["intents"].split("|") if intent.strip()])
+                for row in csv.DictReader(f)
+            ]
+        if path.endswith(".jsonl"):
+            items = [json.loads(line) for line in f if line.strip()]
+        else:
+            items = json.load(f)
+    return [(item["query"], list(item["intents"])) for item in items]
+
+
+def reference_classes(model_dir: str = MODEL_DIR) -> List[str]:
+    """Label set (in order) of multilabel_binarizer.pkl, or of the compact export."""
+    binarizer_path = os.path.join(model_dir, PICKLED_MODEL_FILES["binarizer"])
+    if os.path.exists(binarizer_path):
+        import pickle
+
+        with open(binarizer_path, "rb") as f:
+            return [str(c) for c in pickle.load(f).classes_]
+    return [str(c) for c in np.load(os.path.join(model_dir, os.path.basename(COMPACT_MODEL_DIR), CLASSES_FILE))]
+
+
+def reference_tokenizer(model_dir: str = MODEL_DIR) -> Dict:
+    """Tokenizer settings of the current compact export, so both models see the same n-grams."""
+    meta_path = os.path.join(model_dir, os.path.basename(COMPACT_MODEL_DIR), META_FILE)
+    if not os.path.exists(meta_path):
+        return dict(DEFAULT_TOKENIZER)
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    return {key: meta.get(key, default) for key, default in DEFAULT_TOKENIZER.items()}
+
+
+def train_hashed_model(
+    samples: Sequence[Sample],
+    classes: Sequence[str],
+    n_features: int = DEFAULT_N_FEATURES,
+    C: float = 10.0,
+    tokenizer: Optional[Dict] = None,
+) -> HashedIntentModel:
+    """
+    Fit one logistic regression per intent over hashed TF-IDF features.
+
+    Featurization goes through HashedIntentModel itself, so training and
+    inference cannot disagree on tokens, hashing or weighting. scikit-learn
+    is needed here only; the trained model scores with NumPy.
+    """
+    from scipy.sparse import csr_matrix
+    from sklearn.linear_model import LogisticRegression
+
+    unknown = sorted({intent for _, intents in samples for intent in intents} - set(classes))
+    if unknown:
+        raise ValueError(f"Training labels not in the reference label set: {unknown}")
+
+    meta = dict(tokenizer or reference_tokenizer(), n_features=n_features, hashing="crc32")
+    classes = [str(c) for c in classes]
+    featurizer = HashedIntentModel(
+        idf=np.ones(n_features), coef=np.zeros((n_features, len(classes))),
+        intercept=np.zeros(len(classes)), classes=classes, meta=meta,
+    )
+    queries = [query for query, _ in samples]
+
+    # Smooth IDF over the hashed columns, as TfidfVectorizer computes it
+    rows, columns, _, n_texts = featurizer.term_frequencies(queries)
+    if meta["use_idf"]:
+        document_frequency = np.bincount(columns, minlength=n_features)
+        featurizer.idf = np.log((1 + n_texts) / (1 + document_frequency)) + 1.0
+    rows, columns, weights, _ = featurizer.tfidf(queries)
+    features = csr_matrix((weights, (rows, columns)), shape=(n_texts, n_features))
+
+    coef = np.zeros((n_features, len(classes)), dtype=np.float32)
+    intercept = np.zeros(len(classes), dtype=np.float64)
+    for i, intent in enumerate(classes):
+        labels = np.array([intent in intents for _, intents in samples], dtype=np.int32)
+        if labels.min() == labels.max():
+            # Nothing to separate: a constant, confidently negative (or positive) scorer
+            logger.warning(f"[IntentTraining] Every sample is {'positive' if labels[0] else 'negative'} for '{intent}'")
+            intercept[i] = 10.0 if labels[0] else -10.0
+            continue
+        estimator = LogisticRegression(C=C, solver="liblinear")
+        estimator.fit(features, labels)
+        coef[:, i] = estimator.coef_[0]
+        intercept[i] = estimator.intercept_[0]
+
+    return HashedIntentModel(
+        idf=featurizer.idf.astype(np.float32), coef=coef, intercept=intercept, classes=classes, meta=meta,
+    )
+
+
+def save_hashed_model(model: HashedIntentModel, output_dir: str) -> str:
+    """Write the model arrays and settings; the directory appears complete or not at all."""
+    tmp_dir = f"{output_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    np.save(os.path.join(tmp_dir, IDF_FILE), np.asarray(model.idf, dtype=np.float32))
+    np.save(os.path.join(tmp_dir, COEF_FILE), np.asarray(model.coef, dtype=np.float32))
+    np.save(os.path.join(tmp_dir, INTERCEPT_FILE), np.asarray(model.intercept, dtype=np.float64))
+    np.save(os.path.join(tmp_dir, CLASSES_FILE), np.array(model.classes))
+    meta = {
+        "lowercase": model.lowercase,
+        "token_pattern": model.token_pattern.pattern,
+        "ngram_range": list(model.ngram_range),
+        "stop_words": sorted(model.stop_words),
+        "norm": model.norm,
+        "use_idf": True,
+        "sublinear_tf": model.sublinear_tf,
+        "n_features": model.n_features,
+        "hashing": "crc32",
+    }
+    with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.makedirs(os.path.dirname(output_dir), exist_ok=True)
+    os.replace(tmp_dir, output_dir)
+    logger.info(f"[IntentTraining] Saved hashed model ({model.n_features} features, {len(model.classes)} classes) to {output_dir}")
+    return output_dir
+
+
+def artifact_bytes(model_dir: str, model_format: str) -> int:
+    """On-disk size of the files a format loads."""
+    if model_format == "pickle":
+        paths = [os.path.join(model_dir, name) for name in PICKLED_MODEL_FILES.values()]
+    else:
+        export_dir = os.path.join(model_dir, os.path.basename(COMPACT_MODEL_DIR if model_format == "compact" else HASHED_MODEL_DIR))
+        paths = [os.path.join(export_dir, name) for name in os.listdir(export_dir)]
+    return sum(os.path.getsize(path) for path in paths if os.path.isfile(path))
+
+
+def compare_artifacts(
+    artifacts: Dict[str, Tuple[str, str]],
+    eval_samples: Sequence[Sample],
+    loads: int = 5,
+    repeat: int = 20,
+    threshold: float = 0.2,
+) -> Dict:
+    """
+    Size, load time, load-time heap allocation, inference speed and accuracy
+    of each artifact, given as {name: (model_dir, format)}.
+    """
+    from src.benchmarks.intent_benchmark import accuracy_report, latency_stats
+
+    queries = [query for query, _ in eval_samples]
+    gold = [intents for _, intents in eval_samples]
+    report = {}
+    for name, (model_dir, model_format) in artifacts.items():
+        load_timings = []
+        for _ in range(loads):
+            tracemalloc.start()
+            start_time = time.perf_counter()
+            model = load_model_dir(model_dir, name, model_format)
+            load_timings.append(time.perf_counter() - start_time)
+            _, heap_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        # Score as the classifier does: threshold with a best-intent fallback
+        model.positive_probabilities(queries[:1])
+        timings = []
+        for _ in range(repeat):
+            for query in queries:
+                start_time = time.perf_counter()
+                model.positive_probabilities([query])
+                timings.append(time.perf_counter() - start_time)
+        start_time = time.perf_counter()
+        probs = model.positive_probabilities(queries)
+        batch_seconds = time.perf_counter() - start_time
+        classes = np.asarray(model.classes)
+        predicted = [
+            classes[row > threshold].tolist() or [str(classes[int(np.argmax(row))])]
+            for row in probs
+        ]
+
+        report[name] = {
+            "format": model_format,
+            "bytes": artifact_bytes(model_dir, model_format),
+            "load_seconds": round(statistics.median(load_timings), 5),
+            "load_heap_bytes": heap_peak,
+            "latency": latency_stats(timings),
+            "batch_qps": round(len(queries) / batch_seconds, 1) if batch_seconds else None,
+            "accuracy": accuracy_report(gold, predicted, model.classes),
+        }
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Train a hashing-trick intent model and compare it with the current artifacts")
+    parser.add_argument("--data", required=True, help="Labelled training queries (.json, .jsonl or .csv)")
+    parser.add_argument("--version", required=True, help="Version name; written to model/versions/<version>/hashed")
+    parser.add_argument("--eval", help="Labelled evaluation queries (default: the intent benchmark corpus)")
+    parser.add_argument("--n-features", type=int, default=DEFAULT_N_FEATURES, help="Hashed feature columns (default: 32768)")
+    parser.add_argument("--C", type=float, default=10.0, help="Inverse regularization strength (default: 10)")
+    parser.add_argument("--report", help="Write the comparison report (JSON) to this file")
+    args = parser.parse_args()
+
+    from src.benchmarks.intent_benchmark import load_corpus
+
+    samples = load_training_data(args.data)
+    start_time = time.perf_counter()
+    model = train_hashed_model(samples, reference_classes(), args.n_features, args.C)
+    training_seconds = time.perf_counter() - start_time
+    version_dir = os.path.join(MODEL_VERSIONS_DIR, args.version)
+    save_hashed_model(model, os.path.join(version_dir, os.path.basename(HASHED_MODEL_DIR)))
+
+    eval_samples = load_training_data(args.eval) if args.eval else load_corpus()
+    artifacts = {"hashed": (version_dir, "hashed")}
+    if os.path.exists(os.path.join(MODEL_DIR, PICKLED_MODEL_FILES["model"])):
+        artifacts["pickle"] = (MODEL_DIR, "pickle")
+    if os.path.exists(os.path.join(COMPACT_MODEL_DIR, META_FILE)):
+        artifacts["compact"] = (MODEL_DIR, "compact")
+    report = {
+        "version": args.version,
+        "training_samples": len(samples),
+        "training_seconds": round(training_seconds, 3),
+        "eval_samples": len(eval_samples),
+        "artifacts": compare_artifacts(artifacts, eval_samples),
+    }
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(f"{'artifact':<10}{'KiB':>10}{'load ms':>10}{'heap KiB':>10}{'p50 ms':>10}{'batch q/s':>12}{'micro F1':>10}")
+    for name, stats in report["artifacts"].items():
+        print(
+            f"{name:<10}{stats['bytes'] / 1024:>10.0f}{stats['load_seconds'] * 1000:>10.2f}"
+            f"{stats['load_heap_bytes'] / 1024:>10.0f}{stats['latency']['p50_ms']:>10.3f}"
+            f"{stats['batch_qps']:>12.0f}{stats['accuracy']['micro_f1']:>10.3f}"
+        )
+    print(f"Activate with: python -m src.services.intent_model_registry activate {args.version}")
+    return 0
+
+
+if __name__ == "__main__":
+    # python -m src.services.intent_training --data train.json --version 2025-03-01 --report report.json
+    sys.exit(main())
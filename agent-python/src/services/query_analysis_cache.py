@@ -0,0 +1,106 @@
+# src/services/query_analysis_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from src.config.settings import (
+    QUERY_ANALYSIS_CACHE_CHECK_SECONDS,
+    QUERY_ANALYSIS_CACHE_MAX_ENTRIES,
+)
+from src.utils.loggers import get_logger
+
+logger = get_logger("query_analysis_cache")
+
+
+class QueryAnalysisCache:
+    """
+    Thread-safe LRU of per-query analysis results (intents, confidence,
+    entities) keyed on the normalized query.
+
+    `signature` returns a fingerprint of the model files; it is polled at
+    most every `check_interval` seconds and any change clears the cache and
+    calls `on_change` (which reloads the model) before the next lookup.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = QUERY_ANALYSIS_CACHE_MAX_ENTRIES,
+        signature: Optional[Callable[[], Hashable]] = None,
+        on_change: Optional[Callable[[], Any]] = None,
+        check_interval: float = QUERY_ANALYSIS_CACHE_CHECK_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.signature = signature
+        self.on_change = on_change
+        self.check_interval = check_interval
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._signature = signature() if signature else None
+        self._checked_at = time.monotonic()
+        # Bumped on every clear so results computed before it are not stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def check_model(self) -> bool:
+        """Clear the cache if the model files changed. Returns True on a change."""
+        if self.signature is None or time.monotonic() - self._checked_at < self.check_interval:
+            return False
+        with self._lock:
+            self._checked_at = time.monotonic()
+            current = self.signature()
+            if current == self._signature:
+                return False
+            self._signature = current
+        logger.info("[QueryAnalysisCache] Model files changed; reloading model and clearing cache")
+        if self.on_change:
+            self.on_change()
+        self.clear()
+        self.invalidations += 1
+        return True
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached analysis, or None on a miss."""
+        self.check_model()
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        """Store an analysis unless the cache was cleared since `generation`."""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "model_invalidations": self.invalidations,
+        }
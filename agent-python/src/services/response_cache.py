@@ -0,0 +1,161 @@
+# src/services/response_cache.py
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from src.config.settings import (
+    RESPONSE_CACHE_DEFAULT_TTL_SECONDS,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTL_SECONDS,
+)
+from src.utils.loggers import get_logger
+from src.utils.query_keys import intent_key, normalize_query, request_key
+
+logger = get_logger("response_cache")
+
+# (normalized query, normalized location, language, sorted intents)
+CacheKey = Tuple[str, str, str, Tuple[str, ...]]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    size: int
+
+
+def response_cache_key(query: Optional[str], location: Optional[str], language: Optional[str], intents: Iterable[str]) -> CacheKey:
+    """Canonical cache key for a workflow response."""
+    return request_key(query, location, language) + (intent_key(intents),)
+
+
+def is_cacheable(result: Dict[str, Any]) -> bool:
+    """
+    Only complete answers are cached: an LLM decision (not the rule-based
+    fallback) and no failed, degraded (placeholder data after an upstream
+    failure) or timed-out agent.
+    """
+    if not result or not result.get("decision"):
+        return False
+    decision = result["decision"]
+    if decision.get("missing_sections") or decision.get("fallback_used"):
+        return False
+    return not any(
+        isinstance(agent_result, dict) and (agent_result.get("error") or agent_result.get("degraded"))
+        for agent_result in (result.get("agent_results") or {}).values()
+    )
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of full workflow responses.
+
+    Entries expire after an intent-dependent TTL (the shortest TTL among the
+    query's intents), and the cache is bounded both by entry count and by the
+    approximate serialized size of the stored responses.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        ttl_by_intent: Optional[Dict[str, float]] = None,
+        default_ttl: float = RESPONSE_CACHE_DEFAULT_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_by_intent = RESPONSE_CACHE_TTL_SECONDS if ttl_by_intent is None else ttl_by_intent
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def ttl_for(self, intents: Iterable[str]) -> float:
+        """TTL for a response: the shortest TTL among its intents."""
+        ttls = [self.ttl_by_intent.get(intent, self.default_ttl) for intent in intents]
+        return min(ttls) if ttls else self.default_ttl
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """Return the cached response, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: CacheKey, value: Any, ttl: Optional[float] = None) -> bool:
+        """Store a response. Returns False when it is too large to cache."""
+        ttl = self.ttl_for(key[3]) if ttl is None else ttl
+        size = len(json.dumps(value, default=str, ensure_ascii=False).encode("utf-8"))
+        if ttl <= 0 or size > self.max_bytes:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, time.monotonic() + ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def invalidate(self, query: Optional[str] = None, location: Optional[str] = None, intent: Optional[str] = None) -> int:
+        """
+        Drop entries matching every given filter (all entries when none is
+        given), e.g. invalidate(intent="market") after a mandi price refresh.
+        Returns the number of entries removed.
+        """
+        query = normalize_query(query) if query is not None else None
+        location = normalize_query(location) if location is not None else None
+        with self._lock:
+            matching = [
+                key for key in self._entries
+                if (query is None or key[0] == query)
+                and (location is None or key[1] == location)
+                and (intent is None or intent in key[3])
+            ]
+            for key in matching:
+                self._remove(key)
+        if matching:
+            logger.info(f"[ResponseCache] Invalidated {len(matching)} entries")
+        return len(matching)
+
+    def clear(self) -> int:
+        """Drop every entry."""
+        return self.invalidate()
+
+    def _remove(self, key: CacheKey):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and memory usage for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
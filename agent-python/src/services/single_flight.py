@@ -0,0 +1,83 @@
+# src/services/single_flight.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from src.utils.loggers import get_logger
+
+logger = get_logger("single_flight")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller (leader)
+    runs the work, later callers (joiners) await the same in-flight result.
+    Exceptions propagate to every caller. If the leader is cancelled (e.g.
+    its client disconnected), its joiners start over: one of them becomes
+    the new leader and the rest join it. Nothing is kept once the call
+    finishes, so this is not a cache.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.requests = 0
+        self.executions = 0
+        self.joins = 0
+        self.retries = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run `fn` once per key among concurrent callers.
+
+        Returns:
+            (result, shared) where shared is True when this caller joined
+            another caller's execution
+        """
+        self.requests += 1
+        while True:
+            future = self._in_flight.get(key)
+            if future is None:
+                return await self._lead(key, fn), False
+
+            self.joins += 1
+            logger.info(f"[SingleFlight] Joining in-flight execution ({len(self._in_flight)} in flight)")
+            try:
+                # shield: a joiner giving up must not cancel the leader's work
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # Only the leader was cancelled, not this caller: run it again
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    self.retries += 1
+                    logger.info("[SingleFlight] Leader was cancelled; retrying the execution")
+                    continue
+                raise
+
+    async def _lead(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.executions += 1
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve the exception so an unjoined future does not log a warning
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit (join) counts for monitoring."""
+        return {
+            "requests": self.requests,
+            "executions": self.executions,
+            "joins": self.joins,
+            "retries": self.retries,
+            "in_flight": len(self._in_flight),
+            "join_rate": round(self.joins / self.requests, 3) if self.requests else 0.0,
+        }
@@ -0,0 +1,97 @@
+# src/services/user_location_cache.py
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.config.settings import DEFAULT_LOCATION, USER_LOCATION_CACHE_MAX_ENTRIES
+from src.utils.loggers import get_logger
+
+logger = get_logger("user_location_cache")
+
+# Where a resolved location came from, in priority order
+QUERY_SOURCE = "query"
+REQUEST_SOURCE = "request"
+USER_CACHE_SOURCE = "user_cache"
+DEFAULT_SOURCE = "default"
+
+
+class UserLocationCache:
+    """
+    Thread-safe LRU of the last known location of each user.
+
+    resolve() picks the location for one request: a place named in the query,
+    then the location sent by the client, then the user's last known location,
+    then DEFAULT_LOCATION. It has no side effects, so the server can compute
+    the same location for its cache keys that the workflow will use.
+    """
+
+    def __init__(self, max_entries: int = USER_LOCATION_CACHE_MAX_ENTRIES, default: str = DEFAULT_LOCATION):
+        self.max_entries = max_entries
+        self.default = default
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: Optional[str]) -> Optional[str]:
+        """Last known location of the user, or None."""
+        if not user_id:
+            return None
+        with self._lock:
+            location = self._entries.get(user_id)
+            if location is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return location
+
+    def put(self, user_id: Optional[str], location: Optional[str]):
+        """Remember the user's location."""
+        if not user_id or not location:
+            return
+        with self._lock:
+            self._entries[user_id] = location
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def resolve(
+        self,
+        user_id: Optional[str],
+        requested: Optional[str] = None,
+        query_location: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        """Return (location, source) for one request."""
+        if query_location:
+            return query_location, QUERY_SOURCE
+        if requested:
+            return requested, REQUEST_SOURCE
+        cached = self.get(user_id)
+        if cached:
+            return cached, USER_CACHE_SOURCE
+        return self.default, DEFAULT_SOURCE
+
+    def clear(self):
+        """Forget every user's location."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry and hit/miss counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+# Process-wide cache shared by the workflow and the server's cache keys
+user_locations = UserLocationCache()
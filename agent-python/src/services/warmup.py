@@ -0,0 +1,154 @@
+# src/services/warmup.py
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.config.settings import WARMUP_RETRY_MAX_SECONDS, WARMUP_RETRY_SECONDS
+from src.utils.loggers import get_logger
+
+logger = get_logger("warmup")
+
+WarmupStep = Tuple[str, Callable[[], Any]]
+
+
+def warm_intent_model():
+    """Load the intent model and score one query so its arrays are paged in."""
+    from src.graph_arc.core_nodes.query_understanding_node import get_intents_batch, load_intent_model
+
+    if not load_intent_model():
+        raise RuntimeError("Intent model could not be loaded")
+    get_intents_batch(["will it rain tomorrow"])
+
+
+def warm_graph():
+    """Import (and thereby compile) the workflow graph."""
+    from src.graph_arc.graph import workflow
+
+    workflow.get_graph()
+
+
+def warm_soil_table():
+    """Index soil.csv and precompute every district's soil analysis."""
+    from src.data.soil_plugins import get_soil_analysis_table
+
+    get_soil_analysis_table()
+
+
+def warm_gazetteer():
+    """Compile the entity/keyword automaton."""
+    from src.data.gazetteer import get_gazetteer
+
+    get_gazetteer()
+
+
+def warm_http_clients():
+    """Create the pooled synchronous HTTP session."""
+    from src.utils.http_client import get_sync_session
+
+    get_sync_session()
+
+
+DEFAULT_STEPS: List[WarmupStep] = [
+    ("intent_model", warm_intent_model),
+    ("graph", warm_graph),
+    ("soil_table", warm_soil_table),
+    ("gazetteer", warm_gazetteer),
+    ("http_clients", warm_http_clients),
+]
+
+
+class Warmup:
+    """
+    Runs the startup warmup steps once per process.
+
+    Concurrent callers of run() block until the single warmup finishes.
+    The worker is ready only when every step succeeded; step timings and
+    errors are kept for the readiness endpoint. Failed steps are not
+    final: once their backoff (retry_seconds, doubling per failed attempt
+    up to max_retry_seconds) has elapsed, the next run() or poll() runs
+    just those steps again.
+    """
+
+    def __init__(
+        self,
+        steps: Optional[List[WarmupStep]] = None,
+        retry_seconds: float = WARMUP_RETRY_SECONDS,
+        max_retry_seconds: float = WARMUP_RETRY_MAX_SECONDS,
+    ):
+        self.steps = DEFAULT_STEPS if steps is None else steps
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.status = "pending"
+        self.step_seconds: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.warmup_seconds: Optional[float] = None
+        self.attempts = 0
+        self._next_retry_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._retry_lock = threading.Lock()
+        self._retry_thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def retry_due(self) -> bool:
+        """True when the warmup failed and its backoff has elapsed."""
+        return self.status == "failed" and time.monotonic() >= self._next_retry_at
+
+    def run(self) -> Dict[str, Any]:
+        """Run the steps that have not succeeded yet, if due; return the report."""
+        with self._lock:
+            if self.ready or (self.status == "failed" and not self.retry_due()):
+                return self.report()
+            steps = [(name, step) for name, step in self.steps if name in self.errors] if self.errors else self.steps
+            self.status = "warming"
+            start_time = time.perf_counter()
+            for name, step in steps:
+                step_start = time.perf_counter()
+                try:
+                    step()
+                    self.errors.pop(name, None)
+                except Exception as e:
+                    logger.error(f"[Warmup] Step '{name}' failed: {e}")
+                    self.errors[name] = str(e)
+                self.step_seconds[name] = round(time.perf_counter() - step_start, 4)
+            self.attempts += 1
+            self.warmup_seconds = round((self.warmup_seconds or 0.0) + time.perf_counter() - start_time, 4)
+            if self.errors:
+                self.status = "failed"
+                backoff = min(self.retry_seconds * 2 ** (self.attempts - 1), self.max_retry_seconds)
+                self._next_retry_at = time.monotonic() + backoff
+                logger.info(f"[Warmup] failed after {self.warmup_seconds}s; retrying {sorted(self.errors)} in {backoff}s")
+            else:
+                self.status = "ready"
+                logger.info(f"[Warmup] ready after {self.warmup_seconds}s: {self.step_seconds}")
+            return self.report()
+
+    def poll(self) -> Dict[str, Any]:
+        """
+        Readiness report for probes. A failed warmup whose backoff has elapsed
+        is retried in a background thread, so the probe itself never blocks.
+        """
+        if self.retry_due():
+            with self._retry_lock:
+                if self._retry_thread is None or not self._retry_thread.is_alive():
+                    self._retry_thread = threading.Thread(target=self.run, name="warmup-retry", daemon=True)
+                    self._retry_thread.start()
+        return self.report()
+
+    def report(self) -> Dict[str, Any]:
+        """Readiness payload: status, total and per-step warmup time, errors."""
+        return {
+            "status": self.status,
+            "ready": self.ready,
+            "warmup_seconds": self.warmup_seconds,
+            "steps": dict(self.step_seconds),
+            "errors": dict(self.errors),
+            "attempts": self.attempts,
+        }
+
+
+# Process-wide warmup shared by the FastAPI and Flask entry points
+startup_warmup = Warmup()
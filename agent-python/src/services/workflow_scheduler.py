@@ -0,0 +1,150 @@
+# src/services/workflow_scheduler.py
+
+import asyncio
+import math
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+from src.config.settings import (
+    WORKFLOW_MAX_CONCURRENCY,
+    WORKFLOW_MAX_QUEUE,
+    WORKFLOW_QUEUE_TIMEOUT,
+)
+from src.utils.loggers import get_logger
+
+logger = get_logger("workflow_scheduler")
+
+
+class SchedulerBusyError(Exception):
+    """Raised when the scheduler cannot admit a workflow run."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class WorkflowScheduler:
+    """
+    Admission control in front of the compiled workflow.
+
+    At most `max_concurrency` runs execute at once and at most `max_queue`
+    requests wait for a slot. Requests arriving when the queue is full, or
+    that wait longer than `queue_timeout` seconds, are rejected with
+    SchedulerBusyError carrying a retry-after hint.
+    """
+
+    def __init__(
+        self,
+        workflow,
+        max_concurrency: int = WORKFLOW_MAX_CONCURRENCY,
+        max_queue: int = WORKFLOW_MAX_QUEUE,
+        queue_timeout: float = WORKFLOW_QUEUE_TIMEOUT,
+    ):
+        self.workflow = workflow
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.active = 0
+        self.queued = 0
+        self.peak_queue_depth = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.completed = 0
+        self.failed = 0
+        self._total_run_time = 0.0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the slot semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def retry_after(self) -> int:
+        """Estimate in seconds until a new request would be admitted."""
+        average_run_time = self._total_run_time / self.completed if self.completed else 1.0
+        waves = (self.queued + 1) / self.max_concurrency
+        return max(1, math.ceil(average_run_time * waves))
+
+    def _reject(self, reason: str):
+        self.rejected += 1
+        retry_after = self.retry_after()
+        logger.warning(f"[WorkflowScheduler] Rejecting run ({reason}); retry after {retry_after}s")
+        raise SchedulerBusyError(f"Server busy: {reason}", retry_after)
+
+    async def _acquire(self):
+        """Take an execution slot, waiting in the bounded queue if needed."""
+        semaphore = self._get_semaphore()
+        if self.active < self.max_concurrency and self.queued == 0:
+            await semaphore.acquire()
+            return
+
+        if self.queued >= self.max_queue:
+            self._reject(f"queue full ({self.queued}/{self.max_queue})")
+
+        self.queued += 1
+        self.peak_queue_depth = max(self.peak_queue_depth, self.queued)
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            self._reject(f"waited more than {self.queue_timeout}s for a slot")
+        finally:
+            self.queued -= 1
+
+    async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the workflow once a slot is free."""
+        await self._acquire()
+        self.admitted += 1
+        self.active += 1
+        start_time = time.perf_counter()
+        try:
+            result = await self.workflow.ainvoke(state)
+            self.completed += 1
+            self._total_run_time += time.perf_counter() - start_time
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.active -= 1
+            self._get_semaphore().release()
+
+    async def stream(self, state: Dict[str, Any], **kwargs) -> AsyncIterator[Any]:
+        """Stream workflow chunks (workflow.astream) while holding a slot."""
+        await self._acquire()
+        self.admitted += 1
+        self.active += 1
+        start_time = time.perf_counter()
+        try:
+            async for chunk in self.workflow.astream(state, **kwargs):
+                yield chunk
+            self.completed += 1
+            self._total_run_time += time.perf_counter() - start_time
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.active -= 1
+            self._get_semaphore().release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and admission counters for monitoring."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "active": self.active,
+            "queue_depth": self.queued,
+            "peak_queue_depth": self.peak_queue_depth,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "completed": self.completed,
+            "failed": self.failed,
+            "average_run_time": round(self._total_run_time / self.completed, 3) if self.completed else None,
+        }
@@ -0,0 +1,76 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from src.graph_arc import router
+from src.graph_arc.graph import build_agent_stage
+from src.graph_arc.router import aconditional_router
+
+
+def _blocking_agent(name, delay):
+    def agent(state):
+        time.sleep(delay)
+        return {"agent": name}
+    return agent
+
+
+def _async_agent(name, delay):
+    async def agent(state):
+        await asyncio.sleep(delay)
+        return {"agent": name}
+    return agent
+
+
+class TestAsyncWorkflow(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the async request path"""
+
+    def setUp(self):
+        self.registry = {
+            "weather": ("weather", _blocking_agent("weather", 0.3)),
+            "soil": ("soil_crop_recommendation", _blocking_agent("soil", 0.3)),
+            "market": ("market_price", _blocking_agent("market", 0.3)),
+        }
+
+    async def test_aconditional_router_runs_agents_concurrently(self):
+        """Sync agents without an async variant should be offloaded, not serialized"""
+        state = {"raw_query": "weather soil price", "intents": ["weather", "soil", "market"]}
+
+        with patch.dict(router.AGENT_REGISTRY, self.registry):
+            start_time = time.perf_counter()
+            result = await aconditional_router(state)
+            elapsed = time.perf_counter() - start_time
+
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(result["agent_results"]["soil_crop_recommendation"], {"agent": "soil"})
+
+    async def test_async_variant_is_awaited(self):
+        """Agents with an async variant should be awaited on the event loop"""
+        weather_agent = _blocking_agent("weather-sync", 0.0)
+        variants = {weather_agent: _async_agent("weather-async", 0.1)}
+        registry = {"weather": ("weather", weather_agent)}
+        state = {"raw_query": "weather", "intents": ["weather"]}
+
+        with patch.dict(router.ASYNC_AGENT_VARIANTS, variants, clear=True):
+            result = await aconditional_router(state, registry=registry)
+
+        self.assertEqual(result["agent_results"]["weather"], {"agent": "weather-async"})
+
+    async def test_parallel_stage_ainvoke(self):
+        """The native parallel agent stage should support ainvoke"""
+        stage = build_agent_stage(parallel_agents=True, registry=self.registry)
+        state = {"raw_query": "weather soil price", "intents": ["weather", "soil", "market"]}
+
+        start_time = time.perf_counter()
+        result = await stage.ainvoke(state)
+        elapsed = time.perf_counter() - start_time
+
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(
+            set(result["agent_results"].keys()),
+            {"weather", "soil_crop_recommendation", "market_price"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.graph_arc.core_nodes.query_understanding_node import clean_text
+from src.services.intent_classification_service import (
+    MODEL_DIR,
+    PICKLED_MODEL_FILES,
+    CompactIntentModel,
+    export_compact_model,
+    export_from_pickles,
+    load_pickled_model,
+)
+from src.services.intent_model_registry import load_model_dir
+
+QUERIES = [
+    "Will it rain tomorrow in Pune?",
+    "wheat fertilizer price in pune",
+    "urea urea for cotton",
+    "PM kisan scheme eligibility",
+    "my tomato leaves have yellow spots",
+    "",
+    "zzz qqq",
+]
+
+PICKLES_AVAILABLE = all(os.path.exists(os.path.join(MODEL_DIR, name)) for name in PICKLED_MODEL_FILES.values())
+
+
+@unittest.skipUnless(PICKLES_AVAILABLE, "pickled intent model not available")
+class TestCompactIntentModel(unittest.TestCase):
+    """Test cases for the pickle-free intent model export and scorer"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.model, cls.vectorizer, cls.binarizer = load_pickled_model()
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        export_compact_model(cls.model, cls.vectorizer, cls.binarizer, cls.tmpdir.name)
+        cls.compact = CompactIntentModel.load(cls.tmpdir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.compact = None
+        cls.tmpdir.cleanup()
+
+    def test_probabilities_match_pickled_model(self):
+        cleaned = [clean_text(query) for query in QUERIES]
+        per_class = self.model.predict_proba(self.vectorizer.transform(cleaned))
+        expected = np.column_stack([probs[:, 1] for probs in per_class])
+
+        np.testing.assert_allclose(self.compact.predict_proba(cleaned), expected, atol=1e-12)
+
+    def test_classes_follow_binarizer_order(self):
+        self.assertEqual(self.compact.classes, list(self.binarizer.classes_))
+
+    def test_analyzer_matches_vectorizer(self):
+        analyzer = self.vectorizer.build_analyzer()
+        for query in QUERIES:
+            self.assertEqual(self.compact.analyze(clean_text(query)), analyzer(clean_text(query)))
+
+    def test_arrays_are_memory_mapped(self):
+        self.assertIsInstance(self.compact.coef, np.memmap)
+        self.assertIsInstance(self.compact.vocabulary, np.memmap)
+
+    def test_stale_export_falls_back_to_pickles(self):
+        model_dir = os.path.join(self.tmpdir.name, "model")
+        os.makedirs(model_dir)
+        for name in PICKLED_MODEL_FILES.values():
+            shutil.copy2(os.path.join(MODEL_DIR, name), model_dir)
+        export_from_pickles(model_dir, os.path.join(model_dir, "compact"))
+        self.assertEqual(load_model_dir(model_dir, "current", "auto").model_format, "compact")
+
+        # Retrained pickles, export not regenerated
+        with open(os.path.join(model_dir, PICKLED_MODEL_FILES["binarizer"]), "ab") as f:
+            f.write(b"\n")
+
+        self.assertEqual(load_model_dir(model_dir, "stale", "auto").model_format, "pickle")
+        self.assertEqual(load_model_dir(model_dir, "pinned", "compact").model_format, "compact")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.graph_arc.core_nodes.decision_support_node import aggregate_decisions
+from src.graph_arc.deadline import assign_deadline, missing_sections, stage_timeout
+from src.graph_arc.graph import build_agent_stage
+from src.config.settings import WORKFLOW_MAX_CONCURRENCY
+from src.graph_arc import router
+from src.graph_arc.router import AGENT_REGISTRY, conditional_router
+
+
+def _agent(name, delay):
+    def agent(state):
+        time.sleep(delay)
+        return {"agent": name}
+    return agent
+
+
+REGISTRY = {
+    "weather": ("weather", _agent("weather", 0.05)),
+    "market": ("market_price", _agent("market", 2.0)),
+}
+
+
+def _state_with_budget(seconds):
+    state = {"raw_query": "weather and price", "intents": ["weather", "market"], "deadline_seconds": seconds}
+    return assign_deadline(state)
+
+
+class TestDeadlineBudgets(unittest.TestCase):
+    """Test cases for per-request deadline budgets"""
+
+    def test_device_type_sets_budget(self):
+        """SMS users should get a tighter budget than web users"""
+        sms = assign_deadline({"device_type": "sms"})
+        web = assign_deadline({"device_type": "web"})
+
+        self.assertLess(sms["deadline_seconds"], web["deadline_seconds"])
+        self.assertLessEqual(stage_timeout(sms, "agents"), sms["deadline_seconds"])
+
+    def test_request_budget_overrides_device(self):
+        """An explicit deadline_seconds should win over the device default"""
+        state = assign_deadline({"device_type": "web", "deadline_seconds": 2})
+        self.assertEqual(state["deadline_seconds"], 2.0)
+
+    def test_router_cuts_off_slow_agent(self):
+        """The router should return on time and mark the overrunning agent"""
+        start_time = time.perf_counter()
+        result = conditional_router(_state_with_budget(1.0), registry=REGISTRY)
+        elapsed = time.perf_counter() - start_time
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(result["agent_results"]["weather"], {"agent": "weather"})
+        self.assertEqual(missing_sections(result["agent_results"]), ["market_price"])
+
+    def test_agents_do_not_time_out_queued_under_full_load(self):
+        """Every admitted run's agents should start at once instead of queueing past their budget"""
+        registry = {intent: (result_key, _agent(result_key, 0.4)) for intent, (result_key, _) in AGENT_REGISTRY.items()}
+        state = assign_deadline({"raw_query": "q", "intents": list(registry), "deadline_seconds": 2.0})
+
+        with ThreadPoolExecutor(max_workers=WORKFLOW_MAX_CONCURRENCY) as runs:
+            results = list(runs.map(lambda _: conditional_router(dict(state), registry=registry), range(WORKFLOW_MAX_CONCURRENCY)))
+
+        for result in results:
+            self.assertEqual(missing_sections(result["agent_results"]), [])
+
+    def test_parallel_stage_cuts_off_slow_agent(self):
+        """Native agent branches should also respect the agent budget"""
+        stage = build_agent_stage(parallel_agents=True, registry=REGISTRY)
+
+        start_time = time.perf_counter()
+        result = stage.invoke(_state_with_budget(1.0))
+        elapsed = time.perf_counter() - start_time
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(missing_sections(result["agent_results"]), ["market_price"])
+
+    def test_parallel_stage_does_not_queue_behind_router_pool(self):
+        """Branch agents should run even while the router's pool is saturated"""
+        release = threading.Event()
+        blockers = [router._agent_executor.submit(release.wait, 5) for _ in range(router.AGENT_POOL_SIZE)]
+        try:
+            stage = build_agent_stage(parallel_agents=True, registry={"weather": REGISTRY["weather"]})
+            result = stage.invoke(assign_deadline({"raw_query": "q", "intents": ["weather"], "deadline_seconds": 1.0}))
+        finally:
+            release.set()
+            for blocker in blockers:
+                blocker.result()
+
+        self.assertEqual(result["agent_results"], {"weather": {"agent": "weather"}})
+
+    def test_async_stage_cuts_off_slow_agent(self):
+        """The async path should cut off overrunning agents as well"""
+        stage = build_agent_stage(parallel_agents=False, registry=REGISTRY)
+
+        start_time = time.perf_counter()
+        result = asyncio.run(stage.ainvoke(_state_with_budget(1.0)))
+        elapsed = time.perf_counter() - start_time
+
+        self.assertLess(elapsed, 1.0)
+        self.assertIn("weather", result["agent_results"])
+        self.assertTrue(result["agent_results"]["market_price"]["timed_out"])
+
+    def test_decision_marks_missing_sections(self):
+        """Decision support should proceed with partial results once time is up"""
+        state = {
+            "raw_query": "weather and price",
+            "deadline_seconds": 1.0,
+            "deadline": time.time() - 1,
+            "agent_results": {
+                "soil_crop_recommendation": {"recommended_crops": ["Wheat", "Gram"]},
+                "market_price": {"error": "timed out", "timed_out": True},
+            },
+        }
+
+        result = aggregate_decisions(state, {})
+
+        self.assertEqual(result["decision"]["missing_sections"], ["market_price"])
+        self.assertNotIn("market_price", result["decision"]["aggregated_data"])
+        self.assertIn("Wheat", result["decision"]["final_advice"])
+
+
+if __name__ == "__main__":
+    unittest.main()
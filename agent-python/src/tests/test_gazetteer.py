@@ -0,0 +1,97 @@
+import unittest
+
+from src.data.gazetteer import (
+    COMMODITY,
+    DISTRICT,
+    FERTILIZER_KEYWORD,
+    KEYWORD,
+    NUTRIENT_KEYWORD,
+    PRICE_KEYWORD,
+    build_gazetteer,
+)
+from src.graph_arc.core_nodes.query_understanding_node import extract_entities
+from src.utils.aho_corasick import AhoCorasick
+
+
+class TestAhoCorasick(unittest.TestCase):
+    """Test cases for the multi-pattern automaton"""
+
+    def test_finds_overlapping_patterns_in_one_pass(self):
+        automaton = AhoCorasick([("he", 1), ("she", 2), ("hers", 3)])
+
+        matches = [(m.pattern, m.start) for m in automaton.iter("ushers", word_boundaries=False)]
+
+        self.assertEqual(sorted(matches), [("he", 2), ("hers", 2), ("she", 1)])
+
+    def test_word_boundaries(self):
+        automaton = AhoCorasick([("corn", "Maize")])
+
+        self.assertEqual(automaton.find_all("acorn"), [])
+        self.assertEqual([m.value for m in automaton.find_all("corn, acorn")], ["Maize"])
+
+    def test_leftmost_longest(self):
+        automaton = AhoCorasick([("potato", "Potato"), ("sweet potato", "Sweet Potato")])
+
+        values = [m.value for m in automaton.find_all("sweet potato and potato")]
+
+        self.assertEqual(values, ["Sweet Potato", "Potato"])
+
+
+class TestGazetteer(unittest.TestCase):
+    """Test cases for gazetteer-backed entity extraction"""
+
+    def test_categories_from_single_pass(self):
+        gazetteer = build_gazetteer(districts=["Ludhiana", "Kaimur (Bhabua)", "Mandi"])
+
+        matches = gazetteer.match("Wheat price in Bhabua mandi?")
+
+        found = {(m.category, m.value) for m in matches}
+        self.assertIn((COMMODITY, "Wheat"), found)
+        self.assertIn((KEYWORD, PRICE_KEYWORD), found)
+        self.assertIn((DISTRICT, "Kaimur (Bhabua)"), found)
+        # "mandi" is a common word, so the district of that name is not matched
+        self.assertNotIn((DISTRICT, "Mandi"), found)
+
+    def test_ambiguous_district_needs_qualifier(self):
+        gazetteer = build_gazetteer(districts=["Erode", "Salem"])
+
+        def districts(query):
+            return [m.value for m in gazetteer.match(query) if m.category == DISTRICT]
+
+        self.assertEqual(districts("Heavy rains erode the topsoil on my farm"), [])
+        self.assertEqual(districts("Turmeric price in Erode district"), ["Erode"])
+        self.assertEqual(districts("Erode jilla mein baarish"), ["Erode"])
+        self.assertEqual(districts("Turmeric price in Salem"), ["Salem"])
+        self.assertNotIn("location", extract_entities("Will heavy rain erode my soil?"))
+
+    def test_inflected_keywords(self):
+        gazetteer = build_gazetteer(districts=[])
+
+        def keywords(query):
+            return {m.value for m in gazetteer.match(query) if m.category == KEYWORD}
+
+        self.assertEqual(keywords("Best time for fertilization of paddy"), {FERTILIZER_KEYWORD})
+        self.assertEqual(keywords("Apply superphosphate before sowing?"), {FERTILIZER_KEYWORD})
+        self.assertEqual(keywords("Micronutrient spray for citrus"), {NUTRIENT_KEYWORD})
+        self.assertEqual(keywords("Is onion costly this week"), {PRICE_KEYWORD})
+        self.assertTrue(extract_entities("fertilization schedule for wheat")["fertilizer_needed"])
+
+    def test_no_substring_misfires(self):
+        entities = extract_entities("what is the price of acorns")
+
+        self.assertNotIn("crop", entities)  # neither "rice" in "price" nor "corn" in "acorns"
+        self.assertTrue(entities["price_inquiry"])
+
+    def test_extract_entities(self):
+        entities = extract_entities("Urea dose for cotton in Lasalgaon, aphids seen. I have 2 lakh")
+
+        self.assertEqual(entities["commodity"], "Cotton")
+        self.assertEqual(entities["mandi"], "Lasalgaon")
+        self.assertEqual(entities["fertilizer"], "Urea")
+        self.assertEqual(entities["pests"], ("Aphid",))
+        self.assertEqual(entities["investment"], "2 lakh")
+        self.assertTrue(entities["fertilizer_needed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import time
+import unittest
+
+from src.graph_arc.graph import build_agent_stage, workflow
+
+
+def _slow_agent(name, delay):
+    def agent(state):
+        time.sleep(delay)
+        return {"agent": name}
+    return agent
+
+
+class TestParallelAgentBranches(unittest.TestCase):
+    """Test cases for agents registered as native LangGraph branches"""
+
+    def setUp(self):
+        self.registry = {
+            "weather": ("weather", _slow_agent("weather", 0.3)),
+            "soil": ("soil_crop_recommendation", _slow_agent("soil", 0.3)),
+            "market": ("market_price", _slow_agent("market", 0.3)),
+        }
+
+    def test_each_agent_is_a_graph_node(self):
+        """The compiled workflow should expose one node per agent"""
+        nodes = set(workflow.get_graph().nodes)
+        for node in ["weather_agent", "soil_crop_recommendation_agent", "market_price_agent"]:
+            self.assertIn(node, nodes)
+        self.assertNotIn("conditional_router", nodes)
+
+    def test_branches_run_in_one_superstep_and_merge(self):
+        """Matched agents should run concurrently and merge into agent_results"""
+        stage = build_agent_stage(parallel_agents=True, registry=self.registry)
+
+        start_time = time.perf_counter()
+        result = stage.invoke({"raw_query": "q", "intents": ["weather", "soil", "market"]})
+        elapsed = time.perf_counter() - start_time
+
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(result["agent_results"], {
+            "weather": {"agent": "weather"},
+            "soil_crop_recommendation": {"agent": "soil"},
+            "market_price": {"agent": "market"},
+        })
+        self.assertEqual(set(result["agent_timings"]), set(result["agent_results"]))
+
+    def test_only_matched_agents_run(self):
+        """Agents for intents that were not detected should not run"""
+        stage = build_agent_stage(parallel_agents=True, registry=self.registry)
+        result = stage.invoke({"raw_query": "q", "intents": ["market", "policy"]})
+        self.assertEqual(list(result["agent_results"]), ["market_price"])
+
+    def test_no_intents_skips_agents(self):
+        """Without matched intents the stage should go straight to its target"""
+        stage = build_agent_stage(parallel_agents=True, registry=self.registry)
+        result = stage.invoke({"raw_query": "q", "intents": []})
+        self.assertFalse(result.get("agent_results"))
+
+    def test_unhandled_intents_are_recorded_in_both_modes(self):
+        """Intents without an agent should leave the same error entry either way"""
+        for intents in (["market", "irrigation"], ["irrigation"]):
+            state = {"raw_query": "q", "intents": intents}
+            parallel = build_agent_stage(parallel_agents=True, registry=self.registry).invoke(state)
+            single = build_agent_stage(parallel_agents=False, registry=self.registry).invoke(state)
+
+            self.assertEqual(parallel["agent_results"]["irrigation"], {"error": "No handler for intent 'irrigation'"})
+            self.assertEqual(parallel["agent_results"], single["agent_results"])
+
+    def test_single_node_router_matches_branches(self):
+        """The legacy single-node router should produce the same results"""
+        state = {"raw_query": "q", "intents": ["weather", "market"]}
+        parallel = build_agent_stage(parallel_agents=True, registry=self.registry).invoke(state)
+        single = build_agent_stage(parallel_agents=False, registry=self.registry).invoke(state)
+        self.assertEqual(parallel["agent_results"], single["agent_results"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import unittest
+
+from src.utils.incremental_json import DELTA, FIELD, IncrementalJSONObjectParser
+
+
+DOCUMENT = "```json\n" + json.dumps({
+    "final_advice": "Irrigate \"lightly\" today \u0928\u092e\u0938\u094d\u0924\u0947",
+    "weather_analysis": {"risk": ["heat", {"note": "}"}]},
+    "confidence_score": 0.85,
+    "summary_message": "Happy farming!",
+}, indent=2) + "\n```"
+
+
+def _feed_in_chunks(parser, text, size):
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return events
+
+
+class TestIncrementalJSONObjectParser(unittest.TestCase):
+    """Test cases for the incremental JSON object parser"""
+
+    def test_fields_complete_in_document_order(self):
+        """Every chunking should yield the same fields, in order"""
+        expected = json.loads(DOCUMENT.strip("`").replace("json\n", "", 1))
+        for size in (1, 2, 5, 64, len(DOCUMENT)):
+            parser = IncrementalJSONObjectParser()
+            events = _feed_in_chunks(parser, DOCUMENT, size)
+
+            fields = [(key, value) for kind, key, value in events if kind == FIELD]
+            self.assertEqual(dict(fields), expected)
+            self.assertEqual([key for key, _ in fields], list(expected))
+            self.assertTrue(parser.done)
+
+    def test_stream_field_deltas_rebuild_value(self):
+        """Deltas of a streamed field should concatenate to the decoded value"""
+        parser = IncrementalJSONObjectParser(stream_fields=["final_advice"])
+        events = _feed_in_chunks(parser, json.dumps({"final_advice": "Sow \\u0917\u0947\u0939\u0942\u0901 now"}), 3)
+
+        deltas = [value for kind, key, value in events if kind == DELTA]
+        final = [value for kind, key, value in events if kind == FIELD][0]
+        self.assertGreater(len(deltas), 1)
+        self.assertEqual("".join(deltas), final)
+
+    def test_first_field_reported_before_object_ends(self):
+        """final_advice should be available before later sections arrive"""
+        parser = IncrementalJSONObjectParser()
+        events = parser.feed('{"final_advice": "Harvest now", "resources": [')
+
+        self.assertEqual(events, [(FIELD, "final_advice", "Harvest now")])
+        self.assertFalse(parser.done)
+
+
+if __name__ == "__main__":
+    unittest.main()
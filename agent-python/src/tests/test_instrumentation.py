@@ -0,0 +1,147 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from src.data.soil_plugins import get_soil_data_from_csv
+from src.graph_arc.core_nodes import query_understanding_node as qu
+from src.graph_arc.deadline import assign_deadline
+from src.graph_arc.graph import build_agent_stage
+from src.graph_arc.state import merge_performance
+from src.server import app
+from src.utils.instrumentation import instrument_node, measure_call, performance_report
+
+
+def _calling_agent(name, delay):
+    def agent(state):
+        with measure_call(f"{name}_api") as call:
+            time.sleep(delay)
+            call.add_bytes(sent=100, received=2048)
+            call.cache_result(False)
+        return {"agent": name}
+    return agent
+
+
+REGISTRY = {
+    "weather": ("weather", _calling_agent("weather", 0.05)),
+    "market": ("market_price", _calling_agent("market", 0.05)),
+}
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test cases for per-node performance instrumentation"""
+
+    def test_node_records_wall_cpu_and_calls(self):
+        node = instrument_node("understand", _calling_agent("model", 0.02))
+        update = node.invoke({"raw_query": "rain"})
+
+        record = update["_performance"]["nodes"]["understand"]
+        self.assertGreaterEqual(record["wall_time"], 0.02)
+        self.assertIn("cpu_time", record)
+        self.assertEqual(record["calls"][0]["name"], "model_api")
+        self.assertEqual(record["calls"][0]["bytes_received"], 2048)
+        self.assertEqual(record["calls"][0]["cache"], "miss")
+
+    def test_measure_call_outside_node_is_discarded(self):
+        with measure_call("orphan") as call:
+            call.add_bytes(sent=1)
+        self.assertEqual(call.record["bytes_sent"], 1)
+
+    def test_parallel_branches_merge_into_state(self):
+        """Calls made on agent worker threads should land in their node's record"""
+        stage = build_agent_stage(parallel_agents=True, registry=REGISTRY)
+        state = assign_deadline({"raw_query": "weather price", "intents": ["weather", "market"], "deadline_seconds": 5})
+
+        for result in (stage.invoke(state), asyncio.run(stage.ainvoke(state))):
+            nodes = result["_performance"]["nodes"]
+            self.assertEqual(nodes["weather_agent"]["calls"][0]["name"], "weather_api")
+            self.assertEqual(nodes["market_price_agent"]["calls"][0]["name"], "market_api")
+
+            report = performance_report(result["_performance"], response_cache="miss")
+            self.assertEqual(report["totals"]["external_calls"], 2)
+            self.assertEqual(report["totals"]["bytes_received"], 4096)
+            # Both API calls plus the response cache
+            self.assertEqual(report["totals"]["cache_misses"], 3)
+
+    def test_cache_lookups_are_recorded(self):
+        def node(state):
+            for query in ("soil health in Pune", "soil health in Pune"):
+                qu.analyze_query(query)
+            get_soil_data_from_csv("Pune", "soil health")
+            get_soil_data_from_csv("Atlantis", "soil health")
+            return {}
+
+        qu.analysis_cache.clear()
+        update = instrument_node("understand", node).invoke({})
+
+        lookups = update["_performance"]["nodes"]["understand"]["lookups"]
+        self.assertEqual(
+            [(lookup["name"], lookup["cache"]) for lookup in lookups],
+            [("query_analysis_cache", "miss"), ("query_analysis_cache", "hit"),
+             ("soil_analysis_table", "hit"), ("soil_analysis_table", "miss")],
+        )
+        totals = performance_report(update["_performance"], response_cache="hit")["totals"]
+        self.assertEqual((totals["external_calls"], totals["cache_hits"], totals["cache_misses"]), (0, 3, 2))
+
+    def test_merge_performance_keeps_all_nodes(self):
+        merged = merge_performance(
+            {"nodes": {"user_context": {"wall_time": 0.1}}},
+            {"nodes": {"weather_agent": {"wall_time": 0.2}}},
+        )
+        self.assertEqual(set(merged["nodes"]), {"user_context", "weather_agent"})
+
+
+def _workflow_result():
+    return {
+        "intents": ["weather"],
+        "decision": {"final_advice": "Irrigate lightly", "missing_sections": []},
+        "agent_results": {"weather": {"forecast": {"temperature": 31}}},
+        "_performance": {"nodes": {"weather_agent": {
+            "wall_time": 0.4, "cpu_time": 0.01, "lookups": [],
+            "calls": [{"name": "openweather", "bytes_sent": 100, "bytes_received": 2048, "cache": None}],
+        }}},
+    }
+
+
+class TestDebugPerformanceReport(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the per-request debug report of cached and shared answers"""
+
+    def setUp(self):
+        app.response_cache.clear()
+        patcher = patch.object(app.manager, "send_status_update", new=AsyncMock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(app.response_cache.clear)
+
+    def message(self):
+        return app.ChatMessage(user_id="perf-test", raw_query="Will it rain in Satara tomorrow?", language="en", debug=True)
+
+    async def test_cache_hit_reports_no_work(self):
+        with patch.object(app.scheduler, "run", new=AsyncMock(side_effect=lambda state: _workflow_result())):
+            executed = (await app.process_agricultural_query(self.message()))["result"]["_performance"]
+            cached = (await app.process_agricultural_query(self.message()))["result"]["_performance"]
+
+        self.assertEqual((executed["source"], executed["totals"]["external_calls"]), ("executed", 1))
+        self.assertEqual((cached["source"], cached["response_cache"]), ("cached", "hit"))
+        self.assertEqual(cached["nodes"], {})
+        self.assertEqual(cached["totals"]["external_calls"], 0)
+        self.assertEqual(cached["totals"]["bytes_received"], 0)
+        self.assertEqual(cached["totals"]["node_wall_time"], 0)
+
+    async def test_shared_run_reports_no_work(self):
+        async def slow_run(state):
+            await asyncio.sleep(0.05)
+            return _workflow_result()
+
+        with patch.object(app.scheduler, "run", new=slow_run):
+            outcomes = await asyncio.gather(*[app.process_agricultural_query(self.message()) for _ in range(2)])
+
+        reports = sorted((outcome["result"]["_performance"] for outcome in outcomes), key=lambda report: report["source"])
+        self.assertEqual([report["source"] for report in reports], ["executed", "shared"])
+        self.assertEqual(reports[0]["totals"]["external_calls"], 1)
+        self.assertEqual(reports[1]["totals"]["external_calls"], 0)
+        self.assertEqual(reports[1]["nodes"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
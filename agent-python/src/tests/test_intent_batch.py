@@ -0,0 +1,93 @@
+import unittest
+
+from src.graph_arc.core_nodes import query_understanding_node as qu
+from src.graph_arc.query_analysis import analyze_text
+from src.services.intent_classification_service import load_pickled_model
+
+QUERIES = [
+    "will it rain tomorrow in pune",
+    "wheat fertilizer price in pune",
+    "urea for cotton",
+    "PM kisan scheme eligibility",
+    "my tomato leaves have yellow spots",
+    "what is the mandi rate of onion",
+    "",
+]
+
+
+def _per_query_loop(query, threshold=0.2):
+    """Reference implementation: the original one-query, per-class loop."""
+    model, vectorizer, binarizer = load_pickled_model()
+    vector = vectorizer.transform([qu.clean_text(query)])
+    probs = model.predict_proba(vector)
+    intents, max_prob = [], 0.0
+    for i, name in enumerate(binarizer.classes_):
+        prob = probs[i][0][1] if len(probs[i][0]) > 1 else probs[i][0][0]
+        if prob > threshold:
+            intents.append(name)
+        max_prob = max(max_prob, prob)
+    return qu._apply_keyword_rules(analyze_text(query), intents, float(max_prob))
+
+
+@unittest.skipUnless(qu.load_intent_model(), "intent model not available")
+class TestIntentBatch(unittest.TestCase):
+    """Test cases for vectorized batch intent classification"""
+
+    def test_batch_matches_single_query_path(self):
+        batch = qu.get_intents_batch(QUERIES)
+
+        self.assertEqual(len(batch), len(QUERIES))
+        for query, (intents, confidence) in zip(QUERIES, batch):
+            single_intents, single_confidence = qu.get_intents(query)
+            self.assertEqual(intents, single_intents)
+            self.assertAlmostEqual(confidence, single_confidence)
+
+    def test_batch_matches_per_class_loop(self):
+        for query, (intents, confidence) in zip(QUERIES, qu.get_intents_batch(QUERIES)):
+            expected_intents, expected_confidence = _per_query_loop(query)
+            if expected_intents:
+                self.assertEqual(intents, expected_intents)
+            else:
+                self.assertEqual(len(intents), 1)
+            self.assertAlmostEqual(confidence, expected_confidence)
+
+    def test_fallback_to_best_intent(self):
+        intents, _ = qu.get_intents_batch(["hello"], threshold=1.0)[0]
+        self.assertEqual(len(intents), 1)
+        self.assertIn(intents[0], qu._intent_classes())
+
+    def test_empty_batch(self):
+        self.assertEqual(qu.get_intents_batch([]), [])
+
+    def test_analyze_query_memoizes_normalized_query(self):
+        qu.analysis_cache.clear()
+        hits = qu.analysis_cache.hits
+
+        first = qu.analyze_query("Wheat fertilizer price in Pune?")
+        second = qu.analyze_query("wheat fertilizer price in pune")
+
+        self.assertEqual(first, second)
+        self.assertEqual(qu.analysis_cache.hits, hits + 1)
+        self.assertTrue(first[2].mentions_price)
+        self.assertTrue(first[2].entities.get("price_inquiry"))
+
+    def test_analyze_query_shares_immutable_analysis(self):
+        intents, _, analysis = qu.analyze_query("urea for cotton")
+        intents.append("weather")
+
+        again, _, analysis_again = qu.analyze_query("urea for cotton")
+
+        self.assertNotIn("weather", again)
+        self.assertIs(analysis, analysis_again)
+        with self.assertRaises(TypeError):
+            analysis.entities["location"] = "Pune"
+
+    def test_understand_query_stores_analysis(self):
+        state = qu.understand_query({"raw_query": "Should I irrigate my wheat?"})
+
+        self.assertTrue(state["query_analysis"].mentions_irrigation)
+        self.assertEqual(state["entities"]["crop"], "Wheat")
+
+
+if __name__ == "__main__":
+    unittest.main()
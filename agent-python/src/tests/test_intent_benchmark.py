@@ -0,0 +1,51 @@
+import unittest
+
+from src.benchmarks.intent_benchmark import accuracy_report, compare_reports, load_corpus, run_benchmark
+
+
+class TestIntentBenchmark(unittest.TestCase):
+    """Test cases for the intent classifier benchmark and accuracy regression check"""
+
+    def test_accuracy_report(self):
+        gold = [["weather"], ["soil", "market"], ["market"]]
+        predicted = [["weather"], ["soil"], ["market", "weather"]]
+        report = accuracy_report(gold, predicted, ["market", "soil", "weather"])
+
+        self.assertEqual(report["per_intent"]["weather"]["precision"], 0.5)
+        self.assertEqual(report["per_intent"]["weather"]["recall"], 1.0)
+        self.assertEqual(report["per_intent"]["market"]["recall"], 0.5)
+        self.assertEqual(report["per_intent"]["market"]["support"], 2)
+        self.assertEqual(report["micro_precision"], 0.75)
+        self.assertEqual(report["micro_recall"], 0.75)
+        self.assertAlmostEqual(report["exact_match"], 0.3333)
+
+    def test_run_benchmark_reports_speed_and_accuracy(self):
+        corpus = load_corpus()[:12]
+        report = run_benchmark(corpus, repeat=2)
+
+        self.assertEqual(report["corpus_size"], 12)
+        self.assertEqual(report["latency"]["queries"], 24)
+        self.assertGreater(report["latency"]["qps"], 0)
+        self.assertLessEqual(report["latency"]["p50_ms"], report["latency"]["p99_ms"])
+        self.assertGreater(report["peak_rss_mb"], 0)
+        self.assertIn("model_load_seconds", report["cold_start"])
+        self.assertEqual(len(report["predictions"]), 12)
+        self.assertIn("weather", report["accuracy"]["per_intent"])
+
+        # A run never regresses against itself
+        self.assertTrue(compare_reports(report, report)["passed"])
+
+    def test_compare_flags_less_accurate_candidate(self):
+        corpus = load_corpus()[:12]
+        baseline = run_benchmark(corpus, repeat=1)
+        candidate = dict(baseline, accuracy=accuracy_report(
+            [intents for _, intents in corpus], [["policy"]] * len(corpus), ["policy", "weather"]
+        ))
+        result = compare_reports(baseline, candidate)
+
+        self.assertFalse(result["passed"])
+        self.assertTrue(any(r.startswith("micro_f1") for r in result["regressions"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.services.intent_classification_service import COMPACT_MODEL_DIR, CompactIntentModel, INTERCEPT_FILE
+from src.services.intent_model_registry import BASE_VERSION, IntentModelRegistry, publish_version
+
+QUERY = "will it rain tomorrow"
+
+
+@unittest.skipUnless(CompactIntentModel.exists(), "compact intent model not available")
+class TestIntentModelRegistry(unittest.TestCase):
+    """Test cases for versioned intent models, hot swap and rollback"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.base_dir = os.path.join(self.tmpdir.name, "model")
+        self.versions_dir = os.path.join(self.base_dir, "versions")
+        shutil.copytree(COMPACT_MODEL_DIR, os.path.join(self.base_dir, "compact"))
+
+        # v2 strongly prefers the first class
+        v2_dir = publish_version("v2", self.base_dir, self.versions_dir)
+        intercept_path = os.path.join(v2_dir, "compact", INTERCEPT_FILE)
+        intercept = np.load(intercept_path)
+        intercept[0] += 50.0
+        np.save(intercept_path, intercept)
+
+        self.swapped = []
+        self.registry = self.new_registry(on_swap=lambda model: self.swapped.append(model.version))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def new_registry(self, **kwargs):
+        return IntentModelRegistry(versions_dir=self.versions_dir, base_dir=self.base_dir, model_format="compact", **kwargs)
+
+    def top_class(self, model):
+        probs = model.positive_probabilities([QUERY])[0]
+        return model.classes[int(np.argmax(probs))]
+
+    def test_background_activation_and_rollback(self):
+        base = self.registry.get()
+        self.assertEqual(base.version, BASE_VERSION)
+        self.assertEqual(self.registry.versions(), [BASE_VERSION, "v2"])
+
+        self.registry.activate("v2", background=True).join()
+        self.assertEqual(self.registry.active_version, "v2")
+        self.assertEqual(self.registry.pinned_version(), "v2")
+        self.assertEqual(self.top_class(self.registry.active), self.registry.active.classes[0])
+        # A reference taken before the swap keeps scoring with its own version
+        self.assertEqual(self.top_class(base), "weather")
+
+        self.registry.rollback()
+        self.assertIs(self.registry.active, base)
+        self.assertEqual(self.registry.pinned_version(), BASE_VERSION)
+        self.assertEqual(self.swapped, ["v2", BASE_VERSION])
+        with self.assertRaises(RuntimeError):
+            self.registry.rollback()
+
+    def test_other_workers_follow_the_pointer(self):
+        other = self.new_registry()
+        other.get()
+        signature = other.signature()
+
+        self.registry.get()
+        self.registry.activate("v2")
+
+        self.assertNotEqual(other.signature(), signature)
+        other.sync(background=False)
+        self.assertEqual(other.active_version, "v2")
+
+    def test_failed_load_keeps_current_version(self):
+        os.makedirs(os.path.join(self.versions_dir, "broken"))
+        self.registry.get()
+
+        with self.assertRaises(FileNotFoundError):
+            self.registry.activate("broken")
+        self.registry.activate("broken", background=True).join()
+
+        self.assertEqual(self.registry.active_version, BASE_VERSION)
+        self.assertIsNotNone(self.registry.status()["last_error"])
+        with self.assertRaises(ValueError):
+            self.registry.activate("missing")
+        with self.assertRaises(ValueError):
+            self.registry.activate("../model")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.benchmarks.intent_benchmark import load_corpus
+from src.services.intent_classification_service import HashedIntentModel, hash_terms
+from src.services.intent_model_registry import load_model_dir
+from src.services.intent_training import (
+    compare_artifacts,
+    reference_classes,
+    save_hashed_model,
+    train_hashed_model,
+)
+
+
+class TestIntentTraining(unittest.TestCase):
+    """Test cases for the hashing-trick intent model training pipeline"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.samples = load_corpus()
+        cls.classes = reference_classes()
+        cls.model = train_hashed_model(cls.samples, cls.classes, n_features=2 ** 12)
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        save_hashed_model(cls.model, os.path.join(cls.tmpdir.name, "hashed"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def test_hashing_is_stable_and_bounded(self):
+        columns = hash_terms(["wheat", "wheat price", "wheat"], 2 ** 12)
+        self.assertEqual(columns[0], columns[2])
+        self.assertTrue(((columns >= 0) & (columns < 2 ** 12)).all())
+
+    def test_same_label_set_and_fixed_size(self):
+        self.assertEqual(self.model.classes, self.classes)
+        self.assertEqual(self.model.coef.shape, (2 ** 12, len(self.classes)))
+
+    def test_saved_model_matches_trained_model(self):
+        queries = [query for query, _ in self.samples]
+        loaded = HashedIntentModel.load(os.path.join(self.tmpdir.name, "hashed"))
+        np.testing.assert_allclose(loaded.predict_proba(queries), self.model.predict_proba(queries), atol=1e-5)
+
+        # The registry serves it like any other version
+        intent_model = load_model_dir(self.tmpdir.name, "hashed-test")
+        self.assertEqual(intent_model.model_format, "hashed")
+        probs = intent_model.positive_probabilities(["will it rain tomorrow in pune"])[0]
+        self.assertEqual(intent_model.classes[int(np.argmax(probs))], "weather")
+
+    def test_rejects_unknown_labels(self):
+        with self.assertRaises(ValueError):
+            train_hashed_model([("irrigate my field", ["irrigation"])], self.classes, n_features=2 ** 8)
+
+    def test_compare_reports_size_load_speed_and_accuracy(self):
+        report = compare_artifacts({"hashed": (self.tmpdir.name, "hashed")}, self.samples[:10], loads=1, repeat=1)
+        stats = report["hashed"]
+        self.assertGreater(stats["bytes"], 0)
+        self.assertGreaterEqual(stats["load_seconds"], 0)
+        self.assertGreater(stats["latency"]["qps"], 0)
+        self.assertIn("micro_f1", stats["accuracy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from src.data.government_schemes_plugin import extract_state_from_location
+from src.graph_arc.core_nodes.query_understanding_node import understand_query
+from src.graph_arc.query_analysis import analyze_text
+from src.services.user_location_cache import UserLocationCache, user_locations
+
+
+class TestLocationResolution(unittest.TestCase):
+    """Test cases for query location extraction and per-user location caching"""
+
+    def setUp(self):
+        user_locations.clear()
+
+    def test_query_names_district_city_or_state(self):
+        ludhiana = analyze_text("soil in Ludhiana")
+        self.assertEqual(ludhiana.location, "Ludhiana")
+        self.assertEqual(ludhiana.entities["state"], "Punjab")
+
+        self.assertEqual(analyze_text("rain in Mumbai tomorrow").location, "Mumbai")
+        self.assertEqual(analyze_text("wheat price in Pune, Maharashtra").entities["state"], "Maharashtra")
+        self.assertEqual(analyze_text("weather in Punjab").location, "Punjab")
+        self.assertIsNone(analyze_text("will it rain tomorrow").location)
+
+    def test_resolution_priority(self):
+        cache = UserLocationCache(default="Satara")
+        self.assertEqual(cache.resolve("u1", "Pune", "Ludhiana"), ("Ludhiana", "query"))
+        self.assertEqual(cache.resolve("u1", "Pune", None), ("Pune", "request"))
+        self.assertEqual(cache.resolve("u1", None, None), ("Satara", "default"))
+        cache.put("u1", "Nashik")
+        self.assertEqual(cache.resolve("u1", None, None), ("Nashik", "user_cache"))
+
+    def test_lru_eviction(self):
+        cache = UserLocationCache(max_entries=2)
+        cache.put("a", "Pune")
+        cache.put("b", "Nashik")
+        cache.get("a")
+        cache.put("c", "Satara")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "Pune")
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+
+    def test_understand_query_resolves_and_remembers_location(self):
+        state = understand_query({"user_id": "farmer-1", "raw_query": "soil health in Ludhiana"})
+        self.assertEqual((state["location"], state["location_source"]), ("Ludhiana", "query"))
+
+        state = understand_query({"user_id": "farmer-1", "raw_query": "will it rain tomorrow"})
+        self.assertEqual((state["location"], state["location_source"]), ("Ludhiana", "user_cache"))
+
+        state = understand_query({"user_id": "farmer-2", "raw_query": "will it rain tomorrow", "location": "Pune"})
+        self.assertEqual((state["location"], state["location_source"]), ("Pune", "request"))
+
+    def test_state_from_location(self):
+        self.assertEqual(extract_state_from_location("Mumbai"), "Maharashtra")
+        self.assertEqual(extract_state_from_location("village near Nashik"), "Maharashtra")
+        self.assertEqual(extract_state_from_location("Pune, Maharashtra"), "Maharashtra")
+        self.assertEqual(extract_state_from_location({"district": "Ludhiana"}), "Punjab")
+        self.assertEqual(extract_state_from_location("Unknown City"), "Unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import dataclasses
+import unittest
+
+from src.data.soil_plugins import get_soil_data_from_csv
+from src.graph_arc.core_nodes import query_understanding_node as qu
+from src.graph_arc.query_analysis import analyze_text
+
+
+class TestQueryAnalysis(unittest.TestCase):
+    """Test cases for the single-pass query analysis"""
+
+    def test_single_pass_fields(self):
+        analysis = analyze_text("When should I irrigate  my Onions? Price in Lasalgaon?")
+
+        self.assertEqual(analysis.normalized, "when should i irrigate my onions price in lasalgaon")
+        self.assertEqual(analysis.tokens[-1], "lasalgaon")
+        self.assertTrue(analysis.mentions_irrigation)
+        self.assertTrue(analysis.mentions_price)
+        self.assertFalse(analysis.mentions_fertilizer)
+        self.assertEqual(analysis.entities["commodity"], "Onion")
+        self.assertEqual(analysis.first("mandi"), "Lasalgaon")
+
+    def test_is_immutable(self):
+        analysis = analyze_text("urea for wheat")
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            analysis.normalized = "changed"
+        with self.assertRaises(TypeError):
+            analysis.entities["crop"] = "Rice"
+
+    def test_soil_uses_analysis_flags(self):
+        # The analysis, not the query text, decides the irrigation guidance
+        analysis = analyze_text("irrigation schedule")
+
+        with_flag = get_soil_data_from_csv("Pune", "soil report", analysis=analysis)
+        without_flag = get_soil_data_from_csv("Pune", "soil report")
+
+        self.assertIn("IRRIGATION STRATEGY", with_flag["ai_recommendation"])
+        self.assertNotIn("IRRIGATION STRATEGY", without_flag["ai_recommendation"])
+
+    def test_punctuation_separates_words(self):
+        # Punctuation between words must not glue them together for the gazetteer
+        for query in ("weather in Pune,Maharashtra", "price of onion/tomato in Nashik",
+                      "urea+DAP price", "soil test for Kolar-district"):
+            _, _, analysis = qu.analyze_query(query)
+            self.assertEqual(analysis.entities, analyze_text(query).entities, query)
+
+        self.assertEqual(qu.analyze_query("weather in Pune,Maharashtra")[2].location, "Pune")
+        self.assertEqual(qu.analyze_query("price of onion/tomato in Nashik")[2].entities["commodity"], "Onion")
+        self.assertEqual(qu.analyze_query("price of onion/tomato in Nashik")[2].location, "Nashik")
+        urea = qu.analyze_query("urea+DAP price")[2]
+        self.assertEqual(urea.entities["fertilizer"], "Urea")
+        self.assertTrue(urea.entities["fertilizer_needed"])
+        self.assertEqual(qu.analyze_query("soil test for Kolar-district")[2].location, "Kolar")
+
+    def test_workflow_and_batch_classify_alike(self):
+        queries = ["weather in Pune,Maharashtra", "urea+DAP price", "onion/tomato rates?"]
+        batch = qu.get_intents_batch(queries)
+        for query, (intents, confidence) in zip(queries, batch):
+            self.assertEqual(qu.analyze_query(query)[:2], (intents, confidence))
+
+
+if __name__ == "__main__":
+    unittest.main()
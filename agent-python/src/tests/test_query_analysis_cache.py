@@ -0,0 +1,51 @@
+import unittest
+
+from src.services.query_analysis_cache import QueryAnalysisCache
+
+
+class TestQueryAnalysisCache(unittest.TestCase):
+    """Test cases for the memoized query analysis cache"""
+
+    def test_hit_rate_and_lru_eviction(self):
+        cache = QueryAnalysisCache(max_entries=2)
+        cache.put("a", (["weather"], 0.9, {}))
+        cache.put("b", (["soil"], 0.8, {}))
+        cache.get("a")
+        cache.put("c", (["market"], 0.7, {}))
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a")[0], ["weather"])
+        stats = cache.get_stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 0.667)
+
+    def test_model_change_clears_and_reloads(self):
+        signature = {"value": 1}
+        reloads = []
+        cache = QueryAnalysisCache(
+            signature=lambda: signature["value"],
+            on_change=lambda: reloads.append(1),
+            check_interval=0,
+        )
+        cache.put("a", (["weather"], 0.9, {}))
+        self.assertIsNotNone(cache.get("a"))
+
+        signature["value"] = 2
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(reloads, [1])
+        self.assertEqual(cache.get_stats()["model_invalidations"], 1)
+
+    def test_stale_generation_is_not_stored(self):
+        cache = QueryAnalysisCache()
+        generation = cache.generation
+        cache.clear()
+
+        cache.put("a", (["weather"], 0.9, {}), generation)
+
+        self.assertIsNone(cache.get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from src.graph_arc.agents_node.market_price_agent import market_price_agent
+from src.graph_arc.agents_node.weather_agent import weather_agent
+from src.server import app
+from src.services.response_cache import ResponseCache, is_cacheable, response_cache_key
+
+
+def _result(advice="Irrigate lightly"):
+    return {"decision": {"final_advice": advice, "missing_sections": []}, "agent_results": {"weather": {"forecast": {}}}}
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for the full-response cache"""
+
+    def test_hit_after_put_with_canonical_key(self):
+        cache = ResponseCache()
+        cache.put(response_cache_key("Should I irrigate today?", "Satara", "hi", ["weather"]), _result())
+
+        hit = cache.get(response_cache_key("should i irrigate  today", "satara", "HI", ["weather"]))
+
+        self.assertEqual(hit["decision"]["final_advice"], "Irrigate lightly")
+        self.assertEqual(cache.get_stats()["hits"], 1)
+
+    def test_intent_set_is_part_of_key(self):
+        cache = ResponseCache()
+        cache.put(response_cache_key("wheat", "Pune", "en", ["soil", "market"]), _result())
+
+        self.assertIsNotNone(cache.get(response_cache_key("wheat", "Pune", "en", ["market", "soil"])))
+        self.assertIsNone(cache.get(response_cache_key("wheat", "Pune", "en", ["soil"])))
+
+    def test_ttl_depends_on_intent(self):
+        cache = ResponseCache(ttl_by_intent={"weather": 0.05, "soil": 60})
+        weather_key = response_cache_key("rain", "Satara", "hi", ["weather"])
+        mixed_key = response_cache_key("rain soil", "Satara", "hi", ["weather", "soil"])
+        soil_key = response_cache_key("soil", "Satara", "hi", ["soil"])
+        for key in (weather_key, mixed_key, soil_key):
+            cache.put(key, _result())
+
+        time.sleep(0.1)
+
+        self.assertIsNone(cache.get(weather_key))
+        self.assertIsNone(cache.get(mixed_key))
+        self.assertIsNotNone(cache.get(soil_key))
+        self.assertEqual(cache.get_stats()["expirations"], 2)
+
+    def test_lru_eviction_respects_bounds(self):
+        cache = ResponseCache(max_entries=2)
+        keys = [response_cache_key(f"query {i}", "Satara", "hi", ["soil"]) for i in range(3)]
+        cache.put(keys[0], _result())
+        cache.put(keys[1], _result())
+        cache.get(keys[0])
+        cache.put(keys[2], _result())
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+
+        small = ResponseCache(max_bytes=200)
+        self.assertFalse(small.put(keys[0], _result("x" * 500)))
+        self.assertLessEqual(small.get_stats()["bytes"], 200)
+
+    def test_invalidation_filters(self):
+        cache = ResponseCache()
+        cache.put(response_cache_key("price", "Pune", "en", ["market"]), _result())
+        cache.put(response_cache_key("price", "Satara", "en", ["market"]), _result())
+        cache.put(response_cache_key("soil", "Pune", "en", ["soil"]), _result())
+
+        self.assertEqual(cache.invalidate(intent="market", location="Pune"), 1)
+        self.assertEqual(cache.invalidate(intent="market"), 1)
+        self.assertEqual(cache.clear(), 1)
+        self.assertEqual(cache.get_stats()["bytes"], 0)
+
+    def test_partial_answers_are_not_cacheable(self):
+        timed_out = _result()
+        timed_out["decision"]["missing_sections"] = ["weather"]
+        failed = _result()
+        failed["agent_results"]["market_price"] = {"error": "upstream down"}
+        fallback = _result()
+        fallback["decision"]["fallback_used"] = True
+
+        self.assertTrue(is_cacheable(_result()))
+        self.assertFalse(is_cacheable(timed_out))
+        self.assertFalse(is_cacheable(failed))
+        self.assertFalse(is_cacheable(fallback))
+        self.assertFalse(is_cacheable({}))
+
+    def test_failed_upstream_is_not_cacheable(self):
+        state = {"location": "Satara", "entities": {"commodity": "Onion"}}
+        with patch("src.graph_arc.agents_node.weather_agent.fetch_weather_data", side_effect=ValueError("Failed to fetch weather data.")):
+            weather = weather_agent(state)
+        # The Agmarknet client swallows errors and returns no records
+        with patch("src.tools.mandi_price_tool.AgmarknetAPIClient.__call__", return_value=[]):
+            market = market_price_agent(state)
+
+        self.assertEqual(weather["forecast"]["temperature"], "N/A")
+        self.assertNotIn("error", weather)
+        self.assertFalse(market["current_price"])
+        for agent, agent_result in (("weather", weather), ("market_price", market)):
+            result = _result()
+            result["agent_results"][agent] = agent_result
+            self.assertFalse(is_cacheable(result), agent)
+
+        with patch("src.graph_arc.agents_node.weather_agent.fetch_weather_data", return_value={"temperature": 31}):
+            self.assertTrue(is_cacheable({**_result(), "agent_results": {"weather": weather_agent(state)}}))
+
+
+class TestRunCached(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the cached, coalesced workflow entry point"""
+
+    async def test_query_and_location_resolved_once(self):
+        app.response_cache.clear()
+        self.addCleanup(app.response_cache.clear)
+        message = app.ChatMessage(user_id="run-cached-test", raw_query="Will it rain tomorrow?", language="en")
+
+        with patch.object(app.scheduler, "run", new=AsyncMock(return_value=_result())), \
+                patch.object(app, "analyze_query", wraps=app.analyze_query) as analyze, \
+                patch.object(app.user_locations, "get", wraps=app.user_locations.get) as user_location:
+            result, status, shared = await app.run_cached(message, app.build_initial_state(message))
+
+        self.assertEqual((status, shared), ("miss", False))
+        self.assertEqual(result["decision"]["final_advice"], "Irrigate lightly")
+        self.assertEqual(analyze.call_count, 1)
+        self.assertEqual(user_location.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
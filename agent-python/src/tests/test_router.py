@@ -0,0 +1,70 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from src.graph_arc import router
+from src.graph_arc.router import conditional_router
+
+
+def _slow_agent(name, delay):
+    def agent(state):
+        time.sleep(delay)
+        return {"agent": name}
+    return agent
+
+
+class TestConditionalRouterFanOut(unittest.TestCase):
+    """Test cases for concurrent agent fan-out in conditional_router"""
+
+    def setUp(self):
+        self.registry = {
+            "weather": ("weather", _slow_agent("weather", 0.3)),
+            "soil": ("soil_crop_recommendation", _slow_agent("soil", 0.3)),
+            "market": ("market_price", _slow_agent("market", 0.3)),
+        }
+
+    def test_agents_run_concurrently(self):
+        """Multi-intent latency should be close to the slowest agent, not the sum"""
+        state = {"raw_query": "weather soil price", "intents": ["weather", "soil", "market"]}
+
+        with patch.dict(router.AGENT_REGISTRY, self.registry):
+            start_time = time.perf_counter()
+            result = conditional_router(state)
+            elapsed = time.perf_counter() - start_time
+
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(
+            set(result["agent_results"].keys()),
+            {"weather", "soil_crop_recommendation", "market_price"},
+        )
+        self.assertEqual(result["agent_results"]["market_price"], {"agent": "market"})
+
+    def test_agent_timings_reported(self):
+        """Each agent's wall time should be recorded in agent_timings"""
+        state = {"raw_query": "weather", "intents": ["weather", "weather"]}
+
+        with patch.dict(router.AGENT_REGISTRY, self.registry):
+            result = conditional_router(state)
+
+        self.assertEqual(list(result["agent_timings"].keys()), ["weather"])
+        self.assertGreaterEqual(result["agent_timings"]["weather"], 0.3)
+
+    def test_agent_failure_is_isolated(self):
+        """A failing agent should not prevent other agents from returning results"""
+        def broken_agent(state):
+            raise RuntimeError("upstream down")
+
+        registry = dict(self.registry)
+        registry["market"] = ("market_price", broken_agent)
+        state = {"raw_query": "weather price", "intents": ["weather", "market", "unknown"]}
+
+        with patch.dict(router.AGENT_REGISTRY, registry):
+            result = conditional_router(state)
+
+        self.assertEqual(result["agent_results"]["weather"], {"agent": "weather"})
+        self.assertIn("upstream down", result["agent_results"]["market_price"]["error"])
+        self.assertIn("error", result["agent_results"]["unknown"])
+
+
+if __name__ == "__main__":
+    unittest.main()
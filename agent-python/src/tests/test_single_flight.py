@@ -0,0 +1,116 @@
+import asyncio
+import unittest
+
+from src.config.settings import DEVICE_DEADLINE_SECONDS
+from src.graph_arc.deadline import deadline_budget
+from src.services.single_flight import SingleFlight
+from src.utils.query_keys import request_key
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """Test cases for coalescing identical in-flight queries"""
+
+    async def test_concurrent_callers_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"decision": "irrigate"}
+
+        key = request_key("Should I irrigate today?", "Satara", "hi")
+        outcomes = await asyncio.gather(*[flight.do(key, work) for _ in range(5)])
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result == {"decision": "irrigate"} for result, _ in outcomes))
+        self.assertEqual(sum(shared for _, shared in outcomes), 4)
+        stats = flight.get_stats()
+        self.assertEqual((stats["requests"], stats["executions"], stats["joins"]), (5, 1, 4))
+        self.assertEqual(stats["in_flight"], 0)
+
+    async def test_distinct_keys_run_separately(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        await asyncio.gather(
+            flight.do(request_key("rain today", "Satara", "hi"), work),
+            flight.do(request_key("rain today", "Pune", "hi"), work),
+        )
+        self.assertEqual(flight.get_stats()["executions"], 2)
+
+    async def test_errors_reach_every_caller(self):
+        flight = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("gemini quota")
+
+        outcomes = await asyncio.gather(*[flight.do("key", failing) for _ in range(3)], return_exceptions=True)
+
+        self.assertTrue(all(isinstance(outcome, RuntimeError) for outcome in outcomes))
+        result, shared = await flight.do("key", lambda: asyncio.sleep(0, result="retry"))
+        self.assertEqual((result, shared), ("retry", False))
+
+    async def test_joiners_rerun_when_leader_is_cancelled(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "advice"
+
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        joiners = [asyncio.create_task(flight.do("key", work)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        outcomes = await asyncio.gather(*joiners)
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+
+        self.assertEqual([result for result, _ in outcomes], ["advice"] * 3)
+        self.assertEqual(len(calls), 2)
+        stats = flight.get_stats()
+        self.assertEqual((stats["executions"], stats["retries"]), (2, 3))
+        self.assertEqual(stats["in_flight"], 0)
+
+    async def test_cancelled_joiner_leaves_leader_running(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "advice"
+
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        joiner = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        joiner.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await joiner
+        self.assertEqual(await leader, ("advice", False))
+        self.assertEqual(flight.get_stats()["retries"], 0)
+
+    def test_deadline_budget_follows_device_type(self):
+        mobile = deadline_budget({"device_type": "mobile"})
+        self.assertEqual(mobile, DEVICE_DEADLINE_SECONDS["mobile"])
+        self.assertEqual(deadline_budget({"device_type": "Mobile"}), mobile)
+        self.assertEqual(deadline_budget({"device_type": "mobile", "deadline_seconds": 3}), 3.0)
+
+    def test_request_key_normalization(self):
+        self.assertEqual(
+            request_key("Should I irrigate  today?", " satara", "HI"),
+            request_key("should i irrigate today", "Satara", "hi"),
+        )
+        self.assertNotEqual(request_key("rain today", "Satara", "hi"), request_key("rain today", "Satara", "en"))
+
+
+if __name__ == "__main__":
+    unittest.main()
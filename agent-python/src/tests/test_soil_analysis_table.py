@@ -0,0 +1,55 @@
+import unittest
+
+from src.data.soil_plugins import (
+    analyze_district_nutrients, get_soil_analysis_table, get_soil_data_from_csv, with_location,
+)
+
+
+class TestSoilAnalysisTable(unittest.TestCase):
+    """Test cases for the precomputed per-district soil analysis"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = get_soil_analysis_table()
+
+    def test_matches_on_the_fly_analysis(self):
+        for record in self.table.repository.records:
+            for location in (record.district, "Ludhiana, Punjab", "Mysore, Karnataka"):
+                for query, irrigation_focus in (("soil report", False), ("irrigation schedule", True)):
+                    self.assertEqual(
+                        with_location(self.table.get(record, irrigation_focus), location),
+                        analyze_district_nutrients(record, location, query),
+                    )
+
+    def test_query_is_a_fetch(self):
+        record = self.table.repository.find("Satara")
+        expected = analyze_district_nutrients(record, "Satara, Maharashtra", "when to irrigate")
+        self.assertEqual(get_soil_data_from_csv("Satara, Maharashtra", "when to irrigate"), expected)
+        self.assertIn("Black Cotton", expected["soil_type"])
+
+    def test_both_irrigation_variants(self):
+        self.assertEqual(len(self.table), 2 * len(self.table.repository))
+        record = self.table.repository.find("Satara")
+        self.assertNotIn("IRRIGATION STRATEGY", self.table.get(record, False)["ai_recommendation"])
+        self.assertIn("IRRIGATION STRATEGY", self.table.get(record, True)["ai_recommendation"])
+        self.assertIsNone(self.table.get(record, False)["soil_type"])
+
+    def test_records_are_immutable_and_responses_fresh(self):
+        record = self.table.repository.find("Satara")
+        with self.assertRaises(TypeError):
+            self.table.get(record, False)["soil_health"] = "Poor"
+
+        response = get_soil_data_from_csv("Satara")
+        crops = list(response["recommended_crops"])
+        response["recommended_crops"].append("Tea")
+        response["limiting_factors"].clear()
+        again = get_soil_data_from_csv("Satara")
+        self.assertEqual(again["recommended_crops"], crops)
+        self.assertTrue(again["limiting_factors"])
+
+    def test_shared_table(self):
+        self.assertIs(get_soil_analysis_table(), self.table)
+
+
+if __name__ == "__main__":
+    unittest.main()
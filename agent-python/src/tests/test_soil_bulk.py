@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+import unittest
+
+# simple_web.py lives in the agent-python directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.data.soil_plugins import get_soil_data_bulk, get_soil_data_from_csv
+
+
+class TestSoilBulk(unittest.TestCase):
+    """Test cases for bulk soil analysis and the NDJSON endpoint"""
+
+    def test_matches_single_location_analysis(self):
+        locations = ["Satara", "Pune, Maharashtra", "Nowhere, Kerala", "Ludhiana"]
+        for query in ("soil report", "irrigation plan"):
+            results = list(get_soil_data_bulk(locations, query))
+            self.assertEqual([location for location, _ in results], locations)
+            for location, soil_data in results:
+                self.assertEqual(soil_data, get_soil_data_from_csv(location, query))
+
+    def test_deduplicates_in_first_seen_order(self):
+        results = list(get_soil_data_bulk(["Satara", " satara ", "SATARA!", "", "Pune", "pune"]))
+        self.assertEqual([location for location, _ in results], ["Satara", "Pune"])
+
+    def test_ten_thousand_locations(self):
+        locations = [f"Village {i}, Punjab" for i in range(5000)] + ["Satara"] * 5000
+        results = list(get_soil_data_bulk(locations))
+        self.assertEqual(len(results), 5001)
+        self.assertIn("North India Regional", results[0][1]["location"])
+
+    def test_ndjson_endpoint(self):
+        try:
+            from simple_web import app
+        except SystemExit:
+            self.skipTest("simple_web dependencies are not installed")
+        client = app.test_client()
+
+        response = client.post("/api/soil/bulk", json={"locations": ["Satara", "satara", "Pune"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([line["location"] for line in lines], ["Satara", "Pune"])
+        self.assertEqual(lines[0]["soil_data"]["location"], "Satara (District Data)")
+
+        self.assertEqual(client.post("/api/soil/bulk", json={"locations": []}).status_code, 400)
+        self.assertEqual(client.post("/api/soil/bulk", json={"locations": "Satara"}).status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.data import soil_repository
+from src.data.soil_plugins import find_district_in_csv, get_soil_data_from_csv
+from src.data.soil_repository import (
+    SoilRepository, build_soil_dataset, get_soil_repository, load_soil_dataset, load_soil_repository,
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestSoilRepository(unittest.TestCase):
+    """Test cases for indexed soil.csv district lookups"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.repository = get_soil_repository()
+
+    def district(self, location):
+        record = self.repository.find(location)
+        return record.district if record else None
+
+    def test_exact_and_case_insensitive(self):
+        self.assertEqual(self.district("Satara"), "Satara")
+        self.assertEqual(self.district("  LUDHIANA "), "Ludhiana")
+        # Exact names win over districts that merely contain them
+        self.assertEqual(self.district("Hisar"), "Hisar")
+        self.assertEqual(self.district("Puri"), "Puri")
+
+    def test_contained_word_run_and_parenthetical(self):
+        self.assertEqual(self.district("Pune, Maharashtra"), "Pune")
+        self.assertEqual(self.district("satara district"), "Satara")
+        self.assertIsNotNone(self.district("Godavari"))
+        self.assertEqual(self.district("bhabua"), self.district("Kaimur"))
+
+    def test_variations_and_substring_fallback(self):
+        self.assertEqual(self.district("poona"), "Pune")
+        self.assertEqual(self.district("Nicobar"), "Nicobars")
+        self.assertIsNone(self.district("Nowhere"))
+        self.assertIsNone(self.district(""))
+        self.assertIsNone(self.district(None))
+
+    def test_nutrients_are_read_only(self):
+        record = self.repository.find("Satara")
+        self.assertEqual(set(record.nutrients), set(soil_repository.NUTRIENT_COLUMNS))
+        with self.assertRaises(TypeError):
+            record.nutrients["zinc"] = 0
+
+    def test_find_district_in_csv_compatibility(self):
+        soil_df = pd.read_csv(soil_repository.SOIL_CSV_PATH)
+        row = find_district_in_csv(soil_df, "Satara")
+        self.assertEqual(row["District "].strip(), "Satara")
+        self.assertIsNone(find_district_in_csv(soil_df, "Nowhere"))
+        self.assertEqual(get_soil_data_from_csv("Satara")["location"], "Satara (District Data)")
+
+    def test_rebuilt_when_csv_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "soil.csv")
+            pd.DataFrame({"District ": ["Alpha"], "Zn %": [40.0]}).to_csv(path, index=False)
+            with mock.patch.object(soil_repository, "SOIL_CSV_PATH", path), \
+                    mock.patch.object(soil_repository, "_repository", None):
+                first = get_soil_repository()
+                self.assertIs(get_soil_repository(), first)
+                self.assertEqual(first.find("alpha").nutrients["iron"], 0.0)
+
+                pd.DataFrame({"District ": ["Beta"], "Zn %": [10.0]}).to_csv(path, index=False)
+                os.utime(path, (first.mtime + 10, first.mtime + 10))
+                second = get_soil_repository()
+                self.assertIsNot(second, first)
+                self.assertEqual(second.find("beta").nutrients["zinc"], 10.0)
+
+    def test_columnar_dataset_matches_csv(self):
+        # The committed build must be current, or workers silently fall back to parsing soil.csv
+        repository = load_soil_dataset()
+        self.assertIsNotNone(repository, "soil_columnar is stale: run python -m src.data.soil_repository")
+        self.assertIsInstance(repository.matrix, np.memmap)
+
+        from_frame = SoilRepository.from_frame(pd.read_csv(soil_repository.SOIL_CSV_PATH))
+        self.assertEqual(
+            [(record.row, record.district, dict(record.nutrients)) for record in repository.records],
+            [(record.row, record.district, dict(record.nutrients)) for record in from_frame.records],
+        )
+
+    def test_stale_dataset_falls_back_to_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "soil.csv")
+            dataset_dir = os.path.join(tmp, "columnar")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("District ,Zn %,Fe%,Cu %,Mn %,B %,S %\nAlpha,40,50,60,70,,90\n,1,1,1,1,1,1\n")
+            build_soil_dataset(path, dataset_dir)
+            alpha = load_soil_dataset(dataset_dir, path).find("alpha")
+            self.assertEqual(alpha.nutrients["boron"], 0.0)
+            self.assertEqual(alpha.nutrients["sulfur"], 90.0)
+
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("Beta,10,10,10,10,10,10\n")
+            self.assertIsNone(load_soil_dataset(dataset_dir, path))
+            self.assertEqual(load_soil_repository(path, dataset_dir).find("beta").row, 2)
+
+    def test_hot_path_does_not_import_pandas(self):
+        code = (
+            "import sys\n"
+            "from src.data.soil_plugins import get_soil_data_bulk, get_soil_data_from_csv\n"
+            "get_soil_data_from_csv('Satara', 'irrigation')\n"
+            "list(get_soil_data_bulk(['Pune', 'Nowhere']))\n"
+            "sys.exit('pandas' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True)
+        self.assertEqual(result.returncode, 0, result.stderr.decode()[-500:])
+
+    def test_from_frame_skips_blank_districts(self):
+        repository = SoilRepository.from_frame(pd.DataFrame({"District ": ["Alpha", None, " "]}))
+        self.assertEqual(len(repository), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+from src.data.soil_plugins import (
+    assess_soil_health, classify_nutrients, generate_detailed_recommendation, get_soil_analysis_table,
+)
+from src.data.soil_scoring import HEALTH_BANDS, NUTRIENTS, nutrient_matrix, score_matrix, score_records
+
+
+class TestSoilScoring(unittest.TestCase):
+    """Test cases for vectorized nutrient classification and health scoring"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.records = get_soil_analysis_table().repository.records
+        cls.scores = score_records(cls.records)
+
+    def test_matches_per_district_functions(self):
+        for i, record in enumerate(self.records):
+            nutrients = dict(record.nutrients)
+            self.assertEqual(self.scores.nutrient_status(i), classify_nutrients(nutrients))
+            self.assertEqual(self.scores.soil_health(i), assess_soil_health(nutrients))
+            self.assertAlmostEqual(self.scores.health_score[i], sum(nutrients.values()) / 6)
+
+    def test_threshold_boundaries(self):
+        # Exactly at a threshold is High / sufficient
+        scores = score_matrix([[70, 80, 90, 85, 70, 80], [29.9, 39.9, 59.9, 49.9, 29.9, 39.9]])
+        self.assertEqual(set(scores.nutrient_status(0).values()), {'High'})
+        self.assertEqual(set(scores.nutrient_status(1).values()), {'Low'})
+        self.assertEqual(scores.sufficiency_ratio.tolist(), [1.0, 0.0])
+        self.assertEqual(scores.soil_health(0)['limitations'], ['None identified'])
+        self.assertEqual(scores.soil_health(1)['limitations'], ['Zinc', 'Iron', 'Copper'])
+        self.assertEqual([HEALTH_BANDS[band][1] for band in scores.health_band], ["Excellent", "Poor"])
+
+    def test_recommendation_uses_shared_thresholds(self):
+        nutrients = {'zinc': 50.0, 'iron': 59.0, 'copper': 90, 'manganese': 90, 'boron': 90, 'sulfur': 90}
+        report = generate_detailed_recommendation("Test", nutrients, "")
+        self.assertIn("Zinc (Zn): 50.0% - Sufficient", report)
+        self.assertIn("Iron (Fe): 59.0% - Deficient", report)
+        self.assertIn("Address iron deficiency", report)
+
+    def test_summary_and_export(self):
+        summary = self.scores.summary()
+        self.assertEqual(summary["districts"], len(self.records))
+        self.assertEqual(sum(summary["soil_health"].values()), len(self.records))
+        self.assertEqual(self.scores.summary([0])["mean_health_score"], float(self.scores.health_score[0]))
+        self.assertEqual(self.scores.summary([])["districts"], 0)
+
+        rows = self.scores.to_records()
+        self.assertEqual(len(rows), len(self.records))
+        self.assertEqual(rows[0]["district"], self.records[0].district)
+        self.assertEqual(rows[0]["soil_health"], self.scores.soil_health(0)["overall"])
+
+    def test_nutrient_matrix_fills_missing(self):
+        matrix = nutrient_matrix([{'zinc': 10.0}, {}])
+        self.assertEqual(matrix.shape, (2, len(NUTRIENTS)))
+        self.assertTrue(np.array_equal(matrix[:, 1:], np.zeros((2, len(NUTRIENTS) - 1))))
+        self.assertEqual(len(score_matrix(np.empty((0, len(NUTRIENTS))))), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
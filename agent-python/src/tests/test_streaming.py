@@ -0,0 +1,112 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.graph_arc.core_nodes import decision_support_node
+from src.server.app import ChatMessage, stream_agricultural_query
+from src.server.streaming import (
+    AGENT_RESULT,
+    DECISION,
+    DECISION_DELTA,
+    DECISION_SECTION,
+    INTENTS,
+    TRANSLATION,
+    node_messages,
+)
+
+
+class TestNodeMessages(unittest.TestCase):
+    """Test cases for mapping node updates to typed stream messages"""
+
+    def test_intents_message(self):
+        update = {"intents": ["weather"], "entities": {"location": "Pune"}, "confidence_score": 0.9}
+        messages = node_messages("query_understanding", update)
+
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0]["type"], INTENTS)
+        self.assertEqual(messages[0]["intents"], ["weather"])
+
+    def test_router_node_yields_one_message_per_agent(self):
+        update = {
+            "agent_results": {"weather": {"forecast": {}}, "market_price": {"current_price": 2100.0}},
+            "agent_timings": {"weather": 0.2, "market_price": 0.4},
+        }
+        messages = node_messages("conditional_router", update)
+
+        self.assertEqual([m["type"] for m in messages], [AGENT_RESULT, AGENT_RESULT])
+        self.assertEqual({m["agent"] for m in messages}, {"weather", "market_price"})
+        self.assertEqual(messages[1]["elapsed"], 0.4)
+
+    def test_unhandled_intents_node_yields_agent_result(self):
+        messages = node_messages("unhandled_intents", {"agent_results": {"irrigation": {"error": "No handler for intent 'irrigation'"}}})
+
+        self.assertEqual([(m["type"], m["agent"], m["elapsed"]) for m in messages], [(AGENT_RESULT, "irrigation", None)])
+
+    def test_decision_message_unpacks_comprehensive_json(self):
+        advice = json.dumps({"final_advice": "Irrigate tomorrow", "summary_message": "Good luck"})
+        messages = node_messages("decision_support", {"decision": {"final_advice": advice, "missing_sections": ["weather"]}})
+
+        self.assertEqual(messages[0]["type"], DECISION)
+        self.assertEqual(messages[0]["final_advice"], "Irrigate tomorrow")
+        self.assertEqual(messages[0]["comprehensive_advice"]["summary_message"], "Good luck")
+        self.assertEqual(messages[0]["missing_sections"], ["weather"])
+
+    def test_translation_and_silent_nodes(self):
+        translation = node_messages("translation_language", {"translation": {"target_language": "hi", "translated_response": "सलाह"}})
+
+        self.assertEqual(translation[0]["type"], TRANSLATION)
+        self.assertEqual(node_messages("user_context", {"language": "hi"}), [])
+        self.assertEqual(node_messages("translation_language", {}), [])
+
+
+class TestStreamAgriculturalQuery(unittest.IsolatedAsyncioTestCase):
+    """Test cases for progressive streaming of a full workflow run"""
+
+    async def test_messages_arrive_in_node_order(self):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        message = ChatMessage(user_id="stream-test", raw_query="What crops suit my soil in Pune?", language="en")
+        result = await stream_agricultural_query(message, send)
+
+        types = [m["type"] for m in sent]
+        self.assertTrue(result["success"])
+        self.assertEqual(types[0], INTENTS)
+        self.assertEqual(types[-1], DECISION)
+        self.assertIn(AGENT_RESULT, types)
+        self.assertEqual(result["result"]["detected_intents"], sent[0]["intents"])
+
+    async def test_decision_tokens_stream_before_decision(self):
+        """final_advice deltas should arrive before the remaining sections and the decision"""
+        answer = json.dumps({
+            "final_advice": "Sow wheat after the next irrigation.",
+            "soil_analysis": {"status": "Zinc deficient"},
+            "summary_message": "Happy farming!",
+        })
+        fake_llm = GenericFakeChatModel(messages=iter([AIMessage(content=answer)]))
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        message = ChatMessage(user_id="stream-test", raw_query="What crops suit my soil in Pune?", language="en")
+        with patch.object(decision_support_node, "_build_decision_llm", return_value=fake_llm):
+            result = await stream_agricultural_query(message, send)
+
+        types = [m["type"] for m in sent]
+        deltas = "".join(m["delta"] for m in sent if m["type"] == DECISION_DELTA)
+        sections = [m["section"] for m in sent if m["type"] == DECISION_SECTION]
+        self.assertTrue(result["success"])
+        self.assertEqual(deltas, "Sow wheat after the next irrigation.")
+        self.assertEqual(sections, ["final_advice", "soil_analysis", "summary_message"])
+        self.assertLess(types.index(DECISION_DELTA), types.index(DECISION))
+        self.assertEqual(result["result"]["final_advice"], "Sow wheat after the next irrigation.")
+
+
+if __name__ == "__main__":
+    unittest.main()
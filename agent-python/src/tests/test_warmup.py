@@ -0,0 +1,90 @@
+import threading
+import time
+import unittest
+
+from src.services.warmup import Warmup
+
+
+class TestWarmup(unittest.TestCase):
+    """Test cases for startup warmup and readiness"""
+
+    def test_not_ready_before_run(self):
+        warmup = Warmup(steps=[("noop", lambda: None)])
+
+        report = warmup.report()
+
+        self.assertFalse(report["ready"])
+        self.assertEqual(report["status"], "pending")
+        self.assertIsNone(report["warmup_seconds"])
+
+    def test_ready_with_step_timings(self):
+        warmup = Warmup(steps=[("sleep", lambda: time.sleep(0.01)), ("noop", lambda: None)])
+
+        report = warmup.run()
+
+        self.assertTrue(report["ready"])
+        self.assertGreaterEqual(report["steps"]["sleep"], 0.01)
+        self.assertGreaterEqual(report["warmup_seconds"], report["steps"]["sleep"])
+
+    def test_concurrent_callers_run_steps_once(self):
+        calls = []
+        warmup = Warmup(steps=[("load", lambda: (time.sleep(0.05), calls.append(1)))])
+
+        threads = [threading.Thread(target=warmup.run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(warmup.ready)
+
+    def test_failed_step_is_not_ready(self):
+        def broken():
+            raise RuntimeError("model missing")
+
+        warmup = Warmup(steps=[("intent_model", broken), ("noop", lambda: None)])
+
+        report = warmup.run()
+
+        self.assertFalse(report["ready"])
+        self.assertEqual(report["status"], "failed")
+        self.assertIn("model missing", report["errors"]["intent_model"])
+        self.assertIn("noop", report["steps"])
+
+    def test_failed_steps_are_retried_after_backoff(self):
+        calls = {"flaky": 0, "noop": 0}
+
+        def flaky():
+            calls["flaky"] += 1
+            if calls["flaky"] < 3:
+                raise RuntimeError("soil.csv not mounted yet")
+
+        def noop():
+            calls["noop"] += 1
+
+        warmup = Warmup(steps=[("flaky", flaky), ("noop", noop)], retry_seconds=0.1)
+
+        self.assertEqual(warmup.run()["status"], "failed")
+        # Backoff not elapsed yet: nothing runs
+        self.assertEqual(warmup.run()["attempts"], 1)
+        time.sleep(0.12)
+        self.assertEqual(warmup.run()["status"], "failed")
+        # The second failure doubles the backoff
+        time.sleep(0.12)
+        self.assertFalse(warmup.retry_due())
+        time.sleep(0.12)
+
+        warmup.poll()
+        warmup._retry_thread.join()
+
+        report = warmup.report()
+        self.assertTrue(report["ready"])
+        self.assertEqual(report["errors"], {})
+        self.assertEqual(report["attempts"], 3)
+        # Steps that succeeded are not run again
+        self.assertEqual(calls, {"flaky": 3, "noop": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
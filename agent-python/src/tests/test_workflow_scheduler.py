@@ -0,0 +1,75 @@
+import asyncio
+import time
+import unittest
+
+from src.services.workflow_scheduler import SchedulerBusyError, WorkflowScheduler
+
+
+class _SlowWorkflow:
+    """Stand-in for the compiled graph that tracks overlapping runs"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.running = 0
+        self.peak_running = 0
+
+    async def ainvoke(self, state):
+        self.running += 1
+        self.peak_running = max(self.peak_running, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        return {"raw_query": state["raw_query"]}
+
+
+class TestWorkflowScheduler(unittest.IsolatedAsyncioTestCase):
+    """Test cases for workflow admission control"""
+
+    async def test_concurrency_limit_is_respected(self):
+        """No more than max_concurrency runs should execute at once"""
+        workflow = _SlowWorkflow(0.1)
+        scheduler = WorkflowScheduler(workflow, max_concurrency=2, max_queue=10, queue_timeout=5)
+
+        results = await asyncio.gather(*[scheduler.run({"raw_query": str(i)}) for i in range(6)])
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(workflow.peak_running, 2)
+        stats = scheduler.get_stats()
+        self.assertEqual(stats["completed"], 6)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertGreaterEqual(stats["peak_queue_depth"], 1)
+
+    async def test_full_queue_rejects_immediately(self):
+        """Requests beyond the queue bound should be rejected without waiting"""
+        scheduler = WorkflowScheduler(_SlowWorkflow(0.3), max_concurrency=1, max_queue=1, queue_timeout=5)
+
+        running = [asyncio.create_task(scheduler.run({"raw_query": str(i)})) for i in range(2)]
+        await asyncio.sleep(0.01)
+
+        start_time = time.perf_counter()
+        with self.assertRaises(SchedulerBusyError) as context:
+            await scheduler.run({"raw_query": "overflow"})
+        self.assertLess(time.perf_counter() - start_time, 0.05)
+        self.assertGreaterEqual(context.exception.retry_after, 1)
+
+        await asyncio.gather(*running)
+        self.assertEqual(scheduler.get_stats()["rejected"], 1)
+
+    async def test_queue_timeout_rejects_waiting_request(self):
+        """Requests waiting longer than queue_timeout should not pile up"""
+        scheduler = WorkflowScheduler(_SlowWorkflow(0.3), max_concurrency=1, max_queue=5, queue_timeout=0.05)
+
+        running = asyncio.create_task(scheduler.run({"raw_query": "slow"}))
+        await asyncio.sleep(0.01)
+
+        with self.assertRaises(SchedulerBusyError):
+            await scheduler.run({"raw_query": "waiting"})
+
+        await running
+        stats = scheduler.get_stats()
+        self.assertEqual(stats["timed_out"], 1)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertEqual(stats["active"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
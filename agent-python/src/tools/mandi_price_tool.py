@@ -1,41 +1,27 @@
-from langchain.tools import tool
+from langchain_core.tools import StructuredTool
 from src.data.price_from_mandi import AgmarknetAPIClient
+from src.config.settings import HTTP_TIMEOUT_SECONDS
 
-@tool("get_mandi_price", return_direct=True)
-def get_mandi_price(format_='json', commodity=None, state=None, district=None, market=None, variety=None, grade=None, limit=1, offset=0):
-    """
-    Tool: get_mandi_price
+def _clean(val):
+    """Strip string inputs, mapping empty values to None."""
+    return val.strip() if isinstance(val, str) and val else None
 
-    Description:
-    Fetches the modal price (or minimum price) for a specified commodity in a particular market using the Agmarknet API.
-    Only format_ is required. All other parameters are optional.
-    Returns the price as a float, or 0 if not found.
+def _build_filters(format_, commodity, state, district, market, variety, grade, limit, offset):
+    """Clean and validate tool inputs into Agmarknet client filters."""
+    return {
+        "state": _clean(state),
+        "district": _clean(district),
+        "market": _clean(market),
+        "commodity": _clean(commodity),
+        "variety": _clean(variety),
+        "grade": _clean(grade),
+        "limit": limit,
+        "offset": offset,
+        "format": format_,
+    }
 
-    Usage:
-    Use this tool to retrieve up-to-date mandi prices for agricultural commodities from Indian markets.
-    """
-    # Clean and validate inputs
-    def clean(val):
-        return val.strip() if isinstance(val, str) and val else None
-    commodity = clean(commodity)
-    state = clean(state)
-    district = clean(district)
-    market = clean(market)
-    variety = clean(variety)
-    grade = clean(grade)
-
-    client = AgmarknetAPIClient()
-    records = client(
-        state=state,
-        district=district,
-        market=market,
-        commodity=commodity,
-        variety=variety,
-        grade=grade,
-        limit=limit,
-        offset=offset,
-        format=format_
-    )
+def _extract_price(records):
+    """Pick the modal (or minimum) price from the first Agmarknet record."""
     if not records:
         return "No mandi data found."
     record = records[0]
@@ -44,3 +30,33 @@ def get_mandi_price(format_='json', commodity=None, state=None, district=None, m
         return float(price)
     except Exception:
         return 0
+
+def _get_mandi_price(format_='json', commodity=None, state=None, district=None, market=None, variety=None, grade=None, limit=1, offset=0, timeout=HTTP_TIMEOUT_SECONDS):
+    """
+    Tool: get_mandi_price
+
+    Description:
+    Fetches the modal price (or minimum price) for a specified commodity in a particular market using the Agmarknet API.
+    Only format_ is required. All other parameters are optional; timeout caps the API call in seconds.
+    Returns the price as a float, or 0 if not found.
+
+    Usage:
+    Use this tool to retrieve up-to-date mandi prices for agricultural commodities from Indian markets.
+    """
+    client = AgmarknetAPIClient(timeout=timeout)
+    records = client(**_build_filters(format_, commodity, state, district, market, variety, grade, limit, offset))
+    return _extract_price(records)
+
+async def _aget_mandi_price(format_='json', commodity=None, state=None, district=None, market=None, variety=None, grade=None, limit=1, offset=0, timeout=HTTP_TIMEOUT_SECONDS):
+    """Async implementation of get_mandi_price used by tool.ainvoke."""
+    client = AgmarknetAPIClient(timeout=timeout)
+    records = await client.acall(**_build_filters(format_, commodity, state, district, market, variety, grade, limit, offset))
+    return _extract_price(records)
+
+# Exposed as a single tool with both sync (invoke) and async (ainvoke) implementations
+get_mandi_price = StructuredTool.from_function(
+    func=_get_mandi_price,
+    coroutine=_aget_mandi_price,
+    name="get_mandi_price",
+    return_direct=True,
+)
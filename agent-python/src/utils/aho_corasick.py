@@ -0,0 +1,117 @@
+# src/utils/aho_corasick.py
+
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+
+class Match(NamedTuple):
+    start: int
+    end: int
+    pattern: str
+    value: Any
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class AhoCorasick:
+    """
+    Multi-pattern string matcher (Aho-Corasick automaton).
+
+    Patterns are added with an attached value, compiled once with build(),
+    and then every occurrence of every pattern is found in a single pass
+    over the text, independent of how many patterns there are.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Patterns ending at each state, including those reached via fail links
+        self._out: List[List[Tuple[str, Any]]] = [[]]
+        self._patterns: Dict[str, Any] = {}
+        self._built = False
+        for pattern, value in patterns:
+            self.add(pattern, value)
+        if self._goto[0]:
+            self.build()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def add(self, pattern: str, value: Any = None):
+        """Add a pattern; a pattern added twice keeps its latest value."""
+        if not pattern:
+            raise ValueError("Pattern must be a non-empty string")
+        if self._built:
+            raise RuntimeError("Cannot add patterns after build()")
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state] = [(pattern, value)]
+        self._patterns[pattern] = value
+
+    def build(self) -> "AhoCorasick":
+        """Compute failure links (breadth-first) and merge output sets."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                # Root children keep their failure link to the root
+                if state:
+                    self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+        self._built = True
+        return self
+
+    def iter(self, text: str, word_boundaries: bool = True) -> Iterator[Match]:
+        """
+        Yield every pattern occurrence, ordered by end position. With
+        word_boundaries, matches inside a longer word ("corn" in "acorn")
+        are skipped.
+        """
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        length = len(text)
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            end = index + 1
+            for pattern, value in out[state]:
+                start = end - len(pattern)
+                if word_boundaries and (
+                    (start > 0 and _is_word_char(text[start - 1]))
+                    or (end < length and _is_word_char(text[end]))
+                ):
+                    continue
+                yield Match(start, end, pattern, value)
+
+    def find_all(self, text: str, word_boundaries: bool = True) -> List[Match]:
+        """
+        Leftmost-longest, non-overlapping matches ("sweet potato" wins over
+        "potato"), ordered by position.
+        """
+        matches = sorted(self.iter(text, word_boundaries), key=lambda m: (m.start, -m.end))
+        selected: List[Match] = []
+        last_end = 0
+        for match in matches:
+            if match.start >= last_end:
+                selected.append(match)
+                last_end = match.end
+        return selected
@@ -0,0 +1,62 @@
+# src/utils/http_client.py
+
+import asyncio
+import threading
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+_async_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_session: Optional[requests.Session] = None
+_sync_session_lock = threading.Lock()
+
+def get_sync_session() -> requests.Session:
+    """
+    Return the process-wide pooled requests session used by the synchronous
+    plugin paths, so repeated calls reuse keep-alive connections.
+    """
+    global _sync_session
+    if _sync_session is None:
+        with _sync_session_lock:
+            if _sync_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _sync_session = session
+    return _sync_session
+
+def close_sync_session():
+    """Close the shared requests session (call on server shutdown)."""
+    global _sync_session
+    with _sync_session_lock:
+        if _sync_session is not None:
+            _sync_session.close()
+        _sync_session = None
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide async HTTP client for the running event loop.
+    Connections are pooled across requests; a new client is created only
+    if the previous one is closed or belongs to a different event loop.
+    """
+    global _async_client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client.is_closed or _client_loop is not loop:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(20.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        _client_loop = loop
+    return _async_client
+
+async def aclose_async_client():
+    """Close the shared async HTTP client (call on server shutdown)."""
+    global _async_client, _client_loop
+    if _async_client is not None and not _async_client.is_closed:
+        await _async_client.aclose()
+    _async_client = None
+    _client_loop = None
@@ -0,0 +1,135 @@
+# src/utils/incremental_json.py
+
+import json
+from typing import Any, Iterable, List, Optional, Tuple
+
+# Event kinds returned by IncrementalJSONObjectParser.feed
+FIELD = "field"   # ("field", key, value) once a top-level value is complete
+DELTA = "delta"   # ("delta", key, text) as a top-level string value grows
+
+class IncrementalJSONObjectParser:
+    """
+    Incremental parser for a single JSON object arriving in chunks (e.g. LLM
+    tokens). Each top-level field is reported as soon as its value is complete,
+    and top-level string values listed in `stream_fields` are also reported as
+    decoded text deltas while they are still being generated.
+
+    Leading text before the first '{' (such as a ```json fence) is ignored.
+    """
+
+    def __init__(self, stream_fields: Optional[Iterable[str]] = None):
+        self.stream_fields = set(stream_fields or [])
+        self.buffer = ""
+        self._pos = 0
+        self._phase = "start"
+        self._key_start = 0
+        self._key: Optional[str] = None
+        self._value_start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_value = False
+        self._streamed = 0
+
+    @property
+    def done(self) -> bool:
+        """True once the closing brace of the object has been seen."""
+        return self._phase == "done"
+
+    def feed(self, text: str) -> List[Tuple[str, str, Any]]:
+        """Consume the next chunk and return the events it completed."""
+        self.buffer += text
+        events: List[Tuple[str, str, Any]] = []
+        buffer = self.buffer
+
+        while self._pos < len(buffer) and self._phase != "done":
+            char = buffer[self._pos]
+
+            if self._phase == "start":
+                if char == "{":
+                    self._phase = "key"
+
+            elif self._phase == "key":
+                if char == '"':
+                    self._phase = "key_string"
+                    self._key_start = self._pos
+                    self._escape = False
+                elif char == "}":
+                    self._phase = "done"
+
+            elif self._phase == "key_string":
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._key = json.loads(buffer[self._key_start:self._pos + 1])
+                    self._phase = "colon"
+
+            elif self._phase == "colon":
+                if char == ":":
+                    self._phase = "value_start"
+
+            elif self._phase == "value_start":
+                if not char.isspace():
+                    self._value_start = self._pos
+                    self._depth = 1 if char in "{[" else 0
+                    self._in_string = char == '"'
+                    self._string_value = self._in_string
+                    self._escape = False
+                    self._streamed = 0
+                    self._phase = "value"
+
+            elif self._phase == "value":
+                if self._in_string:
+                    if self._escape:
+                        self._escape = False
+                    elif char == "\\":
+                        self._escape = True
+                    elif char == '"':
+                        self._in_string = False
+                        if self._depth == 0:
+                            self._complete_value(self._pos + 1, events)
+                elif char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                elif char in "}]" and self._depth > 0:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._complete_value(self._pos + 1, events)
+                elif self._depth == 0 and (char in ",}" or char.isspace()):
+                    self._complete_value(self._pos, events)
+                    if char == "}":
+                        self._phase = "done"
+
+            self._pos += 1
+
+        if self._phase == "value" and self._string_value and self._key in self.stream_fields:
+            self._emit_delta(events)
+        return events
+
+    def _complete_value(self, end: int, events: List[Tuple[str, str, Any]]):
+        if self._string_value and self._key in self.stream_fields:
+            self._emit_delta(events, end - 1)
+        try:
+            events.append((FIELD, self._key, json.loads(self.buffer[self._value_start:end])))
+        except json.JSONDecodeError:
+            pass
+        self._phase = "key"
+
+    def _emit_delta(self, events: List[Tuple[str, str, Any]], end: Optional[int] = None):
+        """Decode the string value received so far and emit the unseen tail."""
+        raw = self.buffer[self._value_start + 1:self._pos + 1 if end is None else end]
+        # Back off an incomplete escape sequence at the end of the chunk
+        for cut in range(len(raw), max(len(raw) - 6, 0) - 1, -1):
+            try:
+                decoded = json.loads('"' + raw[:cut] + '"')
+                break
+            except json.JSONDecodeError:
+                continue
+        else:
+            return
+        if len(decoded) > self._streamed:
+            events.append((DELTA, self._key, decoded[self._streamed:]))
+            self._streamed = len(decoded)
@@ -0,0 +1,159 @@
+# src/utils/instrumentation.py
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, ContextManager, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableLambda
+
+# Where a request's answer came from, for performance_report
+EXECUTED = "executed"
+CACHED = "cached"
+SHARED = "shared"
+
+# External-call records of the graph node currently running in this context
+_node_calls: contextvars.ContextVar[Optional[List[Dict[str, Any]]]] = contextvars.ContextVar("_node_calls", default=None)
+# In-process cache lookups (query analysis, soil table) of that node
+_node_lookups: contextvars.ContextVar[Optional[List[Dict[str, Any]]]] = contextvars.ContextVar("_node_lookups", default=None)
+
+
+class Measurement:
+    """Timing and resource record for one external call or cache lookup."""
+
+    def __init__(self, name: str):
+        self.record: Dict[str, Any] = {
+            "name": name,
+            "wall_time": 0.0,
+            "cpu_time": 0.0,
+            "bytes_sent": 0,
+            "bytes_received": 0,
+            "cache": None,
+        }
+
+    def add_bytes(self, sent: int = 0, received: int = 0):
+        self.record["bytes_sent"] += sent
+        self.record["bytes_received"] += received
+
+    def cache_result(self, hit: bool):
+        self.record["cache"] = "hit" if hit else "miss"
+
+
+@contextmanager
+def _measure(name: str, records: contextvars.ContextVar) -> Iterator[Measurement]:
+    measurement = Measurement(name)
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    try:
+        yield measurement
+    finally:
+        measurement.record["wall_time"] = round(time.perf_counter() - wall_start, 6)
+        measurement.record["cpu_time"] = round(time.thread_time() - cpu_start, 6)
+        node_records = records.get()
+        if node_records is not None:
+            node_records.append(measurement.record)
+
+
+def measure_call(name: str) -> ContextManager[Measurement]:
+    """
+    Measure an external call (HTTP API, LLM) made by the current graph node.
+    Wall time, CPU time of the calling thread, bytes and cache status are
+    attached to the node's `_performance` entry. Outside an instrumented node
+    the measurement is discarded.
+    """
+    return _measure(name, _node_calls)
+
+
+def measure_lookup(name: str) -> ContextManager[Measurement]:
+    """
+    Measure an in-process cache lookup made by the current graph node; report
+    the outcome with cache_result(). Recorded under the node's "lookups", so
+    lookups count towards cache hits/misses but not external calls.
+    """
+    return _measure(name, _node_lookups)
+
+
+def _node_update(name: str, update: Any, calls: List[Dict[str, Any]], lookups: List[Dict[str, Any]],
+                 wall_start: float, cpu_start: float) -> Any:
+    record = {
+        "wall_time": round(time.perf_counter() - wall_start, 6),
+        "cpu_time": round(time.thread_time() - cpu_start, 6),
+        "calls": calls,
+        "lookups": lookups,
+    }
+    if not isinstance(update, dict):
+        return update
+    update["_performance"] = {"nodes": {name: record}}
+    return update
+
+
+def instrument_node(name: str, node: Any) -> "RunnableLambda":
+    """
+    Wrap a graph node so each run records its wall/CPU time and the external
+    calls it makes into GlobalState `_performance` (see state.merge_performance).
+    Works for plain functions and for runnables with sync and async variants.
+    On the async path CPU time also counts work interleaved on the event loop.
+    """
+    # Imported here so data modules can record lookups without loading LangChain
+    from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+
+    runnable: Runnable = node if isinstance(node, Runnable) else RunnableLambda(node, name=name)
+
+    def run(state: Dict[str, Any], config: RunnableConfig) -> Any:
+        calls: List[Dict[str, Any]] = []
+        lookups: List[Dict[str, Any]] = []
+        tokens = _node_calls.set(calls), _node_lookups.set(lookups)
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            update = runnable.invoke(state, config)
+        finally:
+            _node_calls.reset(tokens[0])
+            _node_lookups.reset(tokens[1])
+        return _node_update(name, update, calls, lookups, wall_start, cpu_start)
+
+    async def arun(state: Dict[str, Any], config: RunnableConfig) -> Any:
+        calls: List[Dict[str, Any]] = []
+        lookups: List[Dict[str, Any]] = []
+        tokens = _node_calls.set(calls), _node_lookups.set(lookups)
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            update = await runnable.ainvoke(state, config)
+        finally:
+            _node_calls.reset(tokens[0])
+            _node_lookups.reset(tokens[1])
+        return _node_update(name, update, calls, lookups, wall_start, cpu_start)
+
+    return RunnableLambda(run, afunc=arun, name=name)
+
+
+def performance_report(performance: Optional[dict], response_cache: Optional[str] = None,
+                       source: str = EXECUTED) -> Dict[str, Any]:
+    """
+    Per-node records plus totals, as returned to API clients in debug mode.
+    Cache totals cover external calls, in-process lookups and the response
+    cache status of the request. `source` says whether this request ran the
+    workflow (EXECUTED) or was answered from the response cache (CACHED) or
+    another request's in-flight run (SHARED); the latter two did no work of
+    their own, so the stored performance is ignored and every total is zero.
+    """
+    executed = source == EXECUTED
+    nodes = (performance or {}).get("nodes", {}) if executed else {}
+    calls = [call for node in nodes.values() for call in node.get("calls", [])]
+    lookups = [lookup for node in nodes.values() for lookup in node.get("lookups", [])]
+    cache_statuses = [record["cache"] for record in calls + lookups if record.get("cache")]
+    if response_cache and executed:
+        cache_statuses.append(response_cache)
+    return {
+        "nodes": nodes,
+        "totals": {
+            "node_wall_time": round(sum(node.get("wall_time", 0.0) for node in nodes.values()), 6),
+            "node_cpu_time": round(sum(node.get("cpu_time", 0.0) for node in nodes.values()), 6),
+            "external_calls": len(calls),
+            "bytes_sent": sum(call.get("bytes_sent", 0) for call in calls),
+            "bytes_received": sum(call.get("bytes_received", 0) for call in calls),
+            "cache_hits": cache_statuses.count("hit"),
+            "cache_misses": cache_statuses.count("miss"),
+        },
+        "response_cache": response_cache,
+        "source": source,
+    }
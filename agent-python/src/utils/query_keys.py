@@ -0,0 +1,28 @@
+# src/utils/query_keys.py
+
+import re
+from typing import Iterable, Optional, Tuple
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_query(query: Optional[str]) -> str:
+    """
+    Canonical form of a user query for request keys: lower-cased, punctuation
+    removed and whitespace collapsed, so "Should I irrigate today?" and
+    "should i  irrigate today" map to the same key.
+    """
+    text = _PUNCTUATION.sub(" ", (query or "").lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+def request_key(query: Optional[str], location: Optional[str], language: Optional[str]) -> Tuple[str, str, str]:
+    """Key identifying requests that must produce the same answer."""
+    return (
+        normalize_query(query),
+        normalize_query(location),
+        (language or "").strip().lower(),
+    )
+
+def intent_key(intents: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Order-independent key for a set of detected intents."""
+    return tuple(sorted(set(intents or [])))